@@ -7,6 +7,11 @@ __version__ = "0.3.2"
 from . import settings
 from . import calculation
 from . import design
+from . import parallel
+from . import reliability
+from . import results
+from . import storage
+from . import watch
 
 from .settings import (
     WoodMaterial,
@@ -34,6 +39,11 @@ __all__ = [
     "settings",
     "calculation",
     "design",
+    "parallel",
+    "reliability",
+    "results",
+    "storage",
+    "watch",
     "WoodMaterial",
     "RectangularSection",
     "MemberDefinition",
@@ -1,7 +1,19 @@
+from typing import Union, List
+import collections
+import concurrent.futures
+import dataclasses
+import glob
+import numbers
+import os
+
 import numpy as np
 import pandas as pd
 import timber_nds.settings as settings
-from timber_nds.settings import Forces
+from timber_nds.settings import Forces, combined_factor
+
+
+ROBOT_INDEX_LEVELS = ["Member", "Node", "Case", "Mode"]
+FORCE_COLUMNS = ["axial", "shear_y", "shear_z", "torque", "moment_yy", "moment_zz"]
 
 
 class WeightCalculator:
@@ -44,39 +56,16 @@ class WeightCalculator:
             - The moisture content is given as a percentage (e.g., 12.5 for 12.5%).
             - Density of water is 1000 kg/m^3.
         """
-        if not isinstance(moisture_content, (int, float)):
-            raise TypeError("Moisture content must be a number (int or float)")
+        if not isinstance(moisture_content, numbers.Real):
+            raise TypeError("Moisture content must be a real number")
         if moisture_content < 0:
             raise ValueError("Moisture content must be non-negative.")
         if self.material.fibre_saturation_point < 0:
             raise ValueError("Fibre saturation point must be non-negative.")
 
-        if moisture_content <= self.material.fibre_saturation_point:
-            density_at_moisture = (
-                self.material.specific_gravity
-                * 1000
-                * ((moisture_content / 100) + 1)
-                / (
-                    (self.material.fibre_saturation_point / 100)
-                    * self.material.specific_gravity
-                    + 1
-                )
-            )
-        else:
-            density_at_moisture = (
-                self.material.specific_gravity
-                * 1000
-                * (
-                    (self.material.fibre_saturation_point / 100)
-                    + 1
-                )
-                / (
-                    (self.material.fibre_saturation_point / 100)
-                    * self.material.specific_gravity
-                    + 1
-                )
-            )
-        return density_at_moisture
+        return float(density_at_moisture_content(
+            self.material.specific_gravity, self.material.fibre_saturation_point, moisture_content
+        ))
 
     def calculate_weight_at_moisture_content(self, moisture_content: float) -> float:
         """
@@ -92,8 +81,8 @@ class WeightCalculator:
            - The provided dimensions are valid (positive).
         """
 
-        if not isinstance(moisture_content, (int, float)):
-            raise TypeError("Moisture content must be a number (int or float)")
+        if not isinstance(moisture_content, numbers.Real):
+            raise TypeError("Moisture content must be a real number")
         if moisture_content < 0:
             raise ValueError("Moisture content must be non-negative.")
         if self.section.width < 0 or self.section.depth < 0 or self.element.length < 0:
@@ -104,6 +93,113 @@ class WeightCalculator:
         return self.section.width / 100 * self.section.depth / 100 * self.element.length / 100 * density
 
 
+def density_at_moisture_content(
+        specific_gravity: Union[float, np.ndarray],
+        fibre_saturation_point: Union[float, np.ndarray],
+        moisture_content: Union[float, np.ndarray],
+) -> np.ndarray:
+    """
+    Vectorized density formula of WeightCalculator.calculate_density_at_moisture_content.
+
+    Args:
+        specific_gravity: Specific gravity of the wood.
+        fibre_saturation_point: Fibre saturation point, in the units of moisture_content.
+        moisture_content: The moisture content of the wood, as a percentage.
+
+    Returns:
+        The densities in kg/m^3, broadcast over the inputs.
+
+    Assumptions:
+        - Above the fibre saturation point the density no longer grows.
+    """
+    specific_gravity = np.asarray(specific_gravity, dtype=float)
+    fibre_saturation_point = np.asarray(fibre_saturation_point, dtype=float)
+    moisture = np.minimum(np.asarray(moisture_content, dtype=float), fibre_saturation_point)
+    return specific_gravity * 1000 * (moisture / 100 + 1) / (fibre_saturation_point / 100 * specific_gravity + 1)
+
+
+TAKEOFF_COLUMNS = ["member", "section", "material", "length", "moisture_content", "density", "volume", "weight"]
+
+
+def weight_takeoff(
+        materials: Union[List[settings.WoodMaterial], settings.WoodMaterial],
+        sections: Union[List[settings.RectangularSection], settings.RectangularSection],
+        elements: List[settings.MemberDefinition],
+        moisture_content: Union[float, np.ndarray],
+) -> pd.DataFrame:
+    """
+    Calculates the density and weight of many members in one vectorized pass.
+
+    Args:
+        materials: Material of every element, or one material for all.
+        sections: Section of every element, or one section for all.
+        elements: Members to weigh.
+        moisture_content: Moisture content of every element as a percentage, or one value for all.
+
+    Returns:
+        A DataFrame with the TAKEOFF_COLUMNS, one row per element; volume in
+        m^3 and weight in kg, as in WeightCalculator.
+
+    Assumptions:
+        - Section dimensions and lengths are in cm.
+    """
+    if not isinstance(elements, list):
+        elements = [elements]
+    n_elements = len(elements)
+    materials = materials if isinstance(materials, list) else [materials] * n_elements
+    sections = sections if isinstance(sections, list) else [sections] * n_elements
+    if len(materials) != n_elements or len(sections) != n_elements:
+        raise ValueError("materials and sections need one entry per element.")
+
+    moisture = np.broadcast_to(np.asarray(moisture_content, dtype=float), (n_elements,))
+    lengths = np.array([element.length for element in elements], dtype=float)
+    widths = np.array([section.width for section in sections], dtype=float)
+    depths = np.array([section.depth for section in sections], dtype=float)
+    specific_gravity = np.array([material.specific_gravity for material in materials], dtype=float)
+    fibre_saturation_point = np.array([material.fibre_saturation_point for material in materials], dtype=float)
+
+    if (moisture < 0).any():
+        raise ValueError("Moisture content must be non-negative.")
+    if (fibre_saturation_point < 0).any():
+        raise ValueError("Fibre saturation point must be non-negative.")
+    if (widths < 0).any() or (depths < 0).any() or (lengths < 0).any():
+        raise ValueError("Element dimensions must be non-negative values.")
+
+    density = density_at_moisture_content(specific_gravity, fibre_saturation_point, moisture)
+    volume = widths / 100 * depths / 100 * lengths / 100
+    return pd.DataFrame({
+        "member": pd.Categorical([element.name for element in elements]),
+        "section": pd.Categorical([section.name for section in sections]),
+        "material": pd.Categorical([material.name for material in materials]),
+        "length": lengths,
+        "moisture_content": moisture,
+        "density": density,
+        "volume": volume,
+        "weight": volume * density,
+    }, columns=TAKEOFF_COLUMNS)
+
+
+def takeoff_totals(
+        takeoff_df: pd.DataFrame,
+        by: Union[str, List[str]] = ("section", "material"),
+) -> pd.DataFrame:
+    """
+    Sums a weight takeoff per group.
+
+    Args:
+        takeoff_df: DataFrame returned by weight_takeoff.
+        by: Column or columns that define a group.
+
+    Returns:
+        The member count, total length, volume and weight of every group.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    grouped = takeoff_df.groupby(by, observed=True)
+    totals = grouped[["length", "volume", "weight"]].sum()
+    totals.insert(0, "count", grouped.size())
+    return totals
+
+
 def effective_length(k_factor: float, length: float) -> float:
     """
     Calculates the effective length of a member.
@@ -259,6 +355,184 @@ class RectangularSectionProperties:
         return radius_of_gyration(self.moment_of_inertia(direction), self.area())
 
 
+# NDS Appendix D: E_min = E (1 - 1.645 COV_E) 1.03 / 1.66, with COV_E = 0.25 for sawn lumber.
+MINIMUM_MODULUS_RATIO = (1 - 1.645 * 0.25) * 1.03 / 1.66
+COLUMN_STABILITY_C = 0.8
+BEAM_STABILITY_C = 0.95
+STABILITY_GEOMETRY_COLUMNS = ["width", "depth", "length", "k_yy", "k_zz"]
+STABILITY_COLUMNS = ["column_stability_yy", "column_stability_zz", "beam_stability_yy", "beam_stability_zz"]
+
+# The cache keeps at most STABILITY_CACHE_SIZE factor sets, least recently
+# used first out, each with at most STABILITY_CACHE_ROWS geometries.
+STABILITY_CACHE_SIZE = 32
+STABILITY_CACHE_ROWS = 100_000
+_stability_cache = collections.OrderedDict()
+
+
+def clear_stability_cache():
+    """
+    Empties the cache used by stability_factors.
+    """
+    _stability_cache.clear()
+
+
+def stability_cache_info() -> dict:
+    """
+    Describes the cache used by stability_factors.
+
+    Returns:
+        A dict with the number of cached factor sets and the number of
+        geometries cached for each of them, oldest set first.
+    """
+    return {"factor_sets": len(_stability_cache), "rows": [len(table) for table in _stability_cache.values()]}
+
+
+def _stability_curve(ratio: np.ndarray, c: float) -> np.ndarray:
+    """
+    NDS stability equation shared by C_P (3.7-1) and C_L (3.3-6).
+    """
+    half = (1 + ratio) / (2 * c)
+    return half - np.sqrt(half ** 2 - ratio / c)
+
+
+def _factor_without(factors, *excluded: str) -> float:
+    # Multiplies the remaining fields, so an excluded factor set to 0 cannot give NaN.
+    return float(np.prod([
+        getattr(factors, field.name) for field in dataclasses.fields(factors) if field.name not in excluded
+    ]))
+
+
+def _compute_stability_factors(
+        geometry: pd.DataFrame,
+        minimum_modulus: float,
+        compression_reference: tuple,
+        bending_reference: tuple,
+) -> pd.DataFrame:
+    width = geometry["width"].to_numpy(dtype=float)
+    depth = geometry["depth"].to_numpy(dtype=float)
+    length = geometry["length"].to_numpy(dtype=float)
+    results = {}
+
+    for axis, dimension, k_factor, reference in (
+        ("yy", depth, geometry["k_yy"].to_numpy(dtype=float), compression_reference[0]),
+        ("zz", width, geometry["k_zz"].to_numpy(dtype=float), compression_reference[1]),
+    ):
+        slenderness = effective_length(k_factor, length) / dimension
+        critical_stress = 0.822 * minimum_modulus / slenderness ** 2
+        results[f"column_stability_{axis}"] = _stability_curve(critical_stress / reference, COLUMN_STABILITY_C)
+
+    # Lateral-torsional buckling under bending about one axis is governed by the
+    # unbraced length for displacement about the other one.
+    for axis, bending_depth, breadth, k_factor, reference in (
+        ("yy", depth, width, geometry["k_zz"].to_numpy(dtype=float), bending_reference[0]),
+        ("zz", width, depth, geometry["k_yy"].to_numpy(dtype=float), bending_reference[1]),
+    ):
+        slenderness_squared = effective_length(k_factor, length) * bending_depth / breadth ** 2
+        critical_stress = 1.20 * minimum_modulus / slenderness_squared
+        results[f"beam_stability_{axis}"] = np.where(
+            bending_depth <= breadth, 1.0, _stability_curve(critical_stress / reference, BEAM_STABILITY_C)
+        )
+
+    computed = geometry.copy()
+    for column in STABILITY_COLUMNS:
+        computed[column] = results[column]
+    return computed
+
+
+def stability_factors(
+        list_sections: list,
+        list_elements: list,
+        material: settings.WoodMaterial,
+        bending_factors_yy: settings.BendingAdjustmentFactors,
+        bending_factors_zz: settings.BendingAdjustmentFactors,
+        compression_factors_yy: settings.CompressionAdjustmentFactors,
+        compression_factors_zz: settings.CompressionAdjustmentFactors,
+        elastic_modulus_factors: settings.ElasticModulusAdjustmentFactors,
+) -> pd.DataFrame:
+    """
+    Calculates the column (C_P) and beam (C_L) stability factors of every member x section pair.
+
+    Args:
+        list_sections: RectangularSection objects.
+        list_elements: MemberDefinition objects; their effective length factors
+            give the buckling lengths about each axis.
+        material: Wood material; E_min is derived from its elastic modulus.
+        bending_factors_yy, bending_factors_zz: Bending factors; all of them
+            except due_beam_stability and due_flat_use make up F_b*.
+        compression_factors_yy, compression_factors_zz: Compression factors;
+            all of them except due_column_stability make up F_c*.
+        elastic_modulus_factors: Factors applied to E_min.
+
+    Returns:
+        A DataFrame with one row per member and section and the STABILITY_COLUMNS.
+        Pass it as the stability argument of design.check_force_table or
+        iter_check_force_table to apply C_P and C_L per member; the other
+        checks keep using due_column_stability and due_beam_stability.
+
+    Assumptions:
+        - Sawn lumber (c = 0.8 for columns) and the NDS E_min for COV_E = 0.25.
+        - Results are cached per material and factor set, keyed by section
+          dimensions, member length and effective length factors; repeated
+          pairs are looked up with a join and only new ones are computed.
+          The cache is bounded by STABILITY_CACHE_SIZE and STABILITY_CACHE_ROWS.
+    """
+    if not isinstance(list_sections, list):
+        list_sections = [list_sections]
+    if not isinstance(list_elements, list):
+        list_elements = [list_elements]
+    for element in list_elements:
+        if not element.length > 0:
+            raise ValueError(f"The length of member '{element.name}' must be positive.")
+
+    minimum_modulus = material.elastic_modulus * MINIMUM_MODULUS_RATIO * combined_factor(elastic_modulus_factors)
+    compression_reference = tuple(
+        material.compression_parallel_strength * _factor_without(factors, "due_column_stability")
+        for factors in (compression_factors_yy, compression_factors_zz)
+    )
+    bending_reference = tuple(
+        material.bending_strength * _factor_without(factors, "due_beam_stability", "due_flat_use")
+        for factors in (bending_factors_yy, bending_factors_zz)
+    )
+    cache_key = (float(minimum_modulus), compression_reference, bending_reference)
+
+    n_sections = len(list_sections)
+    n_elements = len(list_elements)
+    pairs = pd.DataFrame({
+        "member": pd.Categorical(np.repeat([element.name for element in list_elements], n_sections)),
+        "section": pd.Categorical(np.tile([section.name for section in list_sections], n_elements)),
+        "width": np.tile([section.width for section in list_sections], n_elements),
+        "depth": np.tile([section.depth for section in list_sections], n_elements),
+        "length": np.repeat([element.length for element in list_elements], n_sections),
+        "k_yy": np.repeat([element.effective_length_factor_yy for element in list_elements], n_sections),
+        "k_zz": np.repeat([element.effective_length_factor_zz for element in list_elements], n_sections),
+    })
+    pairs[STABILITY_GEOMETRY_COLUMNS] = pairs[STABILITY_GEOMETRY_COLUMNS].astype(float)
+
+    cached = _stability_cache.get(cache_key)
+    if cached is not None:
+        _stability_cache.move_to_end(cache_key)
+    if cached is None:
+        missing = pairs[STABILITY_GEOMETRY_COLUMNS]
+    else:
+        known = pairs[STABILITY_GEOMETRY_COLUMNS].merge(
+            cached[STABILITY_GEOMETRY_COLUMNS], how="left", indicator=True
+        )["_merge"].to_numpy() == "both"
+        missing = pairs.loc[~known, STABILITY_GEOMETRY_COLUMNS]
+    missing = missing.drop_duplicates()
+
+    if len(missing):
+        computed = _compute_stability_factors(missing, minimum_modulus, compression_reference, bending_reference)
+        cached = computed if cached is None else pd.concat([cached, computed], ignore_index=True)
+        _stability_cache[cache_key] = cached.iloc[-STABILITY_CACHE_ROWS:].reset_index(drop=True)
+        _stability_cache.move_to_end(cache_key)
+        while len(_stability_cache) > STABILITY_CACHE_SIZE:
+            _stability_cache.popitem(last=False)
+
+    return pairs.merge(cached, on=STABILITY_GEOMETRY_COLUMNS, how="left")[
+        ["member", "section"] + STABILITY_GEOMETRY_COLUMNS + STABILITY_COLUMNS
+    ]
+
+
 def import_robot_bar_forces(filepath: str) -> pd.DataFrame:
     """
     Creates a Pandas DataFrame from Robot Structural Analysis force export.
@@ -281,9 +555,9 @@ def import_robot_bar_forces(filepath: str) -> pd.DataFrame:
     if len(df_split.columns) < 4:
         raise ValueError("The first column does not have enough parts to form Member, Node, Case, and Mode.")
 
-    df_split.columns = ["Member", "Node", "Case", "Mode"] + [f"Extra_Part_{i}" for i in range(1, len(df_split.columns) - 3)]
+    df_split.columns = ROBOT_INDEX_LEVELS + [f"Extra_Part_{i}" for i in range(1, len(df_split.columns) - 3)]
 
-    df_split = df_split.iloc[:, :4]
+    df_split = df_split.iloc[:, :4].astype("category")
 
     df = pd.concat([df_split, df.drop(columns=[first_column_name])], axis=1)
     print(f'first_column_name {first_column_name}')
@@ -298,10 +572,82 @@ def import_robot_bar_forces(filepath: str) -> pd.DataFrame:
         "Length (m)": "length"
     }, inplace=True)
 
-    df = df.set_index(["Member", "Node", "Case", "Mode"])
+    df = df.set_index(ROBOT_INDEX_LEVELS)
     return df
 
 
+def import_robot_bar_forces_from_files(
+        paths: Union[str, List[str]],
+        max_workers: int = None,
+        use_processes: bool = False,
+) -> pd.DataFrame:
+    """
+    Reads many Robot Structural Analysis force exports concurrently into one table.
+
+    Args:
+        paths: A glob pattern or a list of CSV paths.
+        max_workers: Size of the pool (defaults to one worker per file, up to os.cpu_count()).
+            With a single worker the files are read in the calling process.
+        use_processes: Parse in a process pool instead of a thread pool. The
+            Robot label split and the category conversions hold the GIL, so
+            threads mostly overlap the CSV reading; processes parse in
+            parallel but pickle every table back to the caller. On platforms
+            that spawn workers (Windows, macOS) the calling script must guard
+            its entry point with `if __name__ == "__main__":`.
+
+    Returns:
+        A DataFrame like import_robot_bar_forces with a categorical
+        'source_file' column, the files in the given (or sorted glob) order.
+
+    Assumptions:
+        - All files share the column layout expected by import_robot_bar_forces.
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths))
+        if not paths:
+            raise FileNotFoundError("No Robot export matches the given pattern.")
+    if not paths:
+        raise ValueError("The 'paths' cannot be empty.")
+
+    max_workers = max_workers or min(len(paths), os.cpu_count() or 1)
+    if max_workers == 1:
+        tables = [import_robot_bar_forces(path) for path in paths]
+    else:
+        executor_class = (
+            concurrent.futures.ProcessPoolExecutor if use_processes else concurrent.futures.ThreadPoolExecutor
+        )
+        with executor_class(max_workers=max_workers) as executor:
+            tables = list(executor.map(import_robot_bar_forces, paths))
+
+    df = pd.concat(tables)
+    df.insert(0, "source_file", pd.Categorical(
+        np.repeat(paths, [len(table) for table in tables]), categories=list(dict.fromkeys(paths))
+    ))
+    df.index = pd.MultiIndex.from_arrays(
+        [pd.Categorical(df.index.get_level_values(level).astype(str)) for level in ROBOT_INDEX_LEVELS],
+        names=ROBOT_INDEX_LEVELS,
+    )
+    return df
+
+
+def robot_force_labels(df: pd.DataFrame) -> pd.Categorical:
+    """
+    Builds the force labels of a Robot force table as a categorical.
+
+    Args:
+        df: DataFrame returned by import_robot_bar_forces.
+
+    Returns:
+        A Categorical with one "Member/Node/Case/Mode" label per row.
+
+    Assumptions:
+        - The labels are joined once for the whole table instead of row by row.
+    """
+    levels = [df.index.get_level_values(level).astype(str) for level in range(df.index.nlevels)]
+    labels = levels[0].str.cat(levels[1:], sep="/") if len(levels) > 1 else levels[0]
+    return pd.Categorical(labels)
+
+
 def create_robot_bar_forces_as_objects(df: pd.DataFrame) -> list[Forces]:
     """
     Creates a list of Forces objects from a Pandas DataFrame.
@@ -320,18 +666,46 @@ def create_robot_bar_forces_as_objects(df: pd.DataFrame) -> list[Forces]:
         - No missing data needs to be handled
     """
 
-    forces_list = []
-    for index, row in df.iterrows():
-        name = "/".join(map(str, index))
+    names = robot_force_labels(df).astype(str).tolist()
 
-        forces = Forces(
+    return [
+        Forces(
             name=name,
-            axial=row['axial'],
-            shear_y=row['shear_y'],
-            shear_z=row['shear_z'],
-            moment_xx=row['torque'],
-            moment_yy=row['moment_yy'],
-            moment_zz=row['moment_zz'],
+            axial=axial,
+            shear_y=shear_y,
+            shear_z=shear_z,
+            moment_xx=torque,
+            moment_yy=moment_yy,
+            moment_zz=moment_zz,
+        )
+        for name, axial, shear_y, shear_z, torque, moment_yy, moment_zz in zip(
+            names,
+            df['axial'].tolist(),
+            df['shear_y'].tolist(),
+            df['shear_z'].tolist(),
+            df['torque'].tolist(),
+            df['moment_yy'].tolist(),
+            df['moment_zz'].tolist(),
         )
-        forces_list.append(forces)
-    return forces_list
+    ]
+
+
+def forces_to_frame(list_forces: list[Forces]) -> pd.DataFrame:
+    """
+    Creates a force table from a list of Forces objects.
+
+    Args:
+        list_forces: Forces objects to tabulate.
+
+    Returns:
+        A DataFrame with the FORCE_COLUMNS, indexed by force name.
+    """
+    return pd.DataFrame(
+        [
+            (force.axial, force.shear_y, force.shear_z, force.moment_xx, force.moment_yy, force.moment_zz)
+            for force in list_forces
+        ],
+        columns=FORCE_COLUMNS,
+        index=pd.CategoricalIndex([force.name for force in list_forces], name="force"),
+        dtype=float,
+    )
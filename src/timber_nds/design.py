@@ -1,8 +1,18 @@
-from typing import Union, List, Dict, Literal
+from typing import Union, List, Dict, Literal, Callable, Optional, Tuple
 from tqdm import tqdm
 import pandas as pd
 import os
 import operator
+import hashlib
+import json
+import dataclasses
+import numbers
+import tracemalloc
+import sys
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 import numpy as np
 from timber_nds.settings import (
@@ -16,9 +26,72 @@ from timber_nds.settings import (
     MemberDefinition,
     WoodMaterial,
     Forces,
+    combined_factor,
 )
 
-from timber_nds.calculation import RectangularSectionProperties
+from timber_nds.calculation import (
+    RectangularSectionProperties,
+    FORCE_COLUMNS,
+    STABILITY_COLUMNS,
+    robot_force_labels,
+    forces_to_frame,
+)
+
+
+LABEL_COLUMNS = ["member", "section", "force"]
+CAPACITY_COLUMNS = ["tension", "compression", "bending_yy", "bending_zz", "shear", "compression_perp"]
+DCR_COLUMNS = [
+    "tension (dcr)",
+    "compression (dcr)",
+    "biaxial bending (dcr)",
+    "shear y (dcr)",
+    "shear z (dcr)",
+    "bending and tension (dcr)",
+    "bending and compression (dcr)",
+    "compression perpendicular (dcr)",
+]
+GOVERNING_DCR_COLUMNS = [
+    "tension (dcr)",
+    "biaxial bending (dcr)",
+    "shear y (dcr)",
+    "shear z (dcr)",
+    "compression (dcr)",
+    "bending and compression (dcr)",
+]
+DCR_OUTPUT_COLUMNS = DCR_COLUMNS + ["dcr_max"]
+
+
+def encode_labels(results_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stores the member, section and force labels of a result frame as categoricals.
+
+    Args:
+        results_df: DataFrame produced by the design checks.
+
+    Returns:
+        The same DataFrame with its label columns dictionary-encoded.
+    """
+    for column in LABEL_COLUMNS:
+        if column in results_df.columns and not isinstance(results_df[column].dtype, pd.CategoricalDtype):
+            results_df[column] = results_df[column].astype("category")
+    return results_df
+
+
+def decode_labels(results_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns a copy of a result frame with its label columns decoded back to strings.
+
+    Args:
+        results_df: DataFrame produced by the design checks.
+
+    Returns:
+        A DataFrame ready to be exported.
+    """
+    decoded_df = results_df.copy()
+    for column in LABEL_COLUMNS:
+        if column in decoded_df.columns and isinstance(decoded_df[column].dtype, pd.CategoricalDtype):
+            decoded_df[column] = decoded_df[column].astype(str)
+    return decoded_df
 
 
 class WoodElementCalculator:
@@ -49,14 +122,14 @@ class WoodElementCalculator:
 
     def calculate_combined_factors(self) -> dict:
         try:
-            tension_combined = np.prod(list(self.tension_factors.__dict__.values()))
-            bending_combined_yy = np.prod(list(self.bending_factors_yy.__dict__.values()))
-            bending_combined_zz = np.prod(list(self.bending_factors_zz.__dict__.values()))
-            shear_combined = np.prod(list(self.shear_factors.__dict__.values()))
-            compression_combined_yy = np.prod(list(self.compression_factors_yy.__dict__.values()))
-            compression_combined_zz = np.prod(list(self.compression_factors_zz.__dict__.values()))
-            compression_perp_combined = np.prod(list(self.compression_perp_factors.__dict__.values()))
-            elastic_modulus_combined = np.prod(list(self.elastic_modulus_factors.__dict__.values()))
+            tension_combined = combined_factor(self.tension_factors)
+            bending_combined_yy = combined_factor(self.bending_factors_yy)
+            bending_combined_zz = combined_factor(self.bending_factors_zz)
+            shear_combined = combined_factor(self.shear_factors)
+            compression_combined_yy = combined_factor(self.compression_factors_yy)
+            compression_combined_zz = combined_factor(self.compression_factors_zz)
+            compression_perp_combined = combined_factor(self.compression_perp_factors)
+            elastic_modulus_combined = combined_factor(self.elastic_modulus_factors)
         except TypeError as e:
             raise TypeError(f"All factor values must be numeric: {e}") from e
 
@@ -126,6 +199,155 @@ class WoodElementCalculator:
         )
 
 
+VALIDATION_COLUMNS = ["input", "label", "field", "problem"]
+
+
+def _check_input_types(section: RectangularSection, element: MemberDefinition, material: WoodMaterial):
+    if not isinstance(section, RectangularSection):
+        raise TypeError("'section' must be a RectangularSection instance.")
+    if not isinstance(element, MemberDefinition):
+        raise TypeError("'element' must be a MemberDefinition instance.")
+    if not isinstance(material, WoodMaterial):
+        raise TypeError("'material' must be a WoodMaterial instance.")
+
+
+def _mask_issues(mask: pd.DataFrame, input_name: str, problem: str) -> pd.DataFrame:
+    rows, columns = np.nonzero(mask.to_numpy())
+    return pd.DataFrame({
+        "input": input_name,
+        "label": mask.index[rows].astype(str),
+        "field": mask.columns[columns],
+        "problem": problem,
+    }, columns=VALIDATION_COLUMNS)
+
+
+def _finite_real_mask(values: pd.DataFrame) -> pd.DataFrame:
+    # Numeric columns are checked as arrays; object columns value by value, so
+    # strings such as "5" are flagged instead of being coerced to numbers.
+    valid = pd.DataFrame(False, index=values.index, columns=values.columns)
+    for column in values.columns:
+        column_values = values[column]
+        if pd.api.types.is_numeric_dtype(column_values) and not pd.api.types.is_bool_dtype(column_values):
+            numeric = column_values.to_numpy(dtype=float)
+        else:
+            numeric = np.array([
+                float(value) if isinstance(value, numbers.Real) and not isinstance(value, bool) else np.nan
+                for value in column_values
+            ], dtype=float)
+        valid[column] = np.isfinite(numeric)
+    return valid
+
+
+def _positive_finite_mask(values: pd.DataFrame) -> pd.DataFrame:
+    valid = _finite_real_mask(values)
+    return valid & (values.where(valid).astype(float) > 0)
+
+
+def force_values_mask(list_forces: Union[List[Forces], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Flags the force values that are not finite numbers, for the whole table at once.
+
+    Args:
+        list_forces: Forces objects or a table with the FORCE_COLUMNS.
+
+    Returns:
+        A boolean DataFrame with the FORCE_COLUMNS, True where a value is
+        NaN, infinite or not a real number (numeric strings included).
+        Entries that are not Forces objects are flagged in every column.
+    """
+    if isinstance(list_forces, pd.DataFrame):
+        values = list_forces[FORCE_COLUMNS]
+        index = list_forces.index
+    else:
+        index = pd.Index([getattr(force, "name", None) for force in list_forces], name="force")
+        values = pd.DataFrame(
+            [
+                (force.axial, force.shear_y, force.shear_z, force.moment_xx, force.moment_yy, force.moment_zz)
+                if isinstance(force, Forces) else (None,) * len(FORCE_COLUMNS)
+                for force in list_forces
+            ],
+            columns=FORCE_COLUMNS,
+            index=index,
+        )
+    return ~_finite_real_mask(values)
+
+
+def validate_design_inputs(
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        list_forces: Union[List[Forces], pd.DataFrame],
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Checks the force table, the sections and the material once, before the design loops.
+
+    Flags non-finite force values, non-positive or non-finite section
+    dimensions and material strengths, and capacities that are zero, negative
+    or not finite (the DCR checks report 0 for a zero capacity).
+
+    Returns:
+        A DataFrame with the VALIDATION_COLUMNS, one row per problem; it is
+        empty when the inputs are valid.
+    """
+    if not isinstance(list_sections, list):
+        list_sections = [list_sections]
+    if not isinstance(material, WoodMaterial):
+        raise TypeError("'material' must be a WoodMaterial instance.")
+
+    issues = [_mask_issues(force_values_mask(list_forces), "force", "not a finite number")]
+
+    section_names = pd.Index([section.name for section in list_sections], name="section")
+    dimensions = pd.DataFrame(
+        [(section.depth, section.width) for section in list_sections],
+        columns=["depth", "width"],
+        index=section_names,
+    )
+    invalid_sections = ~_positive_finite_mask(dimensions)
+    issues.append(_mask_issues(invalid_sections, "section", "must be a positive finite number"))
+
+    strengths = [
+        "tension_strength", "bending_strength", "shear_strength", "compression_perpendicular_strength",
+        "compression_parallel_strength", "elastic_modulus",
+    ]
+    material_values = pd.DataFrame(
+        [[getattr(material, strength) for strength in strengths]], columns=strengths,
+        index=pd.Index([material.name]),
+    )
+    issues.append(_mask_issues(~_positive_finite_mask(material_values), "material", "must be a positive finite number"))
+
+    valid_sections = [section for section, invalid in zip(list_sections, invalid_sections.any(axis=1)) if not invalid]
+    if valid_sections:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            capacities = calculate_section_capacities(
+                valid_sections, material, tension_factors, bending_factors_yy, bending_factors_zz, shear_factors,
+                compression_factors_yy, compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+                support_area,
+            )
+        issues.append(_mask_issues(
+            ~(np.isfinite(capacities) & (capacities > 0)), "capacity", "must be a positive finite number"
+        ))
+
+    return pd.concat(issues, ignore_index=True)
+
+
+def _print_design_issues(report: pd.DataFrame, skip_forces: bool = False):
+    if skip_forces:
+        report = report[report["input"] != "force"]
+    if report.empty:
+        return
+    print("\nInput problems found before the checks:")
+    for input_name, label, field, problem in report[VALIDATION_COLUMNS].itertuples(index=False):
+        print(f"{input_name} '{label}', {field}: {problem}")
+
+
 def calculate_dcr_for_wood_elements(
     section: RectangularSection,
     element: MemberDefinition,
@@ -139,16 +361,13 @@ def calculate_dcr_for_wood_elements(
     compression_factors_zz: CompressionAdjustmentFactors,
     compression_perp_factors: PerpendicularAdjustmentFactors,
     elastic_modulus_factors: ElasticModulusAdjustmentFactors,
-    support_area: float
+    support_area: float,
+    validate: bool = True,
 ) -> dict:
-    if not isinstance(section, RectangularSection):
-        raise TypeError("'section' must be a RectangularSection instance.")
-    if not isinstance(element, MemberDefinition):
-        raise TypeError("'element' must be a MemberDefinition instance.")
-    if not isinstance(forces, Forces):
-        raise TypeError("'force' must be a Forces instance.")
-    if not isinstance(material, WoodMaterial):
-        raise TypeError("'material' must be a WoodMaterial instance.")
+    if validate:
+        _check_input_types(section, element, material)
+        if not isinstance(forces, Forces):
+            raise TypeError("'force' must be a Forces instance.")
 
     section_properties = RectangularSectionProperties(
         width=section.width, depth=section.depth
@@ -190,9 +409,8 @@ def calculate_dcr_for_wood_elements(
     dcr_results["moment yy"] = abs(forces.moment_yy)
     dcr_results["moment zz"] = abs(forces.moment_zz)
     dcr_results["biaxial bending (dcr)"] = (
-        float(abs(forces.moment_yy) / bending_capacity_yy) + float(abs(forces.moment_zz) / bending_capacity_zz)
-        if bending_capacity_yy or bending_capacity_zz != 0
-        else 0
+        (float(abs(forces.moment_yy) / bending_capacity_yy) if bending_capacity_yy != 0 else 0)
+        + (float(abs(forces.moment_zz) / bending_capacity_zz) if bending_capacity_zz != 0 else 0)
     )
 
     shear_capacity_y = wood_calculator.shear_strength()
@@ -236,7 +454,8 @@ def check_for_all_forces(
         compression_factors_zz: float,
         compression_perp_factors: float,
         elastic_modulus_factors: float,
-        support_area: float
+        support_area: float,
+        validate: bool = True,
 ) -> pd.DataFrame:
     if not isinstance(list_forces, list):
         list_forces = [list_forces]
@@ -244,46 +463,44 @@ def check_for_all_forces(
     if not list_forces:
         raise ValueError("The 'list_forces' is not a list.")
 
-    all_results = []
-    errors = []
+    _check_input_types(section, element, material)
+    invalid_forces = force_values_mask(list_forces).any(axis=1).to_numpy()
+    if validate:
+        # Invalid force rows are reported below, next to the rows they skip.
+        _print_design_issues(validate_design_inputs(
+            section, list_forces, material, tension_factors, bending_factors_yy, bending_factors_zz,
+            shear_factors, compression_factors_yy, compression_factors_zz, compression_perp_factors,
+            elastic_modulus_factors, support_area,
+        ), skip_forces=True)
+    errors = [
+        f"Error processing section '{section.name}', member '{element.name}', force "
+        f"'{getattr(force, 'name', force)}': force values must be finite numbers"
+        for force, invalid in zip(list_forces, invalid_forces) if invalid
+    ]
 
-    for force in tqdm(list_forces, desc="Checking for all forces"):
+    all_results = []
+    for force, invalid in zip(tqdm(list_forces, desc="Checking for all forces"), invalid_forces):
+        if invalid:
+            continue
         print(f'Calculando para la fuerza: {force.name}')
-        try:
-            dcr = calculate_dcr_for_wood_elements(
-                section=section, element=element, forces=force, material=material,
-                tension_factors=tension_factors, bending_factors_yy=bending_factors_yy,
-                bending_factors_zz=bending_factors_zz, shear_factors=shear_factors,
-                compression_factors_yy=compression_factors_yy, compression_factors_zz=compression_factors_zz,
-                compression_perp_factors=compression_perp_factors, elastic_modulus_factors=elastic_modulus_factors,
-                support_area=support_area
-            )
+        dcr = calculate_dcr_for_wood_elements(
+            section=section, element=element, forces=force, material=material,
+            tension_factors=tension_factors, bending_factors_yy=bending_factors_yy,
+            bending_factors_zz=bending_factors_zz, shear_factors=shear_factors,
+            compression_factors_yy=compression_factors_yy, compression_factors_zz=compression_factors_zz,
+            compression_perp_factors=compression_perp_factors, elastic_modulus_factors=elastic_modulus_factors,
+            support_area=support_area, validate=False,
+        )
 
-            try:
-                section_name = section.name
-                member_name = element.name
-                force_name = force.name
-            except AttributeError:
-                raise AttributeError("Section, element, and force must have a 'name' attribute.")
-
-            max_dcr = max(dcr.get(key, 0) for key in [
-                "dcr_tension", "biaxial bending (dcr)",
-                "shear y (dcr)", "shear z (dcr)",
-                "compression (dcr)", "bending and compression (dcr)"
-            ])
-
-            result = {
-                "member": member_name, "section": section_name, "force": force_name, "dcr_max": max_dcr
-            }
-            result.update(dcr)
-            all_results.append(result)
-
-        except Exception as e:
-            error_msg = f"Error processing section '{section.name}', member '{element.name}', force '{force.name}': {e}"
-            errors.append(error_msg)
-            print(error_msg)
-
-    all_results_df = pd.DataFrame(all_results)
+        max_dcr = max(dcr.get(key, 0) for key in GOVERNING_DCR_COLUMNS)
+
+        result = {
+            "member": element.name, "section": section.name, "force": force.name, "dcr_max": max_dcr
+        }
+        result.update(dcr)
+        all_results.append(result)
+
+    all_results_df = encode_labels(pd.DataFrame(all_results))
 
     if errors:
         print("\nErrors encountered during processing:")
@@ -293,6 +510,68 @@ def check_for_all_forces(
     return all_results_df
 
 
+def _write_atomically(df: pd.DataFrame, path: str):
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    df.to_pickle(temporary_path)
+    os.replace(temporary_path, path)
+
+
+def inputs_fingerprint(*inputs) -> str:
+    """
+    Hashes the repr of the design inputs, item by item for lists.
+
+    Returns:
+        A SHA-256 hex digest that changes whenever any input value changes.
+    """
+    digest = hashlib.sha256()
+    for value in inputs:
+        items = value if isinstance(value, list) else [value]
+        digest.update(f"{type(value).__name__}:{len(items)}".encode("utf-8"))
+        for item in items:
+            digest.update(repr(item).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _checkpoint_chunk_path(checkpoint_dir: str, section_index: int, chunk_index: int) -> str:
+    return os.path.join(checkpoint_dir, f"section_{section_index:06d}_chunk_{chunk_index:06d}.pkl")
+
+
+def _checkpoint_chunk_key(name: str) -> tuple:
+    section_part, chunk_part = name[len("section_"):-len(".pkl")].split("_chunk_")
+    return int(section_part), int(chunk_part)
+
+
+def _open_checkpoint(checkpoint_dir: str, fingerprint: str, resume: bool) -> dict:
+    """
+    Prepares a checkpoint directory and returns the chunks that can be reused,
+    keyed by (section index, force chunk index).
+    """
+    manifest_path = os.path.join(checkpoint_dir, "manifest.json")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    chunk_files = sorted(
+        name for name in os.listdir(checkpoint_dir) if name.startswith("section_") and name.endswith(".pkl")
+    )
+
+    if resume and os.path.exists(manifest_path):
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get("fingerprint") != fingerprint:
+            raise ValueError(
+                f"The inputs changed since the checkpoint in '{checkpoint_dir}' was written; "
+                "run again without resume to start over."
+            )
+        return {
+            _checkpoint_chunk_key(name): os.path.join(checkpoint_dir, name)
+            for name in chunk_files if "_chunk_" in name
+        }
+
+    for name in chunk_files:
+        os.remove(os.path.join(checkpoint_dir, name))
+    with open(manifest_path, "w") as manifest_file:
+        json.dump({"fingerprint": fingerprint}, manifest_file)
+    return {}
+
+
 def check_for_all_sections(
         list_sections: Union[List[RectangularSection], RectangularSection],
         list_elements: Union[List[MemberDefinition], MemberDefinition],
@@ -306,44 +585,83 @@ def check_for_all_sections(
         compression_factors_zz: float,
         compression_perp_factors: float,
         elastic_modulus_factors: float,
-        support_area
+        support_area,
+        checkpoint_dir: str = None,
+        resume: bool = False,
+        checkpoint_every: int = 1000,
 ) -> pd.DataFrame:
     if not isinstance(list_sections, list):
         list_sections = [list_sections]
+    if not isinstance(list_forces, list):
+        list_forces = [list_forces]
 
     if not list_sections:
         raise ValueError("The 'list_sections' cannot be empty.")
+    if resume and checkpoint_dir is None:
+        raise ValueError("resume requires a checkpoint_dir.")
+    if checkpoint_every <= 0:
+        raise ValueError("checkpoint_every must be a positive integer.")
+
+    completed = {}
+    chunk_size = max(len(list_forces), 1)
+    if checkpoint_dir is not None:
+        # Every checkpoint_every forces of a section are saved as one chunk, so
+        # an interrupted run resumes within the section it stopped in.
+        chunk_size = checkpoint_every
+        fingerprint = inputs_fingerprint(
+            list_sections, list_elements, list_forces, material, tension_factors, bending_factors_yy,
+            bending_factors_zz, shear_factors, compression_factors_yy, compression_factors_zz,
+            compression_perp_factors, elastic_modulus_factors, support_area, checkpoint_every,
+        )
+        completed = _open_checkpoint(checkpoint_dir, fingerprint, resume)
+
+    if np.isscalar(support_area):
+        _print_design_issues(validate_design_inputs(
+            list_sections, list_forces, material, tension_factors, bending_factors_yy, bending_factors_zz,
+            shear_factors, compression_factors_yy, compression_factors_zz, compression_perp_factors,
+            elastic_modulus_factors, support_area,
+        ), skip_forces=True)
 
     all_results = []
     errors = []
 
-    for section in tqdm(list_sections, desc="Checking for all sections"):
+    for i, section in enumerate(tqdm(list_sections, desc="Checking for all sections")):
         print('..................................................')
         print(f'Calculando para la sección: {section.name}')
         print('..................................................')
-        try:
-            dcr_df = check_for_all_forces(
-                section=section,
-                element=list_elements,
-                list_forces=list_forces,
-                material=material,
-                tension_factors=tension_factors,
-                bending_factors_yy=bending_factors_yy,
-                bending_factors_zz=bending_factors_zz,
-                shear_factors=shear_factors,
-                compression_factors_yy=compression_factors_yy,
-                compression_factors_zz=compression_factors_zz,
-                compression_perp_factors=compression_perp_factors,
-                elastic_modulus_factors=elastic_modulus_factors,
-                support_area=support_area
-            )
+        for j, start in enumerate(range(0, len(list_forces), chunk_size)):
+            if (i, j) in completed:
+                all_results.append(pd.read_pickle(completed[(i, j)]))
+                continue
+            try:
+                dcr_df = check_for_all_forces(
+                    section=section,
+                    element=list_elements,
+                    list_forces=list_forces[start:start + chunk_size],
+                    material=material,
+                    tension_factors=tension_factors,
+                    bending_factors_yy=bending_factors_yy,
+                    bending_factors_zz=bending_factors_zz,
+                    shear_factors=shear_factors,
+                    compression_factors_yy=compression_factors_yy,
+                    compression_factors_zz=compression_factors_zz,
+                    compression_perp_factors=compression_perp_factors,
+                    elastic_modulus_factors=elastic_modulus_factors,
+                    support_area=support_area,
+                    validate=False,
+                )
 
-            all_results.append(dcr_df)
+                all_results.append(dcr_df)
+                if checkpoint_dir is not None:
+                    _write_atomically(dcr_df, _checkpoint_chunk_path(checkpoint_dir, i, j))
 
-        except Exception as e:
-            error_msg = f"Error processing section '{section.name}': {e}"
-            errors.append(error_msg)
-            print(error_msg)
+            except Exception as e:
+                error_msg = (
+                    f"Error processing section '{section.name}', forces {start} to "
+                    f"{min(start + chunk_size, len(list_forces)) - 1}: {e}"
+                )
+                errors.append(error_msg)
+                print(error_msg)
 
     if errors:
         print("\nErrors encountered during processing:")
@@ -351,7 +669,7 @@ def check_for_all_sections(
             print(error)
 
     if all_results:
-        return pd.concat(all_results, ignore_index=True)
+        return encode_labels(pd.concat(all_results, ignore_index=True))
     else:
         return pd.DataFrame()
 
@@ -374,61 +692,69 @@ def check_for_all_elements(
     if not list_sections or not list_elements or not list_forces :
         return pd.DataFrame()
 
+    support_areas = (
+        pd.Series(support_area_values, dtype=float).reindex([element.name for element in list_elements]).fillna(1.0)
+    ).to_numpy()
+
+    # The guards below would turn NaN or infinite forces into a zero DCR, so
+    # such rows are dropped and reported instead.
+    invalid_forces = force_values_mask(list_forces).any(axis=1).to_numpy()
+    for force, invalid in zip(list_forces, invalid_forces):
+        if invalid:
+            print(f"Skipping force '{getattr(force, 'name', force)}': force values must be finite numbers")
+    list_forces = [force for force, invalid in zip(list_forces, invalid_forces) if not invalid]
+    if not list_forces:
+        return pd.DataFrame()
+
     results = []
     for section in list_sections :
-        for element in list_elements :
+        section_properties = RectangularSectionProperties(width=section.width, depth=section.depth)
+        wood_calculator = WoodElementCalculator(
+            tension_factors=tension_factors,
+            bending_factors_yy=bending_factors_yy,
+            bending_factors_zz=bending_factors_zz,
+            shear_factors=shear_factors,
+            compression_factors_yy=compression_factors_yy,
+            compression_factors_zz=compression_factors_zz,
+            compression_perp_factors=compression_perp_factors,
+            elastic_modulus_factors=elastic_modulus_factors,
+            material_properties=material,
+            section_properties=section_properties,
+        )
+        # Capacities depend only on the section and support area, so they are
+        # evaluated once and zero capacities are handled by the guards below.
+        tension_capacity = wood_calculator.tension_strength()
+        bending_capacity_yy = wood_calculator.bending_strength("yy")
+        bending_capacity_zz = wood_calculator.bending_strength("zz")
+        shear_capacity = wood_calculator.shear_strength()
+        compression_capacity = wood_calculator.compression_strength("yy")
+
+        compression_perp_capacities = wood_calculator.compression_perp_strength(support_areas).tolist()
+
+        for element, compression_perp_capacity in zip(list_elements, compression_perp_capacities) :
             for forces in list_forces :
+                dcr_tension = abs(forces.axial) / tension_capacity if forces.axial > 0 and tension_capacity else 0
 
-                section_properties = RectangularSectionProperties(width=section.width, depth=section.depth)
-                wood_calculator = WoodElementCalculator(
-                    tension_factors=tension_factors,
-                    bending_factors_yy=bending_factors_yy,
-                    bending_factors_zz=bending_factors_zz,
-                    shear_factors=shear_factors,
-                    compression_factors_yy=compression_factors_yy,
-                    compression_factors_zz=compression_factors_zz,
-                    compression_perp_factors=compression_perp_factors,
-                    elastic_modulus_factors=elastic_modulus_factors,
-                    material_properties=material,
-                    section_properties=section_properties,
+                dcr_bending_yy = (
+                    abs(forces.moment_yy) / bending_capacity_yy if forces.moment_yy and bending_capacity_yy else 0
+                )
+                dcr_bending_zz = (
+                    abs(forces.moment_zz) / bending_capacity_zz if forces.moment_zz and bending_capacity_zz else 0
                 )
 
-                support_area = support_area_values.get(element.name, 1.0)
-
-                try :
-                    dcr_tension = abs(forces.axial) / wood_calculator.tension_strength() if forces.axial > 0 else 0
-                except ZeroDivisionError :
-                    dcr_tension = 0
+                dcr_biaxial_bending = dcr_bending_yy + dcr_bending_zz
 
-                dcr_bending_yy = abs(forces.moment_yy) / wood_calculator.bending_strength(
-                    "yy") if forces.moment_yy else 0
-                dcr_bending_zz = abs(forces.moment_zz) / wood_calculator.bending_strength(
-                    "zz") if forces.moment_zz else 0
+                dcr_shear_y = abs(forces.shear_y) / shear_capacity if forces.shear_y and shear_capacity else 0
+                dcr_shear_z = abs(forces.shear_z) / shear_capacity if forces.shear_z and shear_capacity else 0
 
-                dcr_biaxial_bending = dcr_bending_yy + dcr_bending_zz
+                dcr_compression = (
+                    abs(forces.axial) / compression_capacity if forces.axial < 0 and compression_capacity else 0
+                )
 
-                try :
-                    dcr_shear_y = abs(forces.shear_y) / wood_calculator.shear_strength() if forces.shear_y else 0
-                except ZeroDivisionError :
-                    dcr_shear_y = 0
-
-                try :
-                    dcr_shear_z = abs(forces.shear_z) / wood_calculator.shear_strength() if forces.shear_z else 0
-                except ZeroDivisionError :
-                    dcr_shear_z = 0
-
-                try :
-                    dcr_compression = abs(forces.axial) / wood_calculator.compression_strength(
-                        "yy") if forces.axial < 0 else 0
-                except ZeroDivisionError :
-                    dcr_compression = 0
-
-                try :
-                    max_shear = max(abs(forces.shear_y), abs(forces.shear_z)) # Correct calculation of max_shear
-                    dcr_compression_perp = max_shear / wood_calculator.compression_perp_strength(
-                        support_area) if max_shear > 0 else 0 # Correct use of max_shear and add if condition
-                except ZeroDivisionError :
-                    dcr_compression_perp = 0
+                max_shear = max(abs(forces.shear_y), abs(forces.shear_z))
+                dcr_compression_perp = (
+                    max_shear / compression_perp_capacity if max_shear > 0 and compression_perp_capacity else 0
+                )
 
                 dcr_bending_and_compression = dcr_compression + dcr_biaxial_bending
 
@@ -445,34 +771,1117 @@ def check_for_all_elements(
                     "compression perpendicular (dcr)" : dcr_compression_perp
 
                 })
-    return pd.DataFrame(results)
+    return encode_labels(pd.DataFrame(results))
 
 
-def filter_and_export_results(
-    results_df: pd.DataFrame,
-    filters: Dict[str, Union[str, List[str], Dict[str, Union[int, float, dict]]]],
-    output_path: str = None,
-    output_filename: str = "filtered_results.xlsx",
-    sort_by: str = None,
-    sort_order: Literal["asc", "desc"] = "asc",
+def capacity_array(wood_calculator: WoodElementCalculator, support_area: Union[float, np.ndarray] = 1.0) -> np.ndarray:
+    """
+    Evaluates the capacities of a calculator as an array with the CAPACITY_COLUMNS.
+
+    Factor fields, material strengths or the support area may be NumPy arrays;
+    they broadcast and the capacities gain their shape as leading dimensions.
+
+    Returns:
+        Array of shape (..., 6).
+    """
+    return np.stack(
+        np.broadcast_arrays(
+            wood_calculator.tension_strength(),
+            np.maximum(wood_calculator.compression_strength("yy"), wood_calculator.compression_strength("zz")),
+            wood_calculator.bending_strength("yy"),
+            wood_calculator.bending_strength("zz"),
+            wood_calculator.shear_strength(),
+            wood_calculator.compression_perp_strength(support_area),
+        ),
+        axis=-1,
+    ).astype(float)
+
+
+def calculate_section_capacities(
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area: float = 1.0,
 ) -> pd.DataFrame:
-    if not isinstance(results_df, pd.DataFrame):
-        raise TypeError("Input must be a pandas DataFrame.")
+    """
+    Tabulates the capacities used by the DCR checks, one row per section.
+
+    Returns:
+        A DataFrame with the CAPACITY_COLUMNS, indexed by section name.
+    """
+    if not isinstance(list_sections, list):
+        list_sections = [list_sections]
+
+    rows = []
+    for section in list_sections:
+        wood_calculator = WoodElementCalculator(
+            tension_factors=tension_factors,
+            bending_factors_yy=bending_factors_yy,
+            bending_factors_zz=bending_factors_zz,
+            shear_factors=shear_factors,
+            compression_factors_yy=compression_factors_yy,
+            compression_factors_zz=compression_factors_zz,
+            compression_perp_factors=compression_perp_factors,
+            elastic_modulus_factors=elastic_modulus_factors,
+            material_properties=material,
+            section_properties=RectangularSectionProperties(width=section.width, depth=section.depth),
+        )
+        rows.append(capacity_array(wood_calculator, support_area))
+
+    return pd.DataFrame(
+        rows,
+        columns=CAPACITY_COLUMNS,
+        index=pd.Index([section.name for section in list_sections], name="section"),
+        dtype=float,
+    )
+
+
+DCR_CHUNK_SIZE = 8192
+
+
+def _reciprocal_capacities(capacities: np.ndarray, dtype) -> np.ndarray:
+    reciprocal = np.zeros(capacities.shape, dtype=dtype)
+    np.divide(1.0, capacities, out=reciprocal, where=capacities != 0)
+    return reciprocal
+
+
+def calculate_dcr_arrays(
+        forces: np.ndarray,
+        capacities: np.ndarray,
+        out: np.ndarray = None,
+        dtype: Union[str, type] = np.float64,
+        chunk_size: int = DCR_CHUNK_SIZE,
+) -> np.ndarray:
+    """
+    Computes the DCRs of many force rows at once.
+
+    Follows the same rules as calculate_dcr_for_wood_elements: positive axial
+    forces are compression, negative ones tension, and a zero capacity gives a
+    zero DCR. Every column is written in place into a single output buffer,
+    tile by tile, so the only temporaries are one tile-sized scratch array and
+    the reciprocal capacities.
+
+    Args:
+        forces: Array of shape (n, 6) with the FORCE_COLUMNS.
+        capacities: Array of shape (6,) or (n, 6) with the CAPACITY_COLUMNS.
+        out: Optional preallocated array of shape (n, 9); its dtype overrides dtype.
+        dtype: np.float64, or np.float32 to halve memory traffic when screening.
+        chunk_size: Number of rows per tile.
+
+    Returns:
+        Array of shape (n, 9) with the DCR_OUTPUT_COLUMNS.
+    """
+    forces = np.asarray(forces)
+    capacities = np.asarray(capacities, dtype=float)
+    n_rows = len(forces)
+    if out is None:
+        out = np.empty((n_rows, len(DCR_OUTPUT_COLUMNS)), dtype=dtype)
+    elif out.shape != (n_rows, len(DCR_OUTPUT_COLUMNS)):
+        raise ValueError(f"out must have shape {(n_rows, len(DCR_OUTPUT_COLUMNS))}.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    per_row = capacities.ndim == 2
+    reciprocal = None if per_row else _reciprocal_capacities(capacities, out.dtype)
+    scratch = np.empty(min(chunk_size, n_rows), dtype=out.dtype)
+    governing = [DCR_COLUMNS.index(column) for column in GOVERNING_DCR_COLUMNS]
+
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        tile_forces = forces[start:stop]
+        tile = out[start:stop]
+        tmp = scratch[:stop - start]
+        inverse = _reciprocal_capacities(capacities[start:stop], out.dtype).T if per_row else reciprocal
+
+        np.negative(tile_forces[:, 0], out=tmp)
+        np.maximum(tmp, 0, out=tmp)
+        np.multiply(tmp, inverse[0], out=tile[:, 0])
+
+        np.maximum(tile_forces[:, 0], 0, out=tmp)
+        np.multiply(tmp, inverse[1], out=tile[:, 1])
+
+        np.abs(tile_forces[:, 4], out=tmp)
+        np.multiply(tmp, inverse[2], out=tile[:, 2])
+        np.abs(tile_forces[:, 5], out=tmp)
+        np.multiply(tmp, inverse[3], out=tmp)
+        np.add(tile[:, 2], tmp, out=tile[:, 2])
+
+        np.abs(tile_forces[:, 1], out=tmp)
+        np.multiply(tmp, inverse[4], out=tile[:, 3])
+
+        np.abs(tile_forces[:, 2], out=tmp)
+        np.multiply(tmp, inverse[4], out=tile[:, 4])
+        np.multiply(tmp, inverse[5], out=tile[:, 7])
+
+        np.add(tile[:, 0], tile[:, 2], out=tile[:, 5])
+        np.multiply(tile[:, 1], tile[:, 1], out=tile[:, 6])
+        np.add(tile[:, 6], tile[:, 2], out=tile[:, 6])
+
+        np.copyto(tile[:, -1], tile[:, governing[0]])
+        for column in governing[1:]:
+            np.maximum(tile[:, -1], tile[:, column], out=tile[:, -1])
+
+    return out
+
+
+def force_table_labels(
+        forces_df: pd.DataFrame,
+        element: MemberDefinition = None,
+) -> tuple:
+    """
+    Returns the member and force labels of a force table as categoricals.
+
+    The member label is the element name when one is given, otherwise the
+    Robot 'Member' index level.
+    """
+    forces = robot_force_labels(forces_df)
+    if element is not None:
+        members = pd.Categorical.from_codes(np.zeros(len(forces_df), dtype=np.int8), [element.name])
+    elif "Member" in forces_df.index.names:
+        members = pd.Categorical(forces_df.index.get_level_values("Member").astype(str))
+    else:
+        raise ValueError("The force table has no 'Member' level; pass the 'element' it belongs to.")
+    return members, forces
+
+
+def build_results_frame(
+        dcr: np.ndarray,
+        section_names: List[str],
+        members: pd.Categorical,
+        forces: pd.Categorical,
+        section_categories: List[str] = None,
+) -> pd.DataFrame:
+    """
+    Assembles the result frame of a section x force-row DCR block.
+
+    Args:
+        dcr: Array of shape (len(section_names) * len(forces), 9), section-major.
+        section_names: Name of each section block.
+        members: Member label of each force row.
+        forces: Force label of each force row.
+        section_categories: Categories of the section column, so chunks of one
+            run share them; defaults to the unique section_names.
+
+    Returns:
+        A DataFrame with categorical label columns and the DCR_OUTPUT_COLUMNS.
+    """
+    n_sections = len(section_names)
+    if section_categories is None:
+        section_codes, section_categories = pd.factorize(pd.Index(section_names))
+    else:
+        section_categories = pd.Index(section_categories).unique()
+        section_codes = section_categories.get_indexer(section_names)
+    results_df = pd.DataFrame(np.asarray(dcr).reshape(-1, len(DCR_OUTPUT_COLUMNS)), columns=DCR_OUTPUT_COLUMNS)
+    results_df.insert(0, "member", pd.Categorical.from_codes(np.tile(members.codes, n_sections), members.categories))
+    results_df.insert(
+        1, "section", pd.Categorical.from_codes(np.repeat(section_codes, len(forces)), section_categories)
+    )
+    results_df.insert(2, "force", pd.Categorical.from_codes(np.tile(forces.codes, n_sections), forces.categories))
+    return results_df
+
+
+SupportArea = Union[float, Dict[str, float], pd.Series, np.ndarray]
+
+
+def row_support_areas(
+        forces_df: pd.DataFrame,
+        support_area: SupportArea,
+        element: MemberDefinition = None,
+) -> np.ndarray:
+    """
+    Resolves the support area of every row of a force table.
+
+    Args:
+        forces_df: Table from import_robot_bar_forces or forces_to_frame.
+        support_area: A scalar for every row; a dict or Series keyed by member
+            name, or by Robot node when the Series index is named 'Node'; or
+            an array with one value per row. Missing keys default to 1.0.
+        element: Member the forces belong to, when the table has no 'Member' level.
+
+    Returns:
+        Array with one support area per force row.
+
+    Assumptions:
+        - PerpendicularAdjustmentFactors.due_bearing_area is one C_b for the
+          whole table. For a C_b that varies per support, leave
+          due_bearing_area at 1.0 and pass area * C_b; the capacity is linear
+          in both, so the result is exact.
+    """
+    if np.isscalar(support_area):
+        return np.full(len(forces_df), float(support_area))
+    if isinstance(support_area, np.ndarray):
+        if support_area.shape != (len(forces_df),):
+            raise ValueError("A support_area array needs one value per force row.")
+        return support_area.astype(float)
+
+    support_area = pd.Series(support_area, dtype=float)
+    if support_area.index.name == "Node":
+        keys = forces_df.index.get_level_values("Node").astype(str)
+    elif element is not None:
+        keys = pd.Index([element.name] * len(forces_df))
+    else:
+        keys = pd.Index(force_table_labels(forces_df)[0])
+    support_area.index = support_area.index.astype(str)
+    return support_area.reindex(keys).fillna(1.0).to_numpy()
+
+
+TimeEffect = Union[Dict[str, float], pd.Series]
+
+
+def row_time_effects(forces_df: pd.DataFrame, time_effect: TimeEffect) -> np.ndarray:
+    """
+    Looks up the load-duration (time effect) factor of every force row from its Robot 'Case'.
+
+    Args:
+        forces_df: Table from import_robot_bar_forces.
+        time_effect: Time-effect factor keyed by load case.
+
+    Returns:
+        Array with one factor per row; NaN for cases missing from time_effect.
+    """
+    if "Case" not in forces_df.index.names:
+        raise ValueError("The force table has no 'Case' level to join the time effects on.")
+    time_effect = pd.Series(time_effect, dtype=float)
+    if (time_effect <= 0).any():
+        raise ValueError("Time-effect factors must be positive.")
+    time_effect.index = time_effect.index.astype(str)
+    return time_effect.reindex(forces_df.index.get_level_values("Case").astype(str)).to_numpy()
+
+
+def _without_time_effect(factors):
+    if "due_time_effect" not in {field.name for field in dataclasses.fields(factors)}:
+        return factors
+    return dataclasses.replace(factors, due_time_effect=1.0)
+
+
+def _capacity_tables(
+        list_sections: List[RectangularSection],
+        forces_df: pd.DataFrame,
+        design_inputs: tuple,
+        support_area: SupportArea,
+        time_effect: TimeEffect,
+        element: MemberDefinition = None,
+) -> tuple:
+    # Capacities for the configured factors plus, when needed, the per-row
+    # terms that _row_capacities applies on top of them.
+    per_row_area = not np.isscalar(support_area)
+    base_area = 1.0 if per_row_area else support_area
+    capacities = calculate_section_capacities(list_sections, *design_inputs, base_area).to_numpy()
+    areas = row_support_areas(forces_df, support_area, element) if per_row_area else None
+
+    unit_capacities = time_effects = None
+    if time_effect is not None:
+        material, *factors = design_inputs
+        unit_capacities = calculate_section_capacities(
+            list_sections, material, *[_without_time_effect(factor) for factor in factors], base_area
+        ).to_numpy()
+        time_effects = row_time_effects(forces_df, time_effect)
+    return capacities, unit_capacities, time_effects, areas
+
+
+STABILITY_TERMS = ["compression_yy", "compression_zz", "bending_yy", "bending_zz"]
+
+
+def _without_stability(factors):
+    names = {field.name for field in dataclasses.fields(factors)}
+    return dataclasses.replace(factors, **{
+        name: 1.0 for name in ("due_column_stability", "due_beam_stability") if name in names
+    })
+
+
+def _stability_terms(list_sections: List[RectangularSection], material: WoodMaterial, factors: list) -> np.ndarray:
+    # Capacities that C_P and C_L scale, per section, with both factors set to 1.
+    factors = dict(zip(FACTOR_ARGUMENTS, [_without_stability(factor) for factor in factors]))
+    terms = []
+    for section in list_sections:
+        wood_calculator = WoodElementCalculator(
+            **factors,
+            material_properties=material,
+            section_properties=RectangularSectionProperties(width=section.width, depth=section.depth),
+        )
+        terms.append([
+            wood_calculator.compression_strength("yy"),
+            wood_calculator.compression_strength("zz"),
+            wood_calculator.bending_strength("yy"),
+            wood_calculator.bending_strength("zz"),
+        ])
+    return np.array(terms, dtype=float)
+
+
+def _stability_tables(
+        list_sections: List[RectangularSection],
+        members: pd.Categorical,
+        design_inputs: tuple,
+        stability: pd.DataFrame,
+        time_effect: TimeEffect,
+) -> tuple:
+    # The STABILITY_TERMS of every section (also without the time effect when
+    # one is given) and the C_P/C_L of every section and member category.
+    material, *factors = design_inputs
+    terms = _stability_terms(list_sections, material, factors)
+    unit_terms = None
+    if time_effect is not None:
+        unit_terms = _stability_terms(list_sections, material, [_without_time_effect(factor) for factor in factors])
+
+    table = stability.astype({"member": str, "section": str}).drop_duplicates(["section", "member"])
+    pairs = pd.MultiIndex.from_product([[section.name for section in list_sections], members.categories.astype(str)])
+    lookup = table.set_index(["section", "member"])[STABILITY_COLUMNS].reindex(pairs)
+    missing = lookup.index[lookup.isna().any(axis=1)]
+    if len(missing):
+        raise ValueError(f"No stability factors for the (section, member) pairs {missing.tolist()[:10]}.")
+    factors_by_member = lookup.to_numpy(dtype=float).reshape(len(list_sections), len(members.categories), -1)
+    return terms, unit_terms, factors_by_member
+
+
+def _row_capacities(
+        capacities: np.ndarray,
+        unit_capacities: np.ndarray = None,
+        time_effects: np.ndarray = None,
+        areas: np.ndarray = None,
+        rows: slice = slice(None),
+        stability_terms: np.ndarray = None,
+        unit_stability_terms: np.ndarray = None,
+        stability_factors: np.ndarray = None,
+) -> np.ndarray:
+    # Every capacity is linear in its time-effect factor, compression_perp_strength
+    # is linear in the support area and the compression and bending strengths are
+    # linear in C_P and C_L, so per-row values only rescale the section capacities.
+    per_row = [values for values in (time_effects, areas, stability_factors) if values is not None]
+    if not per_row:
+        return capacities
+    n_rows = len(per_row[0][rows])
+    row_capacities = np.array(np.broadcast_to(capacities, (n_rows, len(CAPACITY_COLUMNS))))
+    if time_effects is not None:
+        effects = time_effects[rows][:, None]
+        row_capacities = np.where(np.isnan(effects), row_capacities, unit_capacities * effects)
+    if stability_factors is not None:
+        terms = np.broadcast_to(stability_terms, (n_rows, len(STABILITY_TERMS)))
+        if time_effects is not None:
+            terms = np.where(np.isnan(effects), terms, unit_stability_terms * effects)
+        terms = terms * stability_factors[rows]
+        row_capacities[:, CAPACITY_COLUMNS.index("compression")] = np.maximum(terms[:, 0], terms[:, 1])
+        row_capacities[:, CAPACITY_COLUMNS.index("bending_yy")] = terms[:, 2]
+        row_capacities[:, CAPACITY_COLUMNS.index("bending_zz")] = terms[:, 3]
+    if areas is not None:
+        row_capacities[:, CAPACITY_COLUMNS.index("compression_perp")] *= areas[rows]
+    return row_capacities
+
+
+def check_force_table(
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        forces_df: pd.DataFrame,
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area: SupportArea = 1.0,
+        element: MemberDefinition = None,
+        dtype: Union[str, type] = np.float64,
+        time_effect: TimeEffect = None,
+        stability: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """
+    Vectorized counterpart of check_for_all_sections for a whole force table.
+
+    Args:
+        forces_df: Table from import_robot_bar_forces or forces_to_frame.
+        support_area: A scalar or per-member/per-node areas, see row_support_areas.
+        element: Member the forces belong to, when the table has no 'Member' level.
+        dtype: Precision of the DCR columns (np.float64 or np.float32).
+        time_effect: Load-duration factor per Robot load case; it replaces the
+            due_time_effect of every factor class for the rows of that case.
+        stability: Table from calculation.stability_factors; the C_P and C_L
+            of each (member, section) pair replace due_column_stability and
+            due_beam_stability for that member's rows.
+
+    Returns:
+        A DataFrame with one row per section and force row.
+    """
+    if not isinstance(list_sections, list):
+        list_sections = [list_sections]
+    if not list_sections:
+        raise ValueError("The 'list_sections' cannot be empty.")
+
+    design_inputs = (
+        material, tension_factors, bending_factors_yy, bending_factors_zz, shear_factors,
+        compression_factors_yy, compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+    )
+    capacities, unit_capacities, time_effects, areas = _capacity_tables(
+        list_sections, forces_df, design_inputs, support_area, time_effect, element
+    )
+    force_values = forces_df[FORCE_COLUMNS].to_numpy(dtype=float)
+    members, forces = force_table_labels(forces_df, element)
+    if stability is not None:
+        terms, unit_terms, factors_by_member = _stability_tables(
+            list_sections, members, design_inputs, stability, time_effect
+        )
+
+    dcr = np.empty((len(list_sections), len(force_values), len(DCR_OUTPUT_COLUMNS)), dtype=dtype)
+    for i, section_capacities in enumerate(capacities):
+        stability_arguments = {} if stability is None else {
+            "stability_terms": terms[i],
+            "unit_stability_terms": None if unit_terms is None else unit_terms[i],
+            "stability_factors": factors_by_member[i][members.codes],
+        }
+        section_capacities = _row_capacities(
+            section_capacities, None if unit_capacities is None else unit_capacities[i], time_effects, areas,
+            **stability_arguments,
+        )
+        calculate_dcr_arrays(force_values, section_capacities, out=dcr[i])
+
+    return build_results_frame(dcr, [section.name for section in list_sections], members, forces)
+
+
+def iter_check_force_table(
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        forces_df: pd.DataFrame,
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area: SupportArea = 1.0,
+        element: MemberDefinition = None,
+        dtype: Union[str, type] = np.float64,
+        chunk_size: int = 100_000,
+        time_effect: TimeEffect = None,
+        stability: pd.DataFrame = None,
+):
+    """
+    Generator version of check_force_table that yields one result frame per
+    section and block of chunk_size force rows.
+
+    Concatenating the chunks gives the rows of check_force_table in the same order.
+    """
+    if not isinstance(list_sections, list):
+        list_sections = [list_sections]
+    if not list_sections:
+        raise ValueError("The 'list_sections' cannot be empty.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    design_inputs = (
+        material, tension_factors, bending_factors_yy, bending_factors_zz, shear_factors,
+        compression_factors_yy, compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+    )
+    capacities, unit_capacities, time_effects, areas = _capacity_tables(
+        list_sections, forces_df, design_inputs, support_area, time_effect, element
+    )
+    force_values = forces_df[FORCE_COLUMNS].to_numpy(dtype=float)
+    members, forces = force_table_labels(forces_df, element)
+    section_categories = [section.name for section in list_sections]
+    if stability is not None:
+        terms, unit_terms, factors_by_member = _stability_tables(
+            list_sections, members, design_inputs, stability, time_effect
+        )
+
+    for i, (section, section_capacities) in enumerate(zip(list_sections, capacities)):
+        stability_arguments = {} if stability is None else {
+            "stability_terms": terms[i],
+            "unit_stability_terms": None if unit_terms is None else unit_terms[i],
+            "stability_factors": factors_by_member[i][members.codes],
+        }
+        for start in range(0, len(force_values), chunk_size):
+            stop = min(start + chunk_size, len(force_values))
+            chunk_capacities = _row_capacities(
+                section_capacities, None if unit_capacities is None else unit_capacities[i], time_effects, areas,
+                slice(start, stop), **stability_arguments,
+            )
+            dcr = calculate_dcr_arrays(force_values[start:stop], chunk_capacities, dtype=dtype)
+            yield build_results_frame(
+                dcr, [section.name], members[start:stop], forces[start:stop], section_categories
+            )
+
+
+def check_assigned_sections(
+        section_assignments: Dict[str, RectangularSection],
+        forces_df: pd.DataFrame,
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area: SupportArea = 1.0,
+        dtype: Union[str, type] = np.float64,
+        time_effect: TimeEffect = None,
+) -> pd.DataFrame:
+    """
+    Checks every force row only against the section assigned to its member.
+
+    The Robot 'Member' level of the force table is joined to the assignments
+    through its categorical codes, so each row gathers the capacities of its
+    own section and the work grows with the number of force rows instead of
+    sections x members x force rows.
+
+    Args:
+        section_assignments: Section of every member, keyed by member name.
+        forces_df: Table from import_robot_bar_forces.
+        support_area: A scalar or per-member/per-node areas, see row_support_areas.
+        time_effect: Load-duration factor per Robot load case, as in check_force_table.
+
+    Returns:
+        A DataFrame with one row per force row, in the force table order.
+    """
+    if not section_assignments:
+        raise ValueError("The 'section_assignments' cannot be empty.")
+    members, forces = force_table_labels(forces_df)
+
+    assigned = pd.Series({str(member): section.name for member, section in section_assignments.items()})
+    missing = members.categories.difference(assigned.index)
+    if len(missing):
+        raise ValueError(f"Members {missing.tolist()} have no assigned section.")
+
+    sections = list({section.name: section for section in section_assignments.values()}.values())
+    section_categories = pd.Index([section.name for section in sections])
+    design_inputs = (
+        material, tension_factors, bending_factors_yy, bending_factors_zz, shear_factors,
+        compression_factors_yy, compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+    )
+    capacities, unit_capacities, time_effects, areas = _capacity_tables(
+        sections, forces_df, design_inputs, support_area, time_effect
+    )
+
+    member_sections = section_categories.get_indexer(assigned.reindex(members.categories))
+    row_sections = member_sections[members.codes]
+    row_capacities = _row_capacities(
+        capacities[row_sections], None if unit_capacities is None else unit_capacities[row_sections],
+        time_effects, areas,
+    )
+    dcr = calculate_dcr_arrays(forces_df[FORCE_COLUMNS].to_numpy(dtype=float), row_capacities, dtype=dtype)
+
+    results_df = pd.DataFrame(dcr, columns=DCR_OUTPUT_COLUMNS)
+    results_df.insert(0, "member", members)
+    results_df.insert(1, "section", pd.Categorical.from_codes(row_sections, section_categories))
+    results_df.insert(2, "force", forces)
+    return results_df
+
+
+ELEMENT_DCR_COLUMNS = [
+    "tension (dcr)",
+    "biaxial bending (dcr)",
+    "shear y (dcr)",
+    "shear z (dcr)",
+    "compression (dcr)",
+    "bending and compression (dcr)",
+    "compression perpendicular (dcr)",
+]
+ELEMENT_DCR_OUTPUT_COLUMNS = ELEMENT_DCR_COLUMNS + ["dcr_max"]
+
+
+def calculate_element_dcr_arrays(
+        forces: np.ndarray,
+        capacities: np.ndarray,
+        dtype: Union[str, type] = np.float64,
+) -> np.ndarray:
+    """
+    Computes the DCRs of many force rows with the rules of check_for_all_elements.
+
+    Positive axial forces are tension and negative ones compression, bending
+    and compression add linearly, compression perpendicular to grain uses the
+    larger of the two shears, and a zero capacity gives a zero DCR. dcr_max is
+    the largest of the GOVERNING_DCR_COLUMNS.
+
+    Args:
+        forces: Array of shape (n, 6) with the FORCE_COLUMNS.
+        capacities: Array of shape (6,) or (n, 6) with the CAPACITY_COLUMNS,
+            where compression is the yy compression strength.
+        dtype: np.float64, or np.float32 to halve the output size.
+
+    Returns:
+        Array of shape (n, 8) with the ELEMENT_DCR_OUTPUT_COLUMNS.
+    """
+    forces = np.asarray(forces, dtype=float)
+    inverse = np.atleast_2d(_reciprocal_capacities(np.asarray(capacities, dtype=float), dtype)).T
+    out = np.empty((len(forces), len(ELEMENT_DCR_OUTPUT_COLUMNS)), dtype=dtype)
+
+    np.multiply(np.maximum(forces[:, 0], 0), inverse[0], out=out[:, 0])
+    np.multiply(np.abs(forces[:, 4]), inverse[2], out=out[:, 1])
+    out[:, 1] += np.abs(forces[:, 5]) * inverse[3]
+    np.multiply(np.abs(forces[:, 1]), inverse[4], out=out[:, 2])
+    np.multiply(np.abs(forces[:, 2]), inverse[4], out=out[:, 3])
+    np.multiply(np.maximum(-forces[:, 0], 0), inverse[1], out=out[:, 4])
+    np.add(out[:, 4], out[:, 1], out=out[:, 5])
+    np.multiply(np.maximum(np.abs(forces[:, 1]), np.abs(forces[:, 2])), inverse[5], out=out[:, 6])
+
+    governing = [ELEMENT_DCR_COLUMNS.index(column) for column in GOVERNING_DCR_COLUMNS]
+    np.max(out[:, governing], axis=1, out=out[:, -1])
+    return out
+
+
+def estimate_result_row_bytes(dtype: Union[str, type] = np.float64) -> int:
+    """
+    Estimates the peak bytes needed per result row by the chunked element checks.
+
+    Counts the gathered force and capacity rows with their reciprocals, two
+    float64 temporaries, the DCR output and its copy into a DataFrame, and the
+    int64 index arrays used to build the labels.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    gathered_inputs = 2 * len(FORCE_COLUMNS) * 8 + len(CAPACITY_COLUMNS) * itemsize + 2 * 8
+    dcr_output = 2 * len(ELEMENT_DCR_OUTPUT_COLUMNS) * itemsize
+    labels = 4 * 8 + len(LABEL_COLUMNS) * 4
+    return gathered_inputs + dcr_output + labels
+
+
+def iter_check_for_all_elements(
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        list_elements: Union[List[MemberDefinition], MemberDefinition],
+        list_forces: Union[List[Forces], pd.DataFrame],
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area_values: dict = None,
+        chunk_rows: int = 100_000,
+        dtype: Union[str, type] = np.float64,
+):
+    """
+    Yields the section x element x force results in chunks of at most chunk_rows rows.
+
+    Rows come in the same order and with the same DCRs as
+    check_for_all_elements (sections, then elements, then forces), plus a
+    dcr_max column; see calculate_element_dcr_arrays. The support area of each
+    element is looked up in support_area_values (default 1.0).
+    """
+    if not isinstance(list_sections, list):
+        list_sections = [list_sections]
+    if not isinstance(list_elements, list):
+        list_elements = [list_elements]
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be a positive integer.")
+    forces_df = list_forces if isinstance(list_forces, pd.DataFrame) else forces_to_frame(list_forces)
+    support_areas = (
+        pd.Series(support_area_values or {}, dtype=float).reindex([element.name for element in list_elements])
+        .fillna(1.0).to_numpy()
+    )
+
+    pair_capacities = np.empty((len(list_sections), len(list_elements), len(CAPACITY_COLUMNS)))
+    for position, section in enumerate(list_sections):
+        wood_calculator = WoodElementCalculator(
+            tension_factors=tension_factors,
+            bending_factors_yy=bending_factors_yy,
+            bending_factors_zz=bending_factors_zz,
+            shear_factors=shear_factors,
+            compression_factors_yy=compression_factors_yy,
+            compression_factors_zz=compression_factors_zz,
+            compression_perp_factors=compression_perp_factors,
+            elastic_modulus_factors=elastic_modulus_factors,
+            material_properties=material,
+            section_properties=RectangularSectionProperties(width=section.width, depth=section.depth),
+        )
+        pair_capacities[position, :, :-1] = [
+            wood_calculator.tension_strength(),
+            wood_calculator.compression_strength("yy"),
+            wood_calculator.bending_strength("yy"),
+            wood_calculator.bending_strength("zz"),
+            wood_calculator.shear_strength(),
+        ]
+        pair_capacities[position, :, -1] = wood_calculator.compression_perp_strength(support_areas)
+    pair_capacities = pair_capacities.reshape(-1, len(CAPACITY_COLUMNS))
+
+    force_values = forces_df[FORCE_COLUMNS].to_numpy(dtype=float)
+    forces = robot_force_labels(forces_df)
+    section_codes, section_categories = pd.factorize(pd.Index([section.name for section in list_sections]))
+    member_codes, member_categories = pd.factorize(pd.Index([element.name for element in list_elements]))
+    n_forces = len(force_values)
+    n_rows = len(pair_capacities) * n_forces
+
+    for start in range(0, n_rows, chunk_rows):
+        rows = np.arange(start, min(start + chunk_rows, n_rows))
+        pairs, force_rows = np.divmod(rows, n_forces)
+        dcr = calculate_element_dcr_arrays(force_values[force_rows], pair_capacities[pairs], dtype=dtype)
+
+        results_df = pd.DataFrame(dcr, columns=ELEMENT_DCR_OUTPUT_COLUMNS)
+        sections, elements = np.divmod(pairs, len(list_elements))
+        results_df.insert(0, "member", pd.Categorical.from_codes(member_codes[elements], member_categories))
+        results_df.insert(1, "section", pd.Categorical.from_codes(section_codes[sections], section_categories))
+        results_df.insert(2, "force", pd.Categorical.from_codes(forces.codes[force_rows], forces.categories))
+        yield results_df
+
+
+def check_for_all_elements_within_budget(
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        list_elements: Union[List[MemberDefinition], MemberDefinition],
+        list_forces: Union[List[Forces], pd.DataFrame],
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area_values: dict = None,
+        max_memory: int = 256 * 2 ** 20,
+        consumer: Callable[[pd.DataFrame], None] = None,
+        dtype: Union[str, type] = np.float64,
+        trace_memory: bool = False,
+) -> Tuple[Optional[pd.DataFrame], dict]:
+    """
+    Runs the section x element x force checks in chunks sized to a memory budget.
+
+    The budget left after the force table and its working copies, divided by
+    estimate_result_row_bytes, sets the chunk size. Each chunk is handed to
+    consumer (e.g. BackgroundResultWriter.put) when given; otherwise the
+    chunks are reduced on the fly to the governing envelope per member and
+    section.
+
+    Args:
+        max_memory: Budget in bytes for the force table plus one chunk.
+        consumer: Callable that receives every result chunk.
+        trace_memory: Also measure the Python allocations of this call with
+            tracemalloc. Tracing slows every allocation down, so it is off by
+            default.
+
+    Returns:
+        (envelope, report): the envelope (None when a consumer is given) and
+        a dict with chunk_rows, chunks, rows, estimated_row_bytes,
+        estimated_peak_memory, peak_memory and traced_peak_memory in bytes.
+        peak_memory is the peak RSS of the process from getrusage: it is
+        cheap but cannot be reset, so it also covers memory reached before
+        the call (None where getrusage is missing, e.g. on Windows).
+        traced_peak_memory is the tracemalloc peak of this call alone, or
+        None unless trace_memory is set.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if trace_memory:
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    envelope = None
+    try:
+        forces_df = list_forces if isinstance(list_forces, pd.DataFrame) else forces_to_frame(list_forces)
+        # The chunk generator keeps its own copies of the force values and labels.
+        input_bytes = 2 * int(forces_df.memory_usage(deep=True).sum())
+        if trace_memory:
+            input_bytes = max(input_bytes, 2 * (tracemalloc.get_traced_memory()[0] - baseline))
+        row_bytes = estimate_result_row_bytes(dtype)
+        chunk_rows = int((max_memory - input_bytes) // row_bytes)
+        if chunk_rows <= 0:
+            raise ValueError("max_memory is too small for the force table and one result row.")
+        report = {"chunk_rows": chunk_rows, "chunks": 0, "rows": 0, "estimated_row_bytes": row_bytes}
+
+        largest_chunk = 0
+        for chunk in iter_check_for_all_elements(
+            list_sections, list_elements, forces_df, material, tension_factors, bending_factors_yy,
+            bending_factors_zz, shear_factors, compression_factors_yy, compression_factors_zz,
+            compression_perp_factors, elastic_modulus_factors, support_area_values, chunk_rows, dtype,
+        ):
+            report["chunks"] += 1
+            report["rows"] += len(chunk)
+            largest_chunk = max(largest_chunk, len(chunk))
+            if consumer is not None:
+                consumer(chunk)
+            else:
+                chunk = governing_envelope(chunk)
+                envelope = chunk if envelope is None else governing_envelope(
+                    pd.concat([envelope, chunk], ignore_index=True)
+                )
+            del chunk
+        report["estimated_peak_memory"] = input_bytes + largest_chunk * row_bytes
+        report["peak_memory"] = _peak_rss()
+        report["traced_peak_memory"] = tracemalloc.get_traced_memory()[1] - baseline if trace_memory else None
+    finally:
+        if trace_memory and not was_tracing:
+            tracemalloc.stop()
+
+    return envelope, report
+
+
+def _peak_rss() -> Optional[int]:
+    """
+    Returns the peak resident set size of this process in bytes, or None where it is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+FACTOR_ARGUMENTS = [
+    "tension_factors",
+    "bending_factors_yy",
+    "bending_factors_zz",
+    "shear_factors",
+    "compression_factors_yy",
+    "compression_factors_zz",
+    "compression_perp_factors",
+    "elastic_modulus_factors",
+]
+
+
+def member_row_groups(members: pd.Categorical) -> tuple:
+    """
+    Groups force rows by member for np.*.reduceat reductions.
+
+    Returns:
+        (order, starts, labels): the row order that makes each member
+        contiguous, the first position of every member in that order and the
+        member labels in the same order.
+    """
+    codes = np.asarray(members.codes)
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(codes) else np.array([], int)
+    labels = pd.Index(members.categories[sorted_codes[starts]], name="member")
+    return order, starts, labels
+
+
+def sweep_adjustment_factors(
+        section: RectangularSection,
+        forces_df: pd.DataFrame,
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        sweep: Dict[str, Dict[str, List[float]]],
+        support_area: float = 1.0,
+        element: MemberDefinition = None,
+) -> pd.DataFrame:
+    """
+    Evaluates the governing DCRs of every member for many adjustment-factor scenarios.
+
+    The swept fields are placed in the factor dataclasses as arrays, so the
+    capacities of all scenarios come out of a single WoodElementCalculator
+    evaluation; each scenario is then one pass of calculate_dcr_arrays
+    followed by a per-member maximum.
+
+    Args:
+        sweep: Values per factor field, e.g.
+            {"tension_factors": {"due_moisture": [0.85, 1.0]}}. All value
+            lists must have the same length; scenario i uses the i-th value
+            of each. A single number counts as a one-value list.
+
+    Returns:
+        A DataFrame indexed by (scenario, member) with the swept values and the
+        maximum of each DCR_OUTPUT_COLUMNS over the member's force rows.
+        The DCR values reshape to a (scenario, member, 9) cube.
+    """
+    factors = dict(zip(FACTOR_ARGUMENTS, (
+        tension_factors, bending_factors_yy, bending_factors_zz, shear_factors, compression_factors_yy,
+        compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+    )))
+    if not sweep:
+        raise ValueError("The 'sweep' cannot be empty.")
+    if forces_df.empty:
+        raise ValueError("The force table cannot be empty.")
+
+    swept_values = {}
+    for argument, fields_values in sweep.items():
+        if argument not in factors:
+            raise ValueError(f"Unknown factor argument '{argument}'. Use one of {FACTOR_ARGUMENTS}.")
+        valid_fields = [field.name for field in dataclasses.fields(factors[argument])]
+        field_arrays = {}
+        for field_name, values in fields_values.items():
+            if field_name not in valid_fields:
+                raise ValueError(f"'{argument}' has no field '{field_name}'.")
+            values = np.atleast_1d(np.asarray(values, dtype=float))
+            if values.ndim != 1 or values.size == 0:
+                raise ValueError(f"The values of '{argument}.{field_name}' must be a number or a non-empty list.")
+            field_arrays[field_name] = swept_values[f"{argument}.{field_name}"] = values
+        factors[argument] = dataclasses.replace(factors[argument], **field_arrays)
+
+    lengths = {name: len(values) for name, values in swept_values.items()}
+    if len(set(lengths.values())) != 1:
+        raise ValueError(f"All swept value lists must have the same length, got {lengths}.")
+    n_scenarios = len(next(iter(swept_values.values())))
+
+    wood_calculator = WoodElementCalculator(
+        **factors,
+        material_properties=material,
+        section_properties=RectangularSectionProperties(width=section.width, depth=section.depth),
+    )
+    capacities = np.broadcast_to(capacity_array(wood_calculator, support_area), (n_scenarios, len(CAPACITY_COLUMNS)))
+
+    members, _ = force_table_labels(forces_df, element)
+    order, starts, member_labels = member_row_groups(members)
+    force_values = forces_df[FORCE_COLUMNS].to_numpy(dtype=float)[order]
+
+    dcr = np.empty((len(force_values), len(DCR_OUTPUT_COLUMNS)))
+    cube = np.empty((n_scenarios, len(starts), len(DCR_OUTPUT_COLUMNS)))
+    for scenario in range(n_scenarios):
+        calculate_dcr_arrays(force_values, capacities[scenario], out=dcr)
+        np.maximum.reduceat(dcr, starts, axis=0, out=cube[scenario])
+
+    index = pd.MultiIndex.from_product([pd.RangeIndex(n_scenarios, name="scenario"), member_labels])
+    results_df = pd.DataFrame(cube.reshape(-1, len(DCR_OUTPUT_COLUMNS)), columns=DCR_OUTPUT_COLUMNS, index=index)
+    for position, (name, values) in enumerate(swept_values.items()):
+        results_df.insert(position, name, np.repeat(values, len(starts)))
+    return results_df
+
+
+REQUIRED_DEPTH_COLUMNS = [f"{column} depth" for column in GOVERNING_DCR_COLUMNS]
+
+
+def _depth_for_unit_dcr(demand: np.ndarray, unit_capacity: float) -> np.ndarray:
+    # demand / (unit_capacity * depth) = 1, with no demand needing no depth.
+    if unit_capacity == 0:
+        return np.where(demand > 0, np.inf, 0.0)
+    return demand / unit_capacity
+
+
+def required_section_sizes(
+        forces_df: pd.DataFrame,
+        width: float,
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        catalog: List[RectangularSection] = None,
+        element: MemberDefinition = None,
+) -> pd.DataFrame:
+    """
+    Computes, for every member, the minimum depth at a given width that keeps each governing DCR at 1.0.
+
+    With the width fixed, the tension, compression, shear and bending_zz
+    capacities grow linearly with the depth and bending_yy with its square, so
+    every term of calculate_dcr_arrays has a closed-form root: the linear
+    terms give depth = demand / unit capacity, and the biaxial and
+    bending-and-compression terms, a / d^2 + c / d = 1, give
+    d = (c + sqrt(c^2 + 4a)) / 2. All force rows are solved at once and the
+    members take the largest depth of their rows.
+
+    Args:
+        forces_df: Table from import_robot_bar_forces or forces_to_frame.
+        width: Section width, in the units of RectangularSection.
+        catalog: Sections to snap to; the shallowest one with this width and
+            at least the required depth is reported.
+        element: Member the forces belong to, when the table has no 'Member' level.
+
+    Returns:
+        A DataFrame indexed by member with the depth required by each term,
+        the governing depth and term, the matching area and section modulus
+        about yy, and the snapped catalog section (None when none fits).
+
+    Assumptions:
+        - Adjustment factors, including the stability factors, do not change
+          with the depth. Compression perpendicular to grain does not depend
+          on the section and is not sized.
+    """
+    if width <= 0:
+        raise ValueError("width must be positive.")
+
+    unit_capacities = calculate_section_capacities(
+        RectangularSection(name="unit depth", depth=1.0, width=width), material, tension_factors,
+        bending_factors_yy, bending_factors_zz, shear_factors, compression_factors_yy, compression_factors_zz,
+        compression_perp_factors, elastic_modulus_factors,
+    ).iloc[0]
+    forces = forces_df[FORCE_COLUMNS].to_numpy(dtype=float)
+    tension = _depth_for_unit_dcr(np.maximum(-forces[:, 0], 0), unit_capacities["tension"])
+    compression = _depth_for_unit_dcr(np.maximum(forces[:, 0], 0), unit_capacities["compression"])
+    # bending_yy grows with depth^2, so this ratio is the squared depth of that term alone.
+    bending_yy = _depth_for_unit_dcr(np.abs(forces[:, 4]), unit_capacities["bending_yy"])
+    bending_zz = _depth_for_unit_dcr(np.abs(forces[:, 5]), unit_capacities["bending_zz"])
+    shear_y = _depth_for_unit_dcr(np.abs(forces[:, 1]), unit_capacities["shear"])
+    shear_z = _depth_for_unit_dcr(np.abs(forces[:, 2]), unit_capacities["shear"])
+    biaxial = (bending_zz + np.sqrt(bending_zz ** 2 + 4 * bending_yy)) / 2
+    bending_and_compression = (bending_zz + np.sqrt(bending_zz ** 2 + 4 * (bending_yy + compression ** 2))) / 2
+
+    row_depths = np.column_stack([
+        {
+            "tension (dcr)": tension,
+            "biaxial bending (dcr)": biaxial,
+            "shear y (dcr)": shear_y,
+            "shear z (dcr)": shear_z,
+            "compression (dcr)": compression,
+            "bending and compression (dcr)": bending_and_compression,
+        }[column]
+        for column in GOVERNING_DCR_COLUMNS
+    ])
+    members, _ = force_table_labels(forces_df, element)
+    order, starts, member_labels = member_row_groups(members)
+    depths = np.maximum.reduceat(row_depths[order], starts, axis=0) if len(starts) else row_depths[:0]
+
+    sizes_df = pd.DataFrame(depths, columns=REQUIRED_DEPTH_COLUMNS, index=member_labels)
+    sizes_df["required_depth"] = depths.max(axis=1)
+    sizes_df["governing"] = np.array(GOVERNING_DCR_COLUMNS, dtype=object)[depths.argmax(axis=1)]
+    sizes_df["required_area"] = width * sizes_df["required_depth"]
+    sizes_df["required_section_modulus"] = width * sizes_df["required_depth"] ** 2 / 6
+
+    if catalog is not None:
+        candidates = sorted(
+            (section for section in catalog if np.isclose(section.width, width)), key=lambda section: section.depth
+        )
+        candidate_depths = np.array([section.depth for section in candidates], dtype=float)
+        positions = np.searchsorted(candidate_depths, sizes_df["required_depth"].to_numpy(), side="left")
+        names = np.array([section.name for section in candidates] + [None], dtype=object)
+        sizes_df["section"] = pd.Categorical(names[positions])
+    return sizes_df
+
+
+def governing_envelope(
+        results_df: pd.DataFrame,
+        by: Union[str, List[str]] = ("member", "section"),
+) -> pd.DataFrame:
+    """
+    Keeps the row with the largest dcr_max of every group.
+
+    Args:
+        results_df: DataFrame produced by the design checks.
+        by: Column or columns that define a group.
+
+    Returns:
+        One row per group, in the original row order.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    if results_df.empty:
+        return results_df.copy()
+    governing_rows = results_df.groupby(by, observed=True, sort=False)["dcr_max"].idxmax()
+    return results_df.loc[np.sort(governing_rows.to_numpy())].reset_index(drop=True)
+
+
+def validate_result_filters(
+    filters: Dict[str, Union[str, List[str], Dict[str, Union[int, float, dict]]]],
+    columns: pd.Index,
+):
+    """
+    Checks the filter specification used by filter_and_export_results against the result columns.
+    """
     if not isinstance(filters, dict):
         raise TypeError("Filters must be a dictionary.")
-    if not isinstance(output_filename, str):
-        raise TypeError("output_filename must be a string.")
-    if output_path is not None and not isinstance(output_path, str):
-        raise TypeError("output_path must be a string.")
-    if sort_by is not None and not isinstance(sort_by, str):
-        raise TypeError("sort_by must be a string.")
-    if sort_order not in ["asc", "desc"]:
-        raise ValueError("sort_order must be 'asc' or 'desc'.")
-
     for column, condition in filters.items():
         if not isinstance(column, str):
             raise TypeError("Filter columns must be strings")
-        if column not in results_df.columns:
+        if column not in columns:
             raise ValueError(f"Column '{column}' not found in DataFrame.")
         if isinstance(condition, dict):
             if "range" in condition:
@@ -493,7 +1902,14 @@ def filter_and_export_results(
                 if not isinstance(value, str):
                     raise TypeError(f"Invalid filter values in list for column '{column}'. Must be strings")
 
-    filtered_df = results_df.copy()
+
+def apply_result_filters(
+    filtered_df: pd.DataFrame,
+    filters: Dict[str, Union[str, List[str], Dict[str, Union[int, float, dict]]]],
+) -> pd.DataFrame:
+    """
+    Keeps the rows of a result frame that match every filter of filter_and_export_results.
+    """
     for column, condition in filters.items():
         if isinstance(condition, str):
             filtered_df = filtered_df[filtered_df[column] == condition]
@@ -515,6 +1931,32 @@ def filter_and_export_results(
                     "le": operator.le,
                 }[op_str]
                 filtered_df = filtered_df[op(filtered_df[column], threshold)]
+    return filtered_df
+
+
+def filter_and_export_results(
+    results_df: pd.DataFrame,
+    filters: Dict[str, Union[str, List[str], Dict[str, Union[int, float, dict]]]],
+    output_path: str = None,
+    output_filename: str = "filtered_results.xlsx",
+    sort_by: str = None,
+    sort_order: Literal["asc", "desc"] = "asc",
+) -> pd.DataFrame:
+    if not isinstance(results_df, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame.")
+    if not isinstance(filters, dict):
+        raise TypeError("Filters must be a dictionary.")
+    if not isinstance(output_filename, str):
+        raise TypeError("output_filename must be a string.")
+    if output_path is not None and not isinstance(output_path, str):
+        raise TypeError("output_path must be a string.")
+    if sort_by is not None and not isinstance(sort_by, str):
+        raise TypeError("sort_by must be a string.")
+    if sort_order not in ["asc", "desc"]:
+        raise ValueError("sort_order must be 'asc' or 'desc'.")
+
+    validate_result_filters(filters, results_df.columns)
+    filtered_df = apply_result_filters(results_df.copy(), filters)
 
     if sort_by:
         filtered_df = filtered_df.sort_values(by=sort_by, ascending=(sort_order == "asc"))
@@ -524,6 +1966,6 @@ def filter_and_export_results(
     else:
         output_path = os.path.join(output_path, output_filename)
 
-    filtered_df.to_excel(output_path, index=False)
+    decode_labels(filtered_df).to_excel(output_path, index=False)
     print(f"Filtered results exported to: {output_path}")
     return filtered_df
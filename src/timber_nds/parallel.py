@@ -0,0 +1,313 @@
+from typing import Union, List, Tuple
+from multiprocessing import shared_memory, get_context
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+from timber_nds.settings import (
+    TensionAdjustmentFactors,
+    BendingAdjustmentFactors,
+    ShearAdjustmentFactors,
+    CompressionAdjustmentFactors,
+    PerpendicularAdjustmentFactors,
+    ElasticModulusAdjustmentFactors,
+    RectangularSection,
+    MemberDefinition,
+    WoodMaterial,
+)
+from timber_nds.calculation import FORCE_COLUMNS
+from timber_nds.design import (
+    DCR_OUTPUT_COLUMNS,
+    SupportArea,
+    TimeEffect,
+    calculate_dcr_arrays,
+    force_table_labels,
+    build_results_frame,
+    check_force_table,
+    encode_labels,
+    governing_envelope,
+    _capacity_tables,
+    _row_capacities,
+    _write_atomically,
+)
+
+
+class SharedArray:
+    """
+    A NumPy array stored in a multiprocessing.shared_memory block.
+
+    Args:
+        shape: Shape of the array.
+        dtype: Data type of the array.
+        name: Name of an existing block to attach to; a new block is created when None.
+
+    Assumptions:
+        - The process that created the block is responsible for calling unlink().
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype: str = "float64", name: str = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "SharedArray":
+        """
+        Copies an array into a new shared memory block.
+        """
+        shared = cls(array.shape, array.dtype.str)
+        shared.array[...] = array
+        return shared
+
+    @property
+    def spec(self) -> tuple:
+        """
+        Small picklable description used by workers to attach to the block.
+        """
+        return self.shm.name, self.shape, self.dtype.str
+
+    def close(self):
+        del self.array
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+_worker_arrays = {}
+
+
+_OPTIONAL_ARRAYS = ("areas", "unit_capacities", "time_effects")
+
+
+def _attach_worker(forces_spec: tuple, capacities_spec: tuple, output_spec: tuple, optional_specs: dict = None):
+    specs = {"forces": forces_spec, "capacities": capacities_spec, "output": output_spec}
+    specs.update({key: (optional_specs or {}).get(key) for key in _OPTIONAL_ARRAYS})
+    for key, spec in specs.items():
+        _worker_arrays[key] = None if spec is None else SharedArray(spec[1], spec[2], name=spec[0])
+
+
+def _worker_array(key: str) -> np.ndarray:
+    shared = _worker_arrays[key]
+    return None if shared is None else shared.array
+
+
+def _check_chunk(task: Tuple[int, int, int]) -> int:
+    section_index, start, stop = task
+    forces = _worker_arrays["forces"].array
+    capacities = _worker_arrays["capacities"].array
+    unit_capacities = _worker_array("unit_capacities")
+    output = _worker_arrays["output"].array
+    row_capacities = _row_capacities(
+        capacities[section_index],
+        None if unit_capacities is None else unit_capacities[section_index],
+        _worker_array("time_effects"),
+        _worker_array("areas"),
+        slice(start, stop),
+    )
+    calculate_dcr_arrays(forces[start:stop], row_capacities, out=output[section_index, start:stop])
+    return stop - start
+
+
+def check_force_table_parallel(
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        forces_df: pd.DataFrame,
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area: SupportArea = 1.0,
+        element: MemberDefinition = None,
+        processes: int = None,
+        chunk_size: int = 100_000,
+        dtype: Union[str, type] = np.float64,
+        time_effect: TimeEffect = None,
+) -> pd.DataFrame:
+    """
+    Runs check_force_table across a pool of worker processes.
+
+    The force columns, the section capacity table and the DCR output buffer
+    live in shared memory, so workers read and write them in place and only
+    the (section, start, stop) chunk bounds are pickled. Per-row support
+    areas and time effects are shared the same way.
+
+    Args:
+        support_area: A scalar or per-member/per-node areas, see row_support_areas.
+        time_effect: Load-duration factor per Robot load case, as in check_force_table.
+        processes: Number of worker processes (defaults to os.cpu_count()).
+        chunk_size: Number of force rows handled per task.
+        dtype: Precision of the shared DCR output buffer.
+
+    Returns:
+        The same DataFrame check_force_table would return.
+    """
+    if not isinstance(list_sections, list):
+        list_sections = [list_sections]
+    if not list_sections:
+        raise ValueError("The 'list_sections' cannot be empty.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    design_inputs = (
+        material, tension_factors, bending_factors_yy, bending_factors_zz, shear_factors,
+        compression_factors_yy, compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+    )
+    capacities, unit_capacities, time_effects, areas = _capacity_tables(
+        list_sections, forces_df, design_inputs, support_area, time_effect, element
+    )
+    members, forces = force_table_labels(forces_df, element)
+    n_rows = len(forces_df)
+
+    shared_forces = SharedArray.from_array(np.ascontiguousarray(forces_df[FORCE_COLUMNS].to_numpy(dtype=float)))
+    shared_capacities = SharedArray.from_array(capacities)
+    shared_output = SharedArray((len(list_sections), n_rows, len(DCR_OUTPUT_COLUMNS)), np.dtype(dtype).str)
+    shared_optional = {
+        key: SharedArray.from_array(values)
+        for key, values in zip(_OPTIONAL_ARRAYS, (areas, unit_capacities, time_effects)) if values is not None
+    }
+    shared = (shared_forces, shared_capacities, shared_output, *shared_optional.values())
+
+    tasks = [
+        (section_index, start, min(start + chunk_size, n_rows))
+        for section_index in range(len(list_sections))
+        for start in range(0, n_rows, chunk_size)
+    ]
+    try:
+        with get_context().Pool(
+            processes=processes or os.cpu_count(),
+            initializer=_attach_worker,
+            initargs=(
+                shared_forces.spec, shared_capacities.spec, shared_output.spec,
+                {key: array.spec for key, array in shared_optional.items()},
+            ),
+        ) as pool:
+            for _ in pool.imap_unordered(_check_chunk, tasks):
+                pass
+        dcr = shared_output.array.copy()
+    finally:
+        for array in shared:
+            array.close()
+            array.unlink()
+
+    return build_results_frame(dcr, [section.name for section in list_sections], members, forces)
+
+
+def member_shards(forces_df: pd.DataFrame, n_shards: int) -> np.ndarray:
+    """
+    Assigns every force row to a shard from a CRC32 hash of its Robot member.
+
+    The assignment depends only on the member label and n_shards, so every
+    machine that reads the same export computes the same shards.
+
+    Returns:
+        Array with the shard number of each row.
+    """
+    if n_shards <= 0:
+        raise ValueError("n_shards must be a positive integer.")
+    members = pd.Categorical(forces_df.index.get_level_values("Member").astype(str))
+    category_shards = np.array(
+        [zlib.crc32(member.encode("utf-8")) % n_shards for member in members.categories], dtype=np.int64
+    )
+    return category_shards[members.codes]
+
+
+def write_force_shards(forces_df: pd.DataFrame, n_shards: int, output_dir: str) -> List[str]:
+    """
+    Splits a Robot force table into member shards stored as pickle files.
+
+    Args:
+        forces_df: Table returned by import_robot_bar_forces.
+        n_shards: Number of shards.
+        output_dir: Directory, typically on a shared filesystem, for the shard files.
+
+    Returns:
+        The paths of the shard files, one per shard (some may be empty).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    shards = member_shards(forces_df, n_shards)
+    paths = []
+    for shard in range(n_shards):
+        path = os.path.join(output_dir, f"forces_shard_{shard:04d}_of_{n_shards:04d}.pkl")
+        _write_atomically(forces_df[shards == shard], path)
+        paths.append(path)
+    return paths
+
+
+def run_shard(
+        shard_path: str,
+        output_path: str,
+        list_sections: Union[List[RectangularSection], RectangularSection],
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        support_area: SupportArea = 1.0,
+        time_effect: TimeEffect = None,
+) -> str:
+    """
+    Checks one force shard and writes its results as an independent job.
+
+    The result file only appears once it is complete, so a merge never reads
+    a partially written shard.
+
+    Args:
+        support_area: A scalar, or areas keyed by member or Robot node (see
+            row_support_areas). Per-row arrays are rejected because they are
+            aligned to the full table, not to the shard.
+        time_effect: Load-duration factor per Robot load case, as in check_force_table.
+
+    Returns:
+        The output path.
+    """
+    if isinstance(support_area, np.ndarray):
+        raise TypeError("run_shard needs a scalar support_area or areas keyed by member or node.")
+    forces_df = pd.read_pickle(shard_path)
+    results_df = check_force_table(
+        list_sections, forces_df, material, tension_factors, bending_factors_yy, bending_factors_zz,
+        shear_factors, compression_factors_yy, compression_factors_zz, compression_perp_factors,
+        elastic_modulus_factors, support_area=support_area, time_effect=time_effect,
+    )
+    _write_atomically(results_df, output_path)
+    return output_path
+
+
+def merge_shard_results(result_paths: List[str], envelope: bool = False) -> pd.DataFrame:
+    """
+    Combines the result files written by run_shard.
+
+    Args:
+        result_paths: Result file of every shard.
+        envelope: Return only the governing row per member and section.
+
+    Returns:
+        The merged results.
+    """
+    missing = [path for path in result_paths if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"Missing shard results: {missing}")
+
+    shard_results = []
+    for path in result_paths:
+        results_df = pd.read_pickle(path)
+        # Shards never share a member, so the envelope of each shard is final.
+        shard_results.append(governing_envelope(results_df) if envelope else results_df)
+
+    if not shard_results:
+        return pd.DataFrame()
+    return encode_labels(pd.concat(shard_results, ignore_index=True))
@@ -0,0 +1,234 @@
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from timber_nds.settings import (
+    TensionAdjustmentFactors,
+    BendingAdjustmentFactors,
+    ShearAdjustmentFactors,
+    CompressionAdjustmentFactors,
+    PerpendicularAdjustmentFactors,
+    ElasticModulusAdjustmentFactors,
+    RectangularSection,
+    MemberDefinition,
+    WoodMaterial,
+    MaterialVariability,
+)
+from timber_nds.calculation import FORCE_COLUMNS
+from timber_nds.design import (
+    DCR_OUTPUT_COLUMNS,
+    calculate_section_capacities,
+    calculate_dcr_arrays,
+    force_table_labels,
+    member_row_groups,
+)
+
+
+# Material strength behind each of the CAPACITY_COLUMNS.
+CAPACITY_STRENGTHS = [
+    "tension_strength",
+    "compression_parallel_strength",
+    "bending_strength",
+    "bending_strength",
+    "shear_strength",
+    "compression_perpendicular_strength",
+]
+
+
+class StreamingMemberStatistics:
+    """
+    Accumulates per-member statistics of DCR samples without storing them.
+
+    Keeps the count, mean and variance (Chan's parallel update), the extremes,
+    the number of samples above the limit and a fixed-bin histogram used as a
+    quantile sketch.
+
+    Args:
+        n_members: Number of members.
+        limit: DCR above which a sample counts as a failure.
+        max_dcr: Upper edge of the histogram; larger samples fall in an overflow bin.
+        n_bins: Number of histogram bins between 0 and max_dcr.
+    """
+
+    def __init__(self, n_members: int, limit: float = 1.0, max_dcr: float = 5.0, n_bins: int = 500):
+        if max_dcr <= 0 or n_bins <= 0:
+            raise ValueError("max_dcr and n_bins must be positive.")
+        self.n_members = n_members
+        self.limit = limit
+        self.edges = np.linspace(0.0, max_dcr, n_bins + 1)
+        self.count = 0
+        self.mean = np.zeros(n_members)
+        self.m2 = np.zeros(n_members)
+        self.minimum = np.full(n_members, np.inf)
+        self.maximum = np.full(n_members, -np.inf)
+        self.exceedances = np.zeros(n_members, dtype=np.int64)
+        self.histogram = np.zeros((n_members, n_bins + 1), dtype=np.int64)
+
+    def update(self, samples: np.ndarray):
+        """
+        Adds a chunk of samples of shape (n_samples, n_members).
+        """
+        chunk_count = len(samples)
+        if chunk_count == 0:
+            return
+        chunk_mean = samples.mean(axis=0)
+        chunk_m2 = ((samples - chunk_mean) ** 2).sum(axis=0)
+        total = self.count + chunk_count
+        delta = chunk_mean - self.mean
+        self.mean += delta * chunk_count / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * chunk_count / total
+        self.count = total
+
+        np.minimum(self.minimum, samples.min(axis=0), out=self.minimum)
+        np.maximum(self.maximum, samples.max(axis=0), out=self.maximum)
+        self.exceedances += (samples > self.limit).sum(axis=0)
+
+        n_bins = self.histogram.shape[1]
+        bins = np.clip(np.searchsorted(self.edges, samples, side="right") - 1, 0, n_bins - 1)
+        flat_bins = (np.arange(self.n_members) * n_bins + bins).ravel()
+        self.histogram += np.bincount(flat_bins, minlength=self.histogram.size).reshape(self.histogram.shape)
+
+    def variance(self) -> np.ndarray:
+        return self.m2 / (self.count - 1) if self.count > 1 else np.zeros(self.n_members)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        Estimates the q-quantile of every member from the histogram.
+
+        Values in the overflow bin are reported as max_dcr, so quantiles above
+        it are lower bounds.
+        """
+        cumulative = np.cumsum(self.histogram, axis=1)
+        target = q * self.count
+        bins = np.minimum((cumulative < target).sum(axis=1), self.histogram.shape[1] - 1)
+        rows = np.arange(self.n_members)
+        below = np.where(bins > 0, cumulative[rows, np.maximum(bins - 1, 0)], 0)
+        in_bin = self.histogram[rows, bins]
+        fraction = np.divide(target - below, in_bin, out=np.zeros(self.n_members), where=in_bin > 0)
+        widths = np.diff(self.edges)
+        lower = self.edges[np.minimum(bins, len(widths) - 1)]
+        estimate = lower + np.clip(fraction, 0, 1) * widths[np.minimum(bins, len(widths) - 1)]
+        estimate = np.where(bins == len(widths), self.edges[-1], estimate)
+        return np.clip(estimate, self.minimum, self.maximum)
+
+
+def sample_strength_ratios(
+        rng: np.random.Generator,
+        variability: MaterialVariability,
+        shape: Tuple[int, ...],
+) -> np.ndarray:
+    """
+    Draws sampled-to-nominal strength ratios for every CAPACITY_COLUMNS entry.
+
+    Returns:
+        Array of shape shape + (6,); both bending capacities share one draw.
+    """
+    strengths = list(dict.fromkeys(CAPACITY_STRENGTHS))
+    draws = {}
+    for strength in strengths:
+        cov = getattr(variability, strength)
+        if cov < 0:
+            raise ValueError(f"The coefficient of variation of '{strength}' must be non-negative.")
+        if cov == 0:
+            draws[strength] = np.ones(shape)
+        elif variability.distribution == "lognormal":
+            sigma = np.sqrt(np.log1p(cov ** 2))
+            draws[strength] = rng.lognormal(-sigma ** 2 / 2, sigma, size=shape)
+        elif variability.distribution == "normal":
+            draws[strength] = np.maximum(rng.normal(1.0, cov, size=shape), np.finfo(float).tiny)
+        else:
+            raise ValueError("distribution must be 'lognormal' or 'normal'.")
+    return np.stack([draws[strength] for strength in CAPACITY_STRENGTHS], axis=-1)
+
+
+def monte_carlo_member_reliability(
+        section: RectangularSection,
+        forces_df: pd.DataFrame,
+        material: WoodMaterial,
+        tension_factors: TensionAdjustmentFactors,
+        bending_factors_yy: BendingAdjustmentFactors,
+        bending_factors_zz: BendingAdjustmentFactors,
+        shear_factors: ShearAdjustmentFactors,
+        compression_factors_yy: CompressionAdjustmentFactors,
+        compression_factors_zz: CompressionAdjustmentFactors,
+        compression_perp_factors: PerpendicularAdjustmentFactors,
+        elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+        variability: MaterialVariability,
+        n_samples: int,
+        seed: int = None,
+        support_area: float = 1.0,
+        element: MemberDefinition = None,
+        limit: float = 1.0,
+        quantiles: List[float] = (0.05, 0.5, 0.95),
+        max_dcr: float = 5.0,
+        n_bins: int = 500,
+        chunk_rows: int = 1_000_000,
+) -> pd.DataFrame:
+    """
+    Estimates the governing-DCR distribution and failure probability of every member.
+
+    Each member draws its own material strengths per sample. Capacities are
+    linear in the strengths, so a sample only rescales the nominal capacities
+    before the DCRs of all the member's force rows are evaluated; the
+    governing dcr_max per member then feeds streaming statistics, and the
+    samples themselves are discarded chunk by chunk.
+
+    Args:
+        variability: Distribution and coefficients of variation of the strengths.
+        n_samples: Number of Monte Carlo samples.
+        seed: Seed of the NumPy random generator; results are reproducible
+            for a given seed and chunk_rows.
+        limit: DCR above which a sample is a failure.
+        quantiles: Quantiles to estimate from the histogram sketch.
+        max_dcr: Upper edge of the histogram sketch.
+        n_bins: Number of histogram bins.
+        chunk_rows: Samples x force rows evaluated per chunk, which bounds memory.
+
+    Returns:
+        A DataFrame indexed by member with the mean, standard deviation,
+        extremes, quantiles, exceedance count and failure probability of the
+        governing DCR.
+    """
+    if n_samples <= 0:
+        raise ValueError("n_samples must be a positive integer.")
+    if forces_df.empty:
+        raise ValueError("The force table cannot be empty.")
+
+    nominal_capacities = calculate_section_capacities(
+        section, material, tension_factors, bending_factors_yy, bending_factors_zz, shear_factors,
+        compression_factors_yy, compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+        support_area,
+    ).to_numpy()[0]
+    members, _ = force_table_labels(forces_df, element)
+    order, starts, member_labels = member_row_groups(members)
+    force_values = forces_df[FORCE_COLUMNS].to_numpy(dtype=float)[order]
+    row_members = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(force_values)]))
+    n_rows = len(force_values)
+
+    rng = np.random.default_rng(seed)
+    statistics = StreamingMemberStatistics(len(starts), limit=limit, max_dcr=max_dcr, n_bins=n_bins)
+    samples_per_chunk = max(1, chunk_rows // n_rows)
+    governing = DCR_OUTPUT_COLUMNS.index("dcr_max")
+
+    for first_sample in range(0, n_samples, samples_per_chunk):
+        chunk_samples = min(samples_per_chunk, n_samples - first_sample)
+        ratios = sample_strength_ratios(rng, variability, (chunk_samples, len(starts)))
+        capacities = (nominal_capacities * ratios[:, row_members]).reshape(-1, len(nominal_capacities))
+        dcr = calculate_dcr_arrays(np.tile(force_values, (chunk_samples, 1)), capacities)
+        dcr_max = dcr[:, governing].reshape(chunk_samples, n_rows)
+        statistics.update(np.maximum.reduceat(dcr_max, starts, axis=1))
+
+    results_df = pd.DataFrame(
+        {
+            "mean": statistics.mean,
+            "std": np.sqrt(statistics.variance()),
+            "min": statistics.minimum,
+            "max": statistics.maximum,
+        },
+        index=member_labels,
+    )
+    for q in quantiles:
+        results_df[f"q{q:g}"] = statistics.quantile(q)
+    results_df["exceedances"] = statistics.exceedances
+    results_df["failure_probability"] = statistics.exceedances / statistics.count
+    return results_df
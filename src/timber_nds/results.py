@@ -0,0 +1,369 @@
+from typing import Union, List, Iterable, Literal
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from timber_nds.calculation import ROBOT_INDEX_LEVELS
+from timber_nds.design import LABEL_COLUMNS, encode_labels, decode_labels
+
+
+ROBOT_LEVEL_COLUMNS = {level.lower(): position for position, level in enumerate(ROBOT_INDEX_LEVELS)}
+
+
+class ResultStore:
+    """
+    Indexed, read-only container for design results.
+
+    Label columns (member, section, force and the Robot case and mode parsed
+    from the force labels) get a sorted index over their categorical codes,
+    and DCR columns get a sorted value index. Both are built on first use and
+    answer lookups with binary searches instead of full scans.
+
+    Args:
+        results_df: DataFrame produced by the design checks.
+
+    Assumptions:
+        - Robot force labels have the "Member/Node/Case/Mode" form built by
+          robot_force_labels.
+    """
+
+    def __init__(self, results_df: pd.DataFrame):
+        if not isinstance(results_df, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame.")
+        self.results_df = encode_labels(results_df.reset_index(drop=True))
+        self._label_indexes = {}
+        self._value_indexes = {}
+
+    def __len__(self) -> int:
+        return len(self.results_df)
+
+    def _label_codes(self, column: str) -> tuple:
+        if column in self.results_df.columns:
+            labels = self.results_df[column].cat
+            return labels.codes.to_numpy(), labels.categories
+        if column not in ROBOT_LEVEL_COLUMNS:
+            raise ValueError(f"Column '{column}' not found in results.")
+
+        forces = self.results_df["force"].cat
+        parts = forces.categories.astype(str).str.split("/")
+        if len(parts) and parts.str.len().min() < len(ROBOT_INDEX_LEVELS):
+            raise ValueError(f"Force labels do not contain the Robot '{column}' level.")
+        level_codes, level_categories = pd.factorize(parts.str[ROBOT_LEVEL_COLUMNS[column]])
+        force_codes = forces.codes.to_numpy()
+        return np.where(force_codes >= 0, level_codes[force_codes], -1), pd.Index(level_categories)
+
+    def _label_index(self, column: str) -> tuple:
+        if column not in self._label_indexes:
+            codes, categories = self._label_codes(column)
+            order = np.argsort(codes, kind="stable")
+            self._label_indexes[column] = (order, codes[order], categories)
+        return self._label_indexes[column]
+
+    def _value_index(self, column: str) -> tuple:
+        if column not in self._value_indexes:
+            if column not in self.results_df.columns:
+                raise ValueError(f"Column '{column}' not found in results.")
+            values = self.results_df[column].to_numpy(dtype=float)
+            order = np.argsort(values, kind="stable")
+            self._value_indexes[column] = (order, values[order])
+        return self._value_indexes[column]
+
+    def _rows(self, positions: np.ndarray) -> pd.DataFrame:
+        return self.results_df.iloc[np.sort(positions)]
+
+    def lookup(self, column: str, values: Union[str, List[str]]) -> pd.DataFrame:
+        """
+        Returns the rows whose label equals one of the given values.
+
+        Args:
+            column: 'member', 'section', 'force', 'case' or 'mode'.
+            values: A label or a list of labels.
+
+        Returns:
+            The matching rows, in their original order.
+        """
+        order, sorted_codes, categories = self._label_index(column)
+        values = [values] if isinstance(values, str) else values
+        codes = categories.get_indexer(pd.Index(values))
+        blocks = [
+            order[np.searchsorted(sorted_codes, code, "left"):np.searchsorted(sorted_codes, code, "right")]
+            for code in codes[codes >= 0]
+        ]
+        return self._rows(np.concatenate(blocks) if blocks else np.array([], dtype=int))
+
+    def by_member(self, member: Union[str, List[str]]) -> pd.DataFrame:
+        return self.lookup("member", member)
+
+    def by_section(self, section: Union[str, List[str]]) -> pd.DataFrame:
+        return self.lookup("section", section)
+
+    def by_force(self, force: Union[str, List[str]]) -> pd.DataFrame:
+        return self.lookup("force", force)
+
+    def by_case(self, case: Union[str, List[str]]) -> pd.DataFrame:
+        return self.lookup("case", case)
+
+    def by_mode(self, mode: Union[str, List[str]]) -> pd.DataFrame:
+        return self.lookup("mode", mode)
+
+    def threshold(
+            self,
+            column: str,
+            operator: Literal["eq", "gt", "lt", "ge", "le"],
+            threshold: float,
+    ) -> pd.DataFrame:
+        """
+        Returns the rows where a numeric column compares to a threshold.
+
+        Uses the same operator names as filter_and_export_results.
+        """
+        if operator not in ("eq", "gt", "lt", "ge", "le"):
+            raise ValueError(f"Invalid operator '{operator}'. Use 'eq', 'gt', 'lt', 'ge', or 'le'.")
+        order, sorted_values = self._value_index(column)
+        left = np.searchsorted(sorted_values, threshold, "left")
+        right = np.searchsorted(sorted_values, threshold, "right")
+        # NaN values sort last and never satisfy a comparison.
+        valid = np.searchsorted(sorted_values, np.inf, "right")
+        start, stop = {
+            "eq": (left, right),
+            "gt": (right, valid),
+            "ge": (left, valid),
+            "lt": (0, left),
+            "le": (0, right),
+        }[operator]
+        return self._rows(order[start:stop])
+
+    def between(self, column: str, min_value: float, max_value: float) -> pd.DataFrame:
+        """
+        Returns the rows with min_value <= column <= max_value.
+        """
+        order, sorted_values = self._value_index(column)
+        start = np.searchsorted(sorted_values, min_value, "left")
+        stop = np.searchsorted(sorted_values, max_value, "right")
+        return self._rows(order[start:stop])
+
+
+def top_n_indices(values: np.ndarray, n: int, groups: np.ndarray = None) -> np.ndarray:
+    """
+    Finds the positions of the n largest values, overall or per group, without a full sort.
+
+    Buckets the positions by group in linear time, uses np.argpartition on
+    each group and only sorts the selected n positions; NaN values rank last.
+
+    Args:
+        values: 1-D array of values.
+        n: Number of positions to keep per group.
+        groups: Integer group code of every value; one group when None.
+
+    Returns:
+        The selected positions, grouped by code and by descending value.
+    """
+    if n <= 0:
+        raise ValueError("n must be a positive integer.")
+    keys = np.asarray(values, dtype=float)
+    keys = -np.where(np.isnan(keys), -np.inf, keys)
+
+    def select(positions: np.ndarray) -> np.ndarray:
+        if len(positions) > n:
+            positions = positions[np.argpartition(keys[positions], n - 1)[:n]]
+        return positions[np.argsort(keys[positions], kind="stable")]
+
+    if groups is None:
+        return select(np.arange(len(keys)))
+    # groupby(...).indices buckets the positions with a counting sort, so no
+    # O(n log n) sort of the codes is needed before the per-group selection.
+    codes = np.asarray(groups)
+    positions = pd.Series(np.arange(len(codes))).groupby(codes, sort=True).indices
+    blocks = [select(group_positions) for group_positions in positions.values()]
+    return np.concatenate(blocks) if blocks else np.array([], dtype=int)
+
+
+def _group_codes(results_df: pd.DataFrame, by: Union[str, List[str]]) -> np.ndarray:
+    if by is None:
+        return None
+    return results_df.groupby(by, observed=True, sort=True).ngroup().to_numpy()
+
+
+def top_n_rows(
+        results_df: pd.DataFrame,
+        n: int = 10,
+        columns: Union[str, List[str]] = "dcr_max",
+        by: Union[str, List[str]] = "member",
+) -> pd.DataFrame:
+    """
+    Returns the n highest-DCR rows per group.
+
+    Args:
+        results_df: DataFrame produced by the design checks.
+        n: Rows kept per group and DCR column.
+        columns: DCR column to rank by, or a list of columns to rank by one
+            after the other (one report per DCR type).
+        by: Column or columns that define a group; the whole frame when None.
+
+    Returns:
+        For a single column, the selected rows ordered by group and descending
+        DCR. For a list, a long frame with the label columns, a 'dcr_type'
+        column naming the ranked column and its value in 'dcr'.
+    """
+    if isinstance(columns, str):
+        positions = top_n_indices(results_df[columns], n, _group_codes(results_df, by))
+        return results_df.iloc[positions].reset_index(drop=True)
+
+    by_columns = [] if by is None else [by] if isinstance(by, str) else list(by)
+    keep = list(dict.fromkeys(by_columns + [column for column in LABEL_COLUMNS if column in results_df.columns]))
+    reports = []
+    for column in columns:
+        rows = top_n_rows(results_df, n, column, by)
+        report = rows[keep].copy()
+        report["dcr_type"] = column
+        report["dcr"] = rows[column].to_numpy()
+        reports.append(report)
+    report_df = pd.concat(reports, ignore_index=True)
+    report_df["dcr_type"] = pd.Categorical(report_df["dcr_type"], categories=list(columns))
+    return encode_labels(report_df)
+
+
+class TopNReducer:
+    """
+    Streaming version of top_n_rows for chunked design output.
+
+    Each update keeps only the rows that are among the n largest of their
+    group for one of the ranked columns, so memory stays bounded by the
+    number of groups times n, whatever the number of chunks.
+
+    Args:
+        n, columns, by: As in top_n_rows.
+    """
+
+    def __init__(
+            self,
+            n: int = 10,
+            columns: Union[str, List[str]] = "dcr_max",
+            by: Union[str, List[str]] = "member",
+    ):
+        if n <= 0:
+            raise ValueError("n must be a positive integer.")
+        self.n = n
+        self.columns = columns
+        self.by = by
+        self._candidates = None
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Merges a result chunk into the running candidates.
+        """
+        if self._candidates is not None:
+            chunk = encode_labels(pd.concat([self._candidates, chunk], ignore_index=True))
+        columns = [self.columns] if isinstance(self.columns, str) else self.columns
+        groups = _group_codes(chunk, self.by)
+        positions = np.unique(np.concatenate([top_n_indices(chunk[column], self.n, groups) for column in columns]))
+        self._candidates = chunk.iloc[positions].reset_index(drop=True)
+
+    def result(self) -> pd.DataFrame:
+        """
+        Returns the top-n report of everything seen so far.
+        """
+        if self._candidates is None:
+            raise ValueError("No chunks have been added.")
+        return top_n_rows(self._candidates, self.n, self.columns, self.by)
+
+
+RUN_STATUSES = ["added", "removed", "changed", "now failing", "now passing"]
+
+
+def _diff_frames(before: pd.DataFrame, after: pd.DataFrame, keys: List[str], column: str, limit: float,
+                 tolerance: float) -> pd.DataFrame:
+    for name, side in (("before", before), ("after", after)):
+        if side.duplicated(keys).any():
+            raise ValueError(f"The '{name}' results have duplicated {keys} keys.")
+    merged = before.merge(after, on=keys, how="outer", suffixes=("_before", "_after"), indicator=True)
+    old = merged[f"{column}_before"].to_numpy(dtype=float)
+    new = merged[f"{column}_after"].to_numpy(dtype=float)
+    merged["delta"] = new - old
+
+    status = np.full(len(merged), None, dtype=object)
+    both = (merged["_merge"] == "both").to_numpy()
+    status[both & (np.abs(new - old) > tolerance)] = "changed"
+    status[both & (old <= limit) & (new > limit)] = "now failing"
+    status[both & (old > limit) & (new <= limit)] = "now passing"
+    status[(merged["_merge"] == "left_only").to_numpy()] = "removed"
+    status[(merged["_merge"] == "right_only").to_numpy()] = "added"
+    merged["status"] = pd.Categorical(status, categories=RUN_STATUSES)
+    return merged[merged["status"].notna()].drop(columns="_merge")
+
+
+def _partition_run(chunks: Iterable[pd.DataFrame], keys: List[str], column: str, n_partitions: int,
+                   spill_dir: str, name: str) -> List[List[str]]:
+    paths = [[] for _ in range(n_partitions)]
+    for i, chunk in enumerate(chunks):
+        chunk = decode_labels(chunk[keys + [column]])
+        partitions = pd.util.hash_pandas_object(chunk[keys], index=False).to_numpy() % n_partitions
+        for partition in np.unique(partitions):
+            path = os.path.join(spill_dir, f"{name}_{partition:04d}_{i:06d}.pkl")
+            chunk[partitions == partition].to_pickle(path)
+            paths[partition].append(path)
+    return paths
+
+
+def _read_partition(paths: List[str], keys: List[str], column: str) -> pd.DataFrame:
+    if not paths:
+        return pd.DataFrame({name: pd.Series(dtype=object) for name in keys}).assign(**{column: np.nan})
+    return pd.concat([pd.read_pickle(path) for path in paths], ignore_index=True)
+
+
+def compare_runs(
+        before: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        after: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        keys: Union[str, List[str]] = tuple(LABEL_COLUMNS),
+        column: str = "dcr_max",
+        limit: float = 1.0,
+        tolerance: float = 1e-9,
+        n_partitions: int = 16,
+        spill_dir: str = None,
+) -> pd.DataFrame:
+    """
+    Compares two design runs and reports the rows whose DCR changed.
+
+    The runs are hash-joined on the keys: (member, section, force) for full
+    results, or e.g. (member, section) for governing envelopes. Chunked runs
+    are hash-partitioned on the keys to disk first and joined one partition
+    at a time, so neither run has to fit in memory.
+
+    Args:
+        before, after: Result frames, or iterables of result chunks.
+        keys: Column or columns identifying a row; must be unique in each run.
+        column: DCR column compared.
+        limit: DCR above which a row fails.
+        tolerance: Smallest absolute change reported.
+        n_partitions: Number of hash partitions used for chunked runs.
+        spill_dir: Directory for the partitions; a temporary one is used when None.
+
+    Returns:
+        A DataFrame with the keys, the compared column before and after, the
+        delta and a status among RUN_STATUSES; pass/fail flips are reported
+        as 'now failing' or 'now passing' instead of 'changed'.
+    """
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    if isinstance(before, pd.DataFrame) and isinstance(after, pd.DataFrame):
+        diff_df = _diff_frames(
+            decode_labels(before[keys + [column]]), decode_labels(after[keys + [column]]), keys, column, limit,
+            tolerance,
+        )
+        return encode_labels(diff_df.reset_index(drop=True))
+
+    if n_partitions <= 0:
+        raise ValueError("n_partitions must be a positive integer.")
+    before = [before] if isinstance(before, pd.DataFrame) else before
+    after = [after] if isinstance(after, pd.DataFrame) else after
+    with tempfile.TemporaryDirectory(dir=spill_dir) as partition_dir:
+        before_paths = _partition_run(before, keys, column, n_partitions, partition_dir, "before")
+        after_paths = _partition_run(after, keys, column, n_partitions, partition_dir, "after")
+        diffs = [
+            _diff_frames(
+                _read_partition(before_partition, keys, column), _read_partition(after_partition, keys, column),
+                keys, column, limit, tolerance,
+            )
+            for before_partition, after_partition in zip(before_paths, after_paths)
+        ]
+    return encode_labels(pd.concat(diffs, ignore_index=True))
@@ -1,7 +1,14 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from math import prod
 
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__; they need Python 3.10 or later.
+_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+@_dataclass
 class WoodMaterial:
     name: str = "Default Wood"
     specific_gravity: float = 0.58
@@ -15,14 +22,14 @@ class WoodMaterial:
     color: str = "Brown"
 
 
-@dataclass
+@_dataclass
 class RectangularSection:
     name: str = "Default Section"
     depth: float = 8.9
     width: float = 3.8
 
 
-@dataclass
+@_dataclass
 class MemberDefinition:
     name: str = "Default Member"
     length: float = 300.
@@ -30,7 +37,7 @@ class MemberDefinition:
     effective_length_factor_zz: float = 1.0
 
 
-@dataclass
+@_dataclass
 class TensionAdjustmentFactors:
     due_moisture: float = 1.0
     due_temperature: float = 1.0
@@ -41,7 +48,7 @@ class TensionAdjustmentFactors:
     due_time_effect: float = 1.0
 
 
-@dataclass
+@_dataclass
 class BendingAdjustmentFactors:
     due_moisture: float = 1.0
     due_temperature: float = 1.0
@@ -55,7 +62,7 @@ class BendingAdjustmentFactors:
     due_time_effect: float = 1.0
 
 
-@dataclass
+@_dataclass
 class ShearAdjustmentFactors:
     due_moisture: float = 1.0
     due_temperature: float = 1.0
@@ -65,7 +72,7 @@ class ShearAdjustmentFactors:
     due_time_effect: float = 1.0
 
 
-@dataclass
+@_dataclass
 class CompressionAdjustmentFactors:
     due_moisture: float = 1.0
     due_temperature: float = 1.0
@@ -77,7 +84,7 @@ class CompressionAdjustmentFactors:
     due_time_effect: float = 1.0
 
 
-@dataclass
+@_dataclass
 class PerpendicularAdjustmentFactors:
     due_moisture: float = 1.0
     due_temperature: float = 1.0
@@ -88,7 +95,7 @@ class PerpendicularAdjustmentFactors:
     due_time_effect: float = 1.0
 
 
-@dataclass
+@_dataclass
 class ElasticModulusAdjustmentFactors:
     due_moisture: float = 1.0
     due_temperature: float = 1.0
@@ -97,7 +104,7 @@ class ElasticModulusAdjustmentFactors:
     due_resistance_reduction: float = 0.85
 
 
-@dataclass
+@_dataclass
 class Forces:
     name: str = "default force"
     axial: float = 0.0
@@ -106,3 +113,32 @@ class Forces:
     moment_xx: float = 0.0
     moment_yy: float = 0.0
     moment_zz: float = 0.0
+
+
+@_dataclass
+class MaterialVariability:
+    # Coefficients of variation of the WoodMaterial strengths, sampled around their values.
+    distribution: str = "lognormal"
+    tension_strength: float = 0.0
+    bending_strength: float = 0.0
+    shear_strength: float = 0.0
+    compression_perpendicular_strength: float = 0.0
+    compression_parallel_strength: float = 0.0
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple:
+    return tuple(field.name for field in fields(cls))
+
+
+def combined_factor(factors) -> float:
+    """
+    Multiplies every adjustment factor of a factor dataclass.
+
+    Args:
+        factors: Any of the *AdjustmentFactors instances.
+
+    Returns:
+        The product of all its fields.
+    """
+    return prod(getattr(factors, name) for name in _field_names(type(factors)))
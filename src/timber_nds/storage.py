@@ -0,0 +1,548 @@
+from typing import Union, List, Dict, Iterable, Literal
+from datetime import datetime, timezone
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import uuid
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+from timber_nds.design import (
+    LABEL_COLUMNS,
+    DCR_OUTPUT_COLUMNS,
+    encode_labels,
+    decode_labels,
+    validate_result_filters,
+    apply_result_filters,
+)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class ResultDatabase:
+    """
+    Local SQLite store that accumulates design results across runs.
+
+    Every append is one run, written in bulk inside a single transaction.
+    The member, section, force and run_id columns are indexed so queries
+    over many runs stay fast.
+
+    Args:
+        path: Path of the SQLite file (created if needed).
+
+    Assumptions:
+        - Result frames use the LABEL_COLUMNS and DCR_OUTPUT_COLUMNS names;
+          missing DCR columns are stored as NULL and other columns are ignored.
+    """
+
+    RESULT_COLUMNS = ["run_id"] + LABEL_COLUMNS + DCR_OUTPUT_COLUMNS
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, created_at TEXT, description TEXT)"
+            )
+            columns = ", ".join(
+                [f"{_quote(column)} TEXT NOT NULL" for column in ["run_id"] + LABEL_COLUMNS]
+                + [f"{_quote(column)} REAL" for column in DCR_OUTPUT_COLUMNS]
+            )
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS results ({columns})")
+            for column in ["run_id"] + LABEL_COLUMNS:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_results_{column} ON results ({_quote(column)})"
+                )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_run_member ON results (run_id, member)"
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "ResultDatabase":
+        return self
+
+    def __exit__(self, *exc_info):
+        # On an exception in the with-block, a writer error must not hide it.
+        if exc_info[0] is not None:
+            self._stop()
+        else:
+            self.close()
+
+    def append(
+            self,
+            results_df: pd.DataFrame,
+            run_id: str = None,
+            description: str = "",
+            chunk_size: int = 100_000,
+    ) -> str:
+        """
+        Stores a result frame as a new run.
+
+        Args:
+            results_df: DataFrame produced by the design checks.
+            run_id: Identifier of the run; a random one is generated when None.
+            description: Free text stored with the run.
+            chunk_size: Rows converted and inserted per executemany call.
+
+        Returns:
+            The run_id.
+        """
+        if not isinstance(results_df, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame.")
+        missing = [column for column in LABEL_COLUMNS if column not in results_df.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in DataFrame.")
+
+        run_id = run_id or uuid.uuid4().hex
+        placeholders = ", ".join("?" * len(self.RESULT_COLUMNS))
+        insert = f"INSERT INTO results ({', '.join(map(_quote, self.RESULT_COLUMNS))}) VALUES ({placeholders})"
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO runs (run_id, created_at, description) VALUES (?, ?, ?)",
+                (run_id, datetime.now(timezone.utc).isoformat(), description),
+            )
+            for start in range(0, len(results_df), chunk_size):
+                chunk = decode_labels(results_df.iloc[start:start + chunk_size])
+                chunk = chunk.reindex(columns=LABEL_COLUMNS + DCR_OUTPUT_COLUMNS)
+                # SQLite stores NaN, including DCR columns missing from the frame, as NULL.
+                chunk.insert(0, "run_id", run_id)
+                self.connection.executemany(insert, chunk.itertuples(index=False, name=None))
+        return run_id
+
+    def runs(self) -> pd.DataFrame:
+        """
+        Lists the stored runs, oldest first.
+        """
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY rowid", self.connection)
+
+    def query(
+            self,
+            run_id: Union[str, List[str]] = None,
+            member: Union[str, List[str]] = None,
+            section: Union[str, List[str]] = None,
+            force: Union[str, List[str]] = None,
+            min_dcr: float = None,
+            dcr_column: str = "dcr_max",
+    ) -> pd.DataFrame:
+        """
+        Returns the stored results matching every given condition.
+
+        Args:
+            run_id, member, section, force: A value or a list of values.
+            min_dcr: Keep only rows with dcr_column >= min_dcr.
+            dcr_column: DCR column used by min_dcr.
+
+        Returns:
+            A DataFrame with categorical label columns.
+        """
+        conditions = []
+        parameters = []
+        for column, values in (("run_id", run_id), ("member", member), ("section", section), ("force", force)):
+            if values is None:
+                continue
+            values = [values] if isinstance(values, str) else list(values)
+            conditions.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+            parameters.extend(values)
+        if min_dcr is not None:
+            if dcr_column not in DCR_OUTPUT_COLUMNS:
+                raise ValueError(f"Column '{dcr_column}' is not a DCR column.")
+            conditions.append(f"{_quote(dcr_column)} >= ?")
+            parameters.append(min_dcr)
+
+        sql = "SELECT * FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        results_df = pd.read_sql_query(sql, self.connection, params=parameters)
+        results_df["run_id"] = results_df["run_id"].astype("category")
+        return encode_labels(results_df)
+
+
+class BackgroundResultWriter:
+    """
+    Writes result chunks to a CSV or Parquet file from a background thread.
+
+    Chunks go through a bounded queue: put() blocks while max_pending chunks
+    are waiting, which caps the memory held by a producer that computes
+    faster than the disk writes.
+
+    Args:
+        output_path: File to create; an existing file is overwritten.
+        file_format: "csv" or "parquet" (the latter needs pyarrow).
+        max_pending: Maximum number of chunks waiting to be written.
+    """
+
+    _STOP = object()
+
+    def __init__(self, output_path: str, file_format: Literal["csv", "parquet"] = "csv", max_pending: int = 4):
+        if file_format not in ("csv", "parquet"):
+            raise ValueError("file_format must be 'csv' or 'parquet'.")
+        if max_pending <= 0:
+            raise ValueError("max_pending must be a positive integer.")
+        if file_format == "parquet":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError as e:
+                raise ImportError("file_format='parquet' needs pyarrow.") from e
+            self._pa, self._pq = pyarrow, pyarrow.parquet
+        self.output_path = output_path
+        self.file_format = file_format
+        self.rows_written = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="timber-nds-result-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        parquet_writer = None
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is self._STOP:
+                    break
+                chunk = decode_labels(chunk)
+                if self.file_format == "csv":
+                    chunk.to_csv(self.output_path, mode="w" if self.rows_written == 0 else "a",
+                                 header=self.rows_written == 0, index=False)
+                else:
+                    table = self._pa.Table.from_pandas(chunk, preserve_index=False)
+                    if parquet_writer is None:
+                        parquet_writer = self._pq.ParquetWriter(self.output_path, table.schema)
+                    parquet_writer.write_table(table.cast(parquet_writer.schema))
+                self.rows_written += len(chunk)
+        except BaseException as e:
+            self._error = e
+            # Keep draining so a blocked producer can notice the error.
+            while self._queue.get() is not self._STOP:
+                pass
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+    def put(self, chunk: pd.DataFrame):
+        """
+        Queues a chunk, waiting while the queue is full.
+        """
+        if self._error is not None:
+            raise RuntimeError(f"Writing '{self.output_path}' failed: {self._error}") from self._error
+        self._queue.put(chunk)
+
+    def _stop(self):
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def close(self):
+        """
+        Waits until every queued chunk is written.
+        """
+        self._stop()
+        if self._error is not None:
+            raise RuntimeError(f"Writing '{self.output_path}' failed: {self._error}") from self._error
+
+    def __enter__(self) -> "BackgroundResultWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        # On an exception in the with-block, a writer error must not hide it.
+        if exc_info[0] is not None:
+            self._stop()
+        else:
+            self.close()
+
+
+def run_pipelined(
+        chunks: Iterable[pd.DataFrame],
+        output_path: str,
+        file_format: Literal["csv", "parquet"] = "csv",
+        max_pending: int = 4,
+) -> int:
+    """
+    Writes result chunks while the next ones are being computed.
+
+    Args:
+        chunks: Iterable of result frames, e.g. design.iter_check_force_table(...).
+        output_path: File to create.
+        file_format: "csv" or "parquet".
+        max_pending: Chunks allowed to wait for the writer before computing pauses.
+
+    Returns:
+        The number of rows written.
+    """
+    with BackgroundResultWriter(output_path, file_format, max_pending) as writer:
+        for chunk in chunks:
+            writer.put(chunk)
+    return writer.rows_written
+
+
+def _spill_run(frames: List[pd.DataFrame], sort_by: str, ascending: bool, spill_dir: str, run: int,
+               block_rows: int) -> list:
+    run_df = pd.concat(frames, ignore_index=True).sort_values(by=sort_by, ascending=ascending, kind="stable")
+    paths = []
+    for block, start in enumerate(range(0, len(run_df), block_rows)):
+        path = os.path.join(spill_dir, f"run_{run:06d}_block_{block:06d}.pkl")
+        run_df.iloc[start:start + block_rows].to_pickle(path)
+        paths.append(path)
+    return paths
+
+
+def _merge_runs(runs: List[list], sort_by: str, ascending: bool, writer: "BackgroundResultWriter"):
+    # Block-wise k-way merge: every buffer is sorted, so all buffered rows up to
+    # the smallest (or largest) last key among the buffers are final.
+    buffers = [pd.read_pickle(blocks.pop(0)) for blocks in runs]
+    while True:
+        for i, blocks in enumerate(runs):
+            if buffers[i].empty and blocks:
+                buffers[i] = pd.read_pickle(blocks.pop(0))
+        active = [i for i, buffer in enumerate(buffers) if not buffer.empty]
+        if not active:
+            return
+        last_keys = [buffers[i][sort_by].iloc[-1] for i in active]
+        bound = min(last_keys) if ascending else max(last_keys)
+
+        ready = []
+        for i in active:
+            keys = buffers[i][sort_by].to_numpy()
+            n_ready = int(np.count_nonzero(keys <= bound if ascending else keys >= bound))
+            ready.append(buffers[i].iloc[:n_ready])
+            buffers[i] = buffers[i].iloc[n_ready:]
+        writer.put(pd.concat(ready, ignore_index=True).sort_values(by=sort_by, ascending=ascending, kind="stable"))
+
+
+def external_filter_sort(
+        chunks: Iterable[pd.DataFrame],
+        output_path: str,
+        filters: Dict[str, Union[str, List[str], dict]] = None,
+        sort_by: str = None,
+        sort_order: Literal["asc", "desc"] = "asc",
+        spill_dir: str = None,
+        run_rows: int = 1_000_000,
+        block_rows: int = 100_000,
+        file_format: Literal["csv", "parquet"] = "csv",
+) -> int:
+    """
+    Filters and sorts result chunks that together do not fit in memory.
+
+    Uses the filter format of filter_and_export_results. Filtered rows are
+    collected into runs of up to run_rows rows, each sorted and spilled to
+    disk in blocks of block_rows; the runs are then merged block by block
+    and streamed to the output, so memory holds one run while spilling and
+    one block per run while merging. Rows with a missing sort key are
+    written last, as sort_values does.
+
+    Args:
+        chunks: Iterable of result frames, e.g. design.iter_check_force_table(...).
+        output_path: File to create.
+        filters: Filters of filter_and_export_results; no filtering when None.
+        sort_by: Column to sort by; the filtered rows keep their order when None.
+        sort_order: "asc" or "desc".
+        spill_dir: Directory for the sorted runs; a temporary one is used when None.
+        run_rows: Rows sorted in memory per run.
+        block_rows: Rows per spilled block.
+        file_format: "csv" or "parquet".
+
+    Returns:
+        The number of rows written.
+    """
+    if sort_order not in ["asc", "desc"]:
+        raise ValueError("sort_order must be 'asc' or 'desc'.")
+    if run_rows <= 0 or block_rows <= 0:
+        raise ValueError("run_rows and block_rows must be positive integers.")
+    ascending = sort_order == "asc"
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as run_dir, \
+            BackgroundResultWriter(output_path, file_format) as writer:
+        runs = []
+        pending = []
+        pending_rows = 0
+        missing_keys = []
+        validated = False
+        for chunk in chunks:
+            if filters:
+                if not validated:
+                    validate_result_filters(filters, chunk.columns)
+                    validated = True
+                chunk = apply_result_filters(chunk, filters)
+            if sort_by is None:
+                writer.put(chunk)
+                continue
+
+            # Decoded labels compare as plain strings across runs.
+            chunk = decode_labels(chunk)
+            missing = chunk[sort_by].isna()
+            if missing.any():
+                path = os.path.join(run_dir, f"missing_{len(missing_keys):06d}.pkl")
+                chunk[missing].to_pickle(path)
+                missing_keys.append(path)
+                chunk = chunk[~missing]
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            if pending_rows >= run_rows:
+                runs.append(_spill_run(pending, sort_by, ascending, run_dir, len(runs), block_rows))
+                pending, pending_rows = [], 0
+
+        if sort_by is not None:
+            if pending_rows:
+                runs.append(_spill_run(pending, sort_by, ascending, run_dir, len(runs), block_rows))
+            del pending
+            if runs:
+                _merge_runs(runs, sort_by, ascending, writer)
+            for path in missing_keys:
+                writer.put(pd.read_pickle(path))
+    return writer.rows_written
+
+
+PARTITION_MANIFEST = "_manifest.json"
+
+
+def _write_table(df: pd.DataFrame, path: str, file_format: str):
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    if file_format == "parquet":
+        df.to_parquet(temporary_path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(temporary_path)
+    os.replace(temporary_path, path)
+
+
+def write_partitioned_results(
+        results: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        output_dir: str,
+        partition_by: Literal["member", "section"] = "member",
+        file_format: Literal["parquet", "feather"] = "parquet",
+        stats_columns: List[str] = ("dcr_max",),
+        rows_per_file: int = 1_000_000,
+        max_buffered_rows: int = 5_000_000,
+) -> pd.DataFrame:
+    """
+    Writes results as a columnar dataset with one directory per member or section.
+
+    Rows are buffered per partition and written under "<partition_by>=<value>/"
+    once a partition holds rows_per_file rows, when all buffers together
+    exceed max_buffered_rows, and at the end. A partition therefore gets one
+    file unless it is large or memory runs short, however many chunks come
+    in. A manifest records, per partition, its files, row count and the
+    min/max of stats_columns, so read_partitioned_results can skip
+    partitions without opening them.
+
+    Args:
+        results: A result frame or an iterable of result chunks.
+        output_dir: Directory of the dataset; it must not hold another dataset.
+        partition_by: Label column that defines the partitions.
+        file_format: "parquet" or "feather" (both need pyarrow).
+        stats_columns: Numeric columns summarised per partition.
+        rows_per_file: Rows after which a partition's buffer is written out.
+        max_buffered_rows: Rows held in memory across all partitions before
+            every buffer is written out.
+
+    Returns:
+        The manifest as a DataFrame, one row per partition.
+    """
+    if partition_by not in ("member", "section"):
+        raise ValueError("partition_by must be 'member' or 'section'.")
+    if file_format not in ("parquet", "feather"):
+        raise ValueError("file_format must be 'parquet' or 'feather'.")
+    if rows_per_file <= 0 or max_buffered_rows <= 0:
+        raise ValueError("rows_per_file and max_buffered_rows must be positive integers.")
+    manifest_path = os.path.join(output_dir, PARTITION_MANIFEST)
+    if os.path.exists(manifest_path):
+        raise FileExistsError(f"'{output_dir}' already holds a partitioned dataset.")
+    os.makedirs(output_dir, exist_ok=True)
+
+    stats_columns = list(stats_columns)
+    partitions = {}
+    buffers = {}
+    buffer_rows = {}
+
+    def flush(value):
+        partition_df = pd.concat(buffers.pop(value), ignore_index=True)
+        del buffer_rows[value]
+        entry = partitions[value]
+        directory = f"{partition_by}={quote(str(value), safe='')}"
+        os.makedirs(os.path.join(output_dir, directory), exist_ok=True)
+        path = os.path.join(directory, f"part-{len(entry['files']):06d}.{file_format}")
+        _write_table(partition_df, os.path.join(output_dir, path), file_format)
+
+        entry["rows"] += len(partition_df)
+        entry["files"].append(path)
+        for column in stats_columns:
+            low, high = float(partition_df[column].min()), float(partition_df[column].max())
+            entry[f"{column}_min"] = min(entry.get(f"{column}_min", low), low)
+            entry[f"{column}_max"] = max(entry.get(f"{column}_max", high), high)
+
+    chunks = [results] if isinstance(results, pd.DataFrame) else results
+    for chunk in chunks:
+        chunk = decode_labels(chunk)
+        for value, partition_df in chunk.groupby(partition_by, sort=False):
+            partitions.setdefault(value, {partition_by: value, "rows": 0, "files": []})
+            buffers.setdefault(value, []).append(partition_df)
+            buffer_rows[value] = buffer_rows.get(value, 0) + len(partition_df)
+            if buffer_rows[value] >= rows_per_file:
+                flush(value)
+        if sum(buffer_rows.values()) > max_buffered_rows:
+            for value in list(buffers):
+                flush(value)
+    for value in list(buffers):
+        flush(value)
+
+    manifest = {
+        "partition_by": partition_by,
+        "file_format": file_format,
+        "stats_columns": stats_columns,
+        "partitions": list(partitions.values()),
+    }
+    temporary_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temporary_path, manifest_path)
+    return pd.DataFrame(manifest["partitions"])
+
+
+def read_partitioned_results(
+        output_dir: str,
+        values: Union[str, List[str]] = None,
+        min_dcr: float = None,
+        dcr_column: str = "dcr_max",
+) -> pd.DataFrame:
+    """
+    Loads rows of a dataset written by write_partitioned_results, opening only the partitions needed.
+
+    Args:
+        output_dir: Directory of the dataset.
+        values: Member or section names to load; all partitions when None.
+        min_dcr: Keep only rows with dcr_column >= min_dcr; partitions whose
+            recorded maximum is lower are skipped.
+        dcr_column: Column used by min_dcr; it must be one of the stats_columns.
+
+    Returns:
+        A DataFrame with categorical label columns.
+    """
+    with open(os.path.join(output_dir, PARTITION_MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    partition_by = manifest["partition_by"]
+    if min_dcr is not None and dcr_column not in manifest["stats_columns"]:
+        raise ValueError(f"Column '{dcr_column}' has no partition statistics.")
+
+    selected = manifest["partitions"]
+    if values is not None:
+        values = {values} if isinstance(values, str) else set(values)
+        selected = [entry for entry in selected if entry[partition_by] in values]
+    if min_dcr is not None:
+        selected = [entry for entry in selected if entry[f"{dcr_column}_max"] >= min_dcr]
+
+    reader = pd.read_parquet if manifest["file_format"] == "parquet" else pd.read_feather
+    tables = [reader(os.path.join(output_dir, path)) for entry in selected for path in entry["files"]]
+    if not tables:
+        return pd.DataFrame()
+    results_df = pd.concat(tables, ignore_index=True)
+    if min_dcr is not None:
+        results_df = results_df[results_df[dcr_column] >= min_dcr].reset_index(drop=True)
+    return encode_labels(results_df)
@@ -0,0 +1,190 @@
+from typing import Union, List, Callable
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from timber_nds.settings import (
+    TensionAdjustmentFactors,
+    BendingAdjustmentFactors,
+    ShearAdjustmentFactors,
+    CompressionAdjustmentFactors,
+    PerpendicularAdjustmentFactors,
+    ElasticModulusAdjustmentFactors,
+    RectangularSection,
+    WoodMaterial,
+)
+from timber_nds.calculation import FORCE_COLUMNS, import_robot_bar_forces, robot_force_labels
+from timber_nds.design import (
+    SupportArea,
+    TimeEffect,
+    check_force_table,
+    encode_labels,
+    governing_envelope,
+    _write_atomically,
+)
+
+
+def _concat_results(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    non_empty = [df for df in frames if not df.empty]
+    if not non_empty:
+        return frames[0].iloc[:0]
+    return encode_labels(pd.concat(non_empty, ignore_index=True))
+
+
+class RobotExportWatcher:
+    """
+    Keeps the design results of a Robot force export up to date while it is re-exported.
+
+    Every refresh re-reads the file with import_robot_bar_forces, compares it
+    with the previous version row by row on the (Member, Node, Case, Mode)
+    key and runs check_force_table only on new and changed rows. Results of
+    removed or changed rows are dropped, and the governing envelope is
+    rebuilt only for the members that were touched.
+
+    Args:
+        filepath: Path of the Robot CSV export.
+        list_sections: Sections checked against every force row.
+        output_dir: Directory where results.pkl and envelope.pkl are rewritten
+            after every change; nothing is written when None.
+        support_area: Bearing area used for compression perpendicular to
+            grain: a scalar, or areas keyed by member or Robot node (see
+            row_support_areas). Per-row arrays are rejected because the rows
+            change between exports.
+        time_effect: Load-duration factor per Robot load case, as in
+            check_force_table.
+
+    Assumptions:
+        - The export has one row per (Member, Node, Case, Mode) key.
+        - A file still being written changes size or modification time while
+          it is read, fails to parse, or has rows with an incomplete key; such
+          a read is discarded and retried on the next refresh.
+    """
+
+    def __init__(
+            self,
+            filepath: str,
+            list_sections: Union[List[RectangularSection], RectangularSection],
+            material: WoodMaterial,
+            tension_factors: TensionAdjustmentFactors,
+            bending_factors_yy: BendingAdjustmentFactors,
+            bending_factors_zz: BendingAdjustmentFactors,
+            shear_factors: ShearAdjustmentFactors,
+            compression_factors_yy: CompressionAdjustmentFactors,
+            compression_factors_zz: CompressionAdjustmentFactors,
+            compression_perp_factors: PerpendicularAdjustmentFactors,
+            elastic_modulus_factors: ElasticModulusAdjustmentFactors,
+            output_dir: str = None,
+            support_area: SupportArea = 1.0,
+            time_effect: TimeEffect = None,
+    ):
+        if isinstance(support_area, np.ndarray):
+            raise TypeError("RobotExportWatcher needs a scalar support_area or areas keyed by member or node.")
+        self.filepath = filepath
+        self.list_sections = list_sections if isinstance(list_sections, list) else [list_sections]
+        self.design_inputs = (
+            material, tension_factors, bending_factors_yy, bending_factors_zz, shear_factors,
+            compression_factors_yy, compression_factors_zz, compression_perp_factors, elastic_modulus_factors,
+        )
+        self.output_dir = output_dir
+        self.support_area = support_area
+        self.time_effect = time_effect
+        self.forces = pd.DataFrame(columns=FORCE_COLUMNS, dtype=float)
+        self.results_df = None
+        self.envelope_df = None
+        self._signature = None
+
+    def _file_signature(self) -> tuple:
+        stat = os.stat(self.filepath)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_forces(self) -> tuple:
+        forces_df = import_robot_bar_forces(self.filepath)
+        if forces_df.index.to_frame().isna().to_numpy().any():
+            raise ValueError(f"'{self.filepath}' has rows without a complete Member/Node/Case/Mode key.")
+        labels = pd.Index(robot_force_labels(forces_df).tolist())
+        if labels.has_duplicates:
+            raise ValueError(f"Duplicated Member/Node/Case/Mode keys in '{self.filepath}'.")
+        forces = pd.DataFrame(forces_df[FORCE_COLUMNS].to_numpy(dtype=float), index=labels, columns=FORCE_COLUMNS)
+        return forces_df, forces
+
+    def refresh(self) -> dict:
+        """
+        Re-checks the export if it changed since the last refresh.
+
+        Returns:
+            None when the file is unchanged or still being written, otherwise
+            a dict with the number of added, changed and removed rows.
+        """
+        try:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return None
+            forces_df, forces = self._read_forces()
+            if self._file_signature() != signature:
+                return None
+        except (ValueError, KeyError, OSError):
+            # Half-written or just-replaced export: keep the current results
+            # and signature so the next refresh reads the file again.
+            return None
+        self._signature = signature
+
+        previous = self.forces.reindex(forces.index).to_numpy()
+        current = forces.to_numpy()
+        is_new = ~forces.index.isin(self.forces.index)
+        same = (previous == current) | (np.isnan(previous) & np.isnan(current))
+        is_changed = ~is_new & ~same.all(axis=1)
+        removed = self.forces.index.difference(forces.index)
+        stale = forces.index[is_changed].append(removed)
+        self.forces = forces
+
+        to_check = is_new | is_changed
+        new_results = check_force_table(
+            self.list_sections, forces_df[to_check], *self.design_inputs, support_area=self.support_area,
+            time_effect=self.time_effect,
+        )
+        if self.results_df is None:
+            self.results_df = new_results
+            self.envelope_df = governing_envelope(new_results)
+        else:
+            touched = pd.Index(new_results["member"].unique().tolist()).append(
+                pd.Index(self.results_df.loc[self.results_df["force"].isin(stale), "member"].unique().tolist())
+            ).unique()
+            kept = self.results_df[~self.results_df["force"].isin(stale)]
+            self.results_df = _concat_results([kept, new_results])
+            self.envelope_df = _concat_results([
+                self.envelope_df[~self.envelope_df["member"].isin(touched)],
+                governing_envelope(self.results_df[self.results_df["member"].isin(touched)]),
+            ])
+
+        if self.output_dir is not None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            _write_atomically(self.results_df, os.path.join(self.output_dir, "results.pkl"))
+            _write_atomically(self.envelope_df, os.path.join(self.output_dir, "envelope.pkl"))
+
+        return {"added": int(is_new.sum()), "changed": int(is_changed.sum()), "removed": len(removed)}
+
+    def watch(
+            self,
+            poll_interval: float = 2.0,
+            max_refreshes: int = None,
+            callback: Callable[[dict], None] = None,
+    ):
+        """
+        Polls the export and refreshes the results whenever it changes.
+
+        Args:
+            poll_interval: Seconds between checks of the file.
+            max_refreshes: Stop after this many applied changes; runs until
+                interrupted when None.
+            callback: Called with the change summary after every applied refresh.
+        """
+        refreshes = 0
+        while max_refreshes is None or refreshes < max_refreshes:
+            changes = self.refresh() if os.path.exists(self.filepath) else None
+            if changes is not None:
+                refreshes += 1
+                if callback is not None:
+                    callback(changes)
+                continue
+            time.sleep(poll_interval)
@@ -0,0 +1,26 @@
+import pytest
+
+from timber_nds.settings import (
+    TensionAdjustmentFactors,
+    BendingAdjustmentFactors,
+    ShearAdjustmentFactors,
+    CompressionAdjustmentFactors,
+    PerpendicularAdjustmentFactors,
+    ElasticModulusAdjustmentFactors,
+    WoodMaterial,
+)
+
+
+@pytest.fixture
+def design_inputs():
+    return (
+        WoodMaterial(),
+        TensionAdjustmentFactors(),
+        BendingAdjustmentFactors(),
+        BendingAdjustmentFactors(),
+        ShearAdjustmentFactors(),
+        CompressionAdjustmentFactors(),
+        CompressionAdjustmentFactors(),
+        PerpendicularAdjustmentFactors(),
+        ElasticModulusAdjustmentFactors(),
+    )
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pytest
 
 from timber_nds import (
@@ -8,6 +9,28 @@ from timber_nds import (
     RectangularSectionProperties,
     WeightCalculator
 )
+from timber_nds.calculation import (
+    import_robot_bar_forces,
+    robot_force_labels,
+    create_robot_bar_forces_as_objects,
+    stability_factors,
+    clear_stability_cache,
+    stability_cache_info,
+    MINIMUM_MODULUS_RATIO,
+    STABILITY_COLUMNS,
+    weight_takeoff,
+    takeoff_totals,
+    import_robot_bar_forces_from_files,
+)
+import timber_nds.calculation as calculation
+from timber_nds.settings import (
+    WoodMaterial,
+    RectangularSection,
+    MemberDefinition,
+    BendingAdjustmentFactors,
+    CompressionAdjustmentFactors,
+    ElasticModulusAdjustmentFactors,
+)
 
 
 class MockWoodMaterial:
@@ -69,6 +92,149 @@ class TestWeightCalculator:
         assert isinstance(weight, float)
         assert weight > 0
 
+    def test_accepts_numpy_moisture_content(self, weight_calculator):
+        assert weight_calculator.calculate_weight_at_moisture_content(np.float32(15)) == pytest.approx(
+            weight_calculator.calculate_weight_at_moisture_content(15)
+        )
+
+
+class TestWeightTakeoff:
+
+    def test_matches_weight_calculator_and_totals(self):
+        pine = WoodMaterial(name="Pine", specific_gravity=0.5, fibre_saturation_point=30)
+        oak = WoodMaterial(name="Oak", specific_gravity=0.7, fibre_saturation_point=28)
+        small = RectangularSection(name="Small", depth=20.0, width=5.0)
+        large = RectangularSection(name="Large", depth=30.0, width=10.0)
+        materials = [pine, pine, oak]
+        sections = [small, small, large]
+        elements = [MemberDefinition(name=f"M{i}", length=100.0 * (i + 1)) for i in range(3)]
+        moisture = np.array([12.0, 40.0, 20.0])
+
+        takeoff = weight_takeoff(materials, sections, elements, moisture)
+        expected = [
+            WeightCalculator(material, section, element).calculate_weight_at_moisture_content(mc)
+            for material, section, element, mc in zip(materials, sections, elements, moisture.tolist())
+        ]
+        assert takeoff["weight"].to_numpy() == pytest.approx(expected)
+
+        totals = takeoff_totals(takeoff)
+        assert totals.loc[("Small", "Pine"), "count"] == 2
+        assert totals.loc[("Small", "Pine"), "weight"] == pytest.approx(expected[0] + expected[1])
+        assert totals["weight"].sum() == pytest.approx(sum(expected))
+
+    def test_rejects_negative_moisture(self):
+        with pytest.raises(ValueError, match="non-negative"):
+            weight_takeoff(WoodMaterial(), RectangularSection(), [MemberDefinition()], -1.0)
+
+
+@pytest.fixture
+def robot_csv(tmp_path):
+    filepath = tmp_path / "forces.csv"
+    filepath.write_text(
+        "Bar/Node/Case;FX (kgf);FY (kgf);FZ (kgf);MX (kgfcm);MY (kgfcm);MZ (kgfcm)\n"
+        "1 1 1 (C);1,5;2;3;4;5;6\n"
+        "1 2 1 (C);-1000,5;2;3;4;5;6\n"
+        "2 3 2 (C);1.000,5;2;3;4;5;6\n"
+    )
+    return str(filepath)
+
+
+class TestRobotBarForces:
+
+    def test_import_robot_bar_forces_uses_categorical_levels(self, robot_csv):
+        df = import_robot_bar_forces(robot_csv)
+        assert list(df.index.names) == ["Member", "Node", "Case", "Mode"]
+        assert df.index.get_level_values("Member").dtype == "category"
+        assert df["axial"].tolist() == [1.5, -1000.5, 1000.5]
+
+    @pytest.mark.parametrize("use_processes", [False, True])
+    def test_import_many_files_concurrently(self, tmp_path, robot_csv, use_processes):
+        second = tmp_path / "forces_2.csv"
+        second.write_text(
+            "Bar/Node/Case;FX (kgf);FY (kgf);FZ (kgf);MX (kgfcm);MY (kgfcm);MZ (kgfcm)\n"
+            "7 9 3 (C);10;0;0;0;0;0\n"
+        )
+        df = import_robot_bar_forces_from_files(
+            str(tmp_path / "forces*.csv"), max_workers=2, use_processes=use_processes
+        )
+        assert df["source_file"].tolist() == [robot_csv] * 3 + [str(second)]
+        assert df["source_file"].dtype == "category"
+        assert df.index.get_level_values("Member").dtype == "category"
+        assert df["axial"].tolist() == [1.5, -1000.5, 1000.5, 10.0]
+        assert list(robot_force_labels(df))[-1] == "7/9/3/(C)"
+
+    def test_force_labels_and_objects(self, robot_csv):
+        df = import_robot_bar_forces(robot_csv)
+        labels = robot_force_labels(df)
+        assert list(labels) == ["1/1/1/(C)", "1/2/1/(C)", "2/3/2/(C)"]
+
+        forces = create_robot_bar_forces_as_objects(df)
+        assert [force.name for force in forces] == list(labels)
+        assert forces[1].axial == -1000.5
+        assert forces[2].moment_xx == 4
+
+
+class TestStabilityFactors:
+
+    def test_matches_nds_equations_and_uses_cache(self):
+        clear_stability_cache()
+        material = WoodMaterial()
+        sections = [RectangularSection("2x6", depth=14.0, width=3.8), RectangularSection("6x2", depth=3.8, width=14.0)]
+        elements = [MemberDefinition("M1", length=300.0), MemberDefinition("M2", length=300.0)]
+        arguments = (
+            material, BendingAdjustmentFactors(), BendingAdjustmentFactors(), CompressionAdjustmentFactors(),
+            CompressionAdjustmentFactors(), ElasticModulusAdjustmentFactors(),
+        )
+        factors = stability_factors(sections, elements, *arguments)
+        assert len(factors) == 4
+
+        minimum_modulus = material.elastic_modulus * MINIMUM_MODULUS_RATIO * 1.76 * 0.85
+        ratio = 0.822 * minimum_modulus / (300.0 / 14.0) ** 2 / (material.compression_parallel_strength * 2.40 * 0.90)
+        column_stability = (1 + ratio) / 1.6 - ((((1 + ratio) / 1.6) ** 2) - ratio / 0.8) ** 0.5
+        first = factors.iloc[0]
+        assert first["column_stability_yy"] == pytest.approx(column_stability)
+        assert first["beam_stability_zz"] == 1.0
+        assert 0 < first["beam_stability_yy"] < 1
+        assert factors.iloc[1]["beam_stability_yy"] == 1.0
+
+        assert stability_cache_info() == {"factor_sets": 1, "rows": [2]}
+        again = stability_factors(sections, elements[:1] + [MemberDefinition("M3", length=150.0)], *arguments)
+        assert again.iloc[0]["column_stability_yy"] == first["column_stability_yy"]
+        assert stability_cache_info() == {"factor_sets": 1, "rows": [4]}
+
+    def test_cache_is_bounded(self, monkeypatch):
+        clear_stability_cache()
+        monkeypatch.setattr(calculation, "STABILITY_CACHE_SIZE", 2)
+        monkeypatch.setattr(calculation, "STABILITY_CACHE_ROWS", 3)
+        sections = [RectangularSection("2x6", depth=14.0, width=3.8)]
+        elements = [MemberDefinition(f"M{i}", length=100.0 + i) for i in range(5)]
+        for modulus in (100000.0, 110000.0, 120000.0):
+            factors = stability_factors(
+                sections, elements, WoodMaterial(elastic_modulus=modulus), BendingAdjustmentFactors(),
+                BendingAdjustmentFactors(), CompressionAdjustmentFactors(), CompressionAdjustmentFactors(),
+                ElasticModulusAdjustmentFactors(),
+            )
+            assert factors[STABILITY_COLUMNS].notna().all().all()
+        assert stability_cache_info() == {"factor_sets": 2, "rows": [3, 3]}
+
+    def test_zero_stability_factors_do_not_give_nan(self):
+        clear_stability_cache()
+        factors = stability_factors(
+            RectangularSection("2x6", depth=14.0, width=3.8), MemberDefinition("M1", length=300.0), WoodMaterial(),
+            BendingAdjustmentFactors(due_beam_stability=0.0), BendingAdjustmentFactors(),
+            CompressionAdjustmentFactors(due_column_stability=0.0), CompressionAdjustmentFactors(),
+            ElasticModulusAdjustmentFactors(),
+        )
+        assert factors[STABILITY_COLUMNS].notna().all().all()
+
+    def test_rejects_non_positive_length(self):
+        with pytest.raises(ValueError, match="must be positive"):
+            stability_factors(
+                RectangularSection("2x6", depth=14.0, width=3.8), MemberDefinition("M1", length=0.0), WoodMaterial(),
+                BendingAdjustmentFactors(), BendingAdjustmentFactors(), CompressionAdjustmentFactors(),
+                CompressionAdjustmentFactors(), ElasticModulusAdjustmentFactors(),
+            )
+
 
 class TestStructuralFunctions(unittest.TestCase):
     def test_effective_length(self):
@@ -1,8 +1,34 @@
+import dataclasses
+import os
+
+import numpy as np
+import pandas as pd
 import pytest
 
+import timber_nds.design as design
 from timber_nds.design import (
     WoodElementCalculator,
     calculate_dcr_for_wood_elements,
+    check_for_all_elements,
+    check_for_all_forces,
+    check_for_all_sections,
+    check_force_table,
+    decode_labels,
+    DCR_OUTPUT_COLUMNS,
+    GOVERNING_DCR_COLUMNS,
+    calculate_dcr_arrays,
+    calculate_section_capacities,
+    sweep_adjustment_factors,
+    iter_check_force_table,
+    iter_check_for_all_elements,
+    check_for_all_elements_within_budget,
+    governing_envelope,
+    validate_design_inputs,
+    force_values_mask,
+    check_assigned_sections,
+    row_support_areas,
+    row_time_effects,
+    required_section_sizes,
 )
 from timber_nds.settings import (
     TensionAdjustmentFactors,
@@ -16,7 +42,7 @@ from timber_nds.settings import (
     WoodMaterial,
     Forces,
 )
-from timber_nds.calculation import RectangularSectionProperties
+from timber_nds.calculation import RectangularSectionProperties, forces_to_frame, stability_factors
 
 
 @pytest.fixture
@@ -271,3 +297,485 @@ class TestCalculateDcrForWoodElements:
                 elastic_modulus_factors=elastic_modulus_factors,
                 support_area=1.0
             )
+
+
+class TestResultLabels:
+    def test_check_for_all_elements_labels_are_categorical(
+        self, sample_section, sample_element, sample_forces, sample_material, sample_factors
+    ):
+        results = check_for_all_elements(
+            [sample_section], [sample_element], [sample_forces, sample_forces], sample_material,
+            *sample_factors, support_area_values={},
+        )
+        assert len(results) == 2
+        for column in ("member", "section", "force"):
+            assert results[column].dtype == "category"
+        assert list(results["section"].cat.categories) == ["Test Section"]
+
+        decoded = decode_labels(results)
+        assert decoded["member"].dtype == object
+        assert decoded["member"].tolist() == ["Test Element", "Test Element"]
+
+
+@pytest.fixture
+def sample_force_list():
+    return [
+        Forces(name="compression", axial=100.0, shear_y=50.0, shear_z=30.0, moment_yy=20.0, moment_zz=15.0),
+        Forces(name="tension", axial=-80.0, shear_y=-5.0, shear_z=-40.0, moment_yy=-200.0),
+        Forces(name="zero"),
+    ]
+
+
+class TestCheckForceTable:
+    def test_matches_check_for_all_forces(
+        self, sample_section, sample_element, sample_force_list, sample_material, sample_factors
+    ):
+        expected = check_for_all_forces(
+            sample_section, sample_element, sample_force_list, sample_material, *sample_factors, support_area=2.0
+        )
+        results = check_force_table(
+            [sample_section], forces_to_frame(sample_force_list), sample_material, *sample_factors,
+            support_area=2.0, element=sample_element,
+        )
+        assert results.columns.tolist() == ["member", "section", "force"] + DCR_OUTPUT_COLUMNS
+        assert results["force"].tolist() == ["compression", "tension", "zero"]
+        for column in DCR_OUTPUT_COLUMNS:
+            assert results[column].to_numpy() == pytest.approx(expected[column].to_numpy())
+
+    def test_chunks_concatenate_to_full_table(
+        self, sample_section, member_force_table, sample_material, sample_factors
+    ):
+        sections = [sample_section, RectangularSection(name="Deep Section", depth=40.0, width=10.0)]
+        expected = check_force_table(sections, member_force_table, sample_material, *sample_factors)
+        chunks = list(iter_check_force_table(
+            sections, member_force_table, sample_material, *sample_factors, chunk_size=4
+        ))
+        assert [len(chunk) for chunk in chunks] == [4, 2, 4, 2]
+        assert list(chunks[-1]["section"].cat.categories) == ["Test Section", "Deep Section"]
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+    def test_requires_member_labels(self, sample_section, sample_force_list, sample_material, sample_factors):
+        with pytest.raises(ValueError, match="no 'Member' level"):
+            check_force_table(sample_section, forces_to_frame(sample_force_list), sample_material, *sample_factors)
+
+
+class TestCheckpointResume:
+    def test_resume_skips_completed_sections(
+        self, tmp_path, monkeypatch, sample_section, sample_element, sample_force_list, sample_material,
+        sample_factors
+    ):
+        sections = [sample_section, RectangularSection(name="Deep Section", depth=40.0, width=10.0)]
+        checkpoint_dir = str(tmp_path / "checkpoint")
+        expected = check_for_all_sections(
+            sections, sample_element, sample_force_list, sample_material, *sample_factors, 1.0,
+            checkpoint_dir=checkpoint_dir,
+        )
+        assert len(expected) == 6
+
+        def fail(*args, **kwargs):
+            raise AssertionError("completed sections must not be recomputed")
+
+        monkeypatch.setattr(design, "check_for_all_forces", fail)
+        resumed = check_for_all_sections(
+            sections, sample_element, sample_force_list, sample_material, *sample_factors, 1.0,
+            checkpoint_dir=checkpoint_dir, resume=True,
+        )
+        pd.testing.assert_frame_equal(resumed, expected)
+
+    def test_resume_within_a_section(
+        self, tmp_path, monkeypatch, sample_section, sample_element, sample_force_list, sample_material,
+        sample_factors
+    ):
+        checkpoint_dir = str(tmp_path / "checkpoint")
+        expected = check_for_all_sections(
+            sample_section, sample_element, sample_force_list, sample_material, *sample_factors, 1.0,
+        )
+        original = design.check_for_all_forces
+        checked = []
+
+        def interrupted(*args, list_forces, **kwargs):
+            checked.append([force.name for force in list_forces])
+            if list_forces[0].name == "zero":
+                raise KeyboardInterrupt
+            return original(*args, list_forces=list_forces, **kwargs)
+
+        monkeypatch.setattr(design, "check_for_all_forces", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            check_for_all_sections(
+                sample_section, sample_element, sample_force_list, sample_material, *sample_factors, 1.0,
+                checkpoint_dir=checkpoint_dir, checkpoint_every=2,
+            )
+        assert sorted(os.listdir(checkpoint_dir)) == ["manifest.json", "section_000000_chunk_000000.pkl"]
+
+        def counting(*args, list_forces, **kwargs):
+            checked.append([force.name for force in list_forces])
+            return original(*args, list_forces=list_forces, **kwargs)
+
+        checked.clear()
+        monkeypatch.setattr(design, "check_for_all_forces", counting)
+        resumed = check_for_all_sections(
+            sample_section, sample_element, sample_force_list, sample_material, *sample_factors, 1.0,
+            checkpoint_dir=checkpoint_dir, resume=True, checkpoint_every=2,
+        )
+        assert checked == [["zero"]]
+        pd.testing.assert_frame_equal(resumed, expected)
+
+    def test_resume_rejects_changed_inputs(
+        self, tmp_path, sample_section, sample_element, sample_force_list, sample_material, sample_factors
+    ):
+        checkpoint_dir = str(tmp_path / "checkpoint")
+        check_for_all_sections(
+            sample_section, sample_element, sample_force_list, sample_material, *sample_factors, 1.0,
+            checkpoint_dir=checkpoint_dir,
+        )
+        with pytest.raises(ValueError, match="inputs changed"):
+            check_for_all_sections(
+                sample_section, sample_element, sample_force_list, sample_material, *sample_factors, 2.0,
+                checkpoint_dir=checkpoint_dir, resume=True,
+            )
+
+
+class TestCalculateDcrArrays:
+    def test_tiled_float32_kernel_writes_into_out(self, sample_section, sample_force_list, sample_material, sample_factors):
+        capacities = calculate_section_capacities(sample_section, sample_material, *sample_factors).to_numpy()[0]
+        forces = forces_to_frame(sample_force_list * 5).to_numpy()
+        expected = calculate_dcr_arrays(forces, capacities)
+
+        out = np.empty((len(forces), len(DCR_OUTPUT_COLUMNS)), dtype=np.float32)
+        result = calculate_dcr_arrays(forces, capacities, out=out, chunk_size=4)
+        assert result is out
+        assert result == pytest.approx(expected, rel=1e-6)
+
+        per_row = calculate_dcr_arrays(forces, np.tile(capacities, (len(forces), 1)), chunk_size=7)
+        assert per_row == pytest.approx(expected)
+
+    def test_zero_capacity_gives_zero_dcr(self, sample_force_list):
+        dcr = calculate_dcr_arrays(forces_to_frame(sample_force_list).to_numpy(), np.zeros(6))
+        assert (dcr == 0).all()
+
+
+@pytest.fixture
+def member_force_table(sample_force_list):
+    forces_df = forces_to_frame(sample_force_list * 2)
+    forces_df.index = pd.MultiIndex.from_arrays(
+        [["A", "A", "A", "B", "B", "B"], [str(i) for i in range(6)], ["1", "2", "3"] * 2, ["(C)"] * 6],
+        names=["Member", "Node", "Case", "Mode"],
+    )
+    forces_df.iloc[3:] *= 3
+    return forces_df
+
+
+class TestSweepAdjustmentFactors:
+    def test_sweep_matches_rebuilt_factors(self, sample_section, member_force_table, sample_material, sample_factors):
+        sweep = {"tension_factors": {"due_moisture": [0.5, 1.0]}, "shear_factors": {"due_time_effect": [0.8, 1.0]}}
+        results = sweep_adjustment_factors(
+            sample_section, member_force_table, sample_material, *sample_factors, sweep=sweep
+        )
+        assert results.index.names == ["scenario", "member"]
+        assert len(results) == 4
+        assert results["tension_factors.due_moisture"].tolist() == [0.5, 0.5, 1.0, 1.0]
+
+        factors = list(sample_factors)
+        factors[0] = TensionAdjustmentFactors(due_moisture=0.5, due_format_conversion=1.0, due_resistance_reduction=1.0)
+        factors[3] = ShearAdjustmentFactors(due_time_effect=0.8, due_format_conversion=1.0, due_resistance_reduction=1.0)
+        expected = check_force_table(sample_section, member_force_table, sample_material, *factors)
+        expected = expected.groupby("member", observed=True)[DCR_OUTPUT_COLUMNS].max()
+        np.testing.assert_allclose(results.loc[0, DCR_OUTPUT_COLUMNS].to_numpy(), expected.to_numpy())
+        assert results.loc[(0, "B"), "tension (dcr)"] == pytest.approx(2 * results.loc[(1, "B"), "tension (dcr)"])
+
+    def test_rejects_unknown_fields(self, sample_section, member_force_table, sample_material, sample_factors):
+        with pytest.raises(ValueError, match="has no field"):
+            sweep_adjustment_factors(
+                sample_section, member_force_table, sample_material, *sample_factors,
+                sweep={"tension_factors": {"due_flat_use": [1.0]}},
+            )
+
+    def test_scalar_values_and_mismatched_lengths(
+        self, sample_section, member_force_table, sample_material, sample_factors
+    ):
+        results = sweep_adjustment_factors(
+            sample_section, member_force_table, sample_material, *sample_factors,
+            sweep={"tension_factors": {"due_moisture": 0.85}},
+        )
+        assert results["tension_factors.due_moisture"].tolist() == [0.85, 0.85]
+        with pytest.raises(ValueError, match="same length"):
+            sweep_adjustment_factors(
+                sample_section, member_force_table, sample_material, *sample_factors,
+                sweep={"tension_factors": {"due_moisture": [0.5, 1.0]}, "shear_factors": {"due_time_effect": 0.8}},
+            )
+
+
+class TestMemoryBudget:
+    def test_chunks_match_check_for_all_elements(
+        self, sample_section, sample_force_list, sample_material, sample_factors
+    ):
+        sections = [sample_section, RectangularSection(name="Deep Section", depth=40.0, width=10.0)]
+        elements = [MemberDefinition(name="E1", length=100.0), MemberDefinition(name="E2", length=50.0)]
+        forces = sample_force_list + [
+            Forces(name="t", axial=1000.0, shear_y=500.0),
+            Forces(name="c", axial=-1000.0, moment_yy=3000.0),
+        ]
+        chunks = list(iter_check_for_all_elements(
+            sections, elements, forces, sample_material, *sample_factors,
+            support_area_values={"E2": 3.0}, chunk_rows=7,
+        ))
+        assert [len(chunk) for chunk in chunks] == [7, 7, 6]
+        results = pd.concat(chunks, ignore_index=True)
+
+        expected = check_for_all_elements(
+            sections, elements, forces, sample_material, *sample_factors, support_area_values={"E2": 3.0},
+        )
+        dcr_columns = [column for column in expected.columns if column.endswith("(dcr)")]
+        assert results.columns.tolist() == expected.columns.tolist() + ["dcr_max"]
+        for column in ("member", "section", "force"):
+            assert results[column].tolist() == expected[column].tolist()
+        np.testing.assert_allclose(results[dcr_columns].to_numpy(), expected[dcr_columns].to_numpy())
+        np.testing.assert_allclose(results["dcr_max"], expected[GOVERNING_DCR_COLUMNS].max(axis=1))
+
+    def test_budget_envelope_and_consumer(
+        self, sample_section, sample_force_list, sample_material, sample_factors
+    ):
+        elements = [MemberDefinition(name="E1"), MemberDefinition(name="E2")]
+        forces = sample_force_list * 50
+        full = pd.concat(iter_check_for_all_elements(
+            sample_section, elements, forces, sample_material, *sample_factors
+        ), ignore_index=True)
+
+        envelope, report = check_for_all_elements_within_budget(
+            sample_section, elements, forces, sample_material, *sample_factors, max_memory=2 ** 20,
+            trace_memory=True,
+        )
+        assert report["rows"] == 300
+        assert 0 < report["traced_peak_memory"] and 0 < report["estimated_peak_memory"] <= 2 ** 20
+        assert report["peak_memory"] > report["traced_peak_memory"]
+        pd.testing.assert_frame_equal(envelope, governing_envelope(full))
+
+        chunks = []
+        envelope, report = check_for_all_elements_within_budget(
+            sample_section, elements, forces, sample_material, *sample_factors, consumer=chunks.append,
+        )
+        assert envelope is None
+        assert report["chunks"] == len(chunks) == 1
+        assert report["traced_peak_memory"] is None
+        assert report["peak_memory"] > 0
+        pd.testing.assert_frame_equal(chunks[0], full)
+
+    def test_rejects_too_small_budget(self, sample_section, sample_force_list, sample_material, sample_factors):
+        with pytest.raises(ValueError, match="too small"):
+            check_for_all_elements_within_budget(
+                sample_section, MemberDefinition(name="E1"), sample_force_list, sample_material, *sample_factors,
+                max_memory=10,
+            )
+
+
+class TestValidateDesignInputs:
+    def test_reports_every_problem_once(self, sample_section, sample_material, sample_factors):
+        forces = [
+            Forces(name="ok", axial=10.0),
+            Forces(name="nan", axial=float("nan"), moment_yy=float("inf")),
+            "not a force",
+        ]
+        sections = [sample_section, RectangularSection(name="Flat", depth=10.0, width=0.0)]
+        material = WoodMaterial(tension_strength=0.0)
+
+        report = validate_design_inputs(sections, forces, material, *sample_factors)
+        assert report.columns.tolist() == ["input", "label", "field", "problem"]
+        problems = set(map(tuple, report[["input", "label", "field"]].to_numpy()))
+        assert ("force", "nan", "axial") in problems
+        assert ("force", "nan", "moment_yy") in problems
+        assert ("section", "Flat", "width") in problems
+        assert ("material", material.name, "tension_strength") in problems
+        assert ("capacity", "Test Section", "tension") in problems
+        assert report["label"].eq("ok").sum() == 0
+        assert force_values_mask(forces).any(axis=1).tolist() == [False, True, True]
+
+    def test_valid_inputs_give_empty_report(self, sample_section, sample_force_list, sample_material, sample_factors):
+        assert validate_design_inputs(sample_section, sample_force_list, sample_material, *sample_factors).empty
+
+    def test_check_for_all_forces_skips_invalid_rows(
+        self, sample_section, sample_element, sample_force_list, sample_material, sample_factors
+    ):
+        forces = sample_force_list + [Forces(name="bad", shear_y=float("nan"))]
+        results = check_for_all_forces(
+            sample_section, sample_element, forces, sample_material, *sample_factors, support_area=1.0
+        )
+        assert results["force"].tolist() == ["compression", "tension", "zero"]
+
+    def test_numeric_strings_are_rejected_not_coerced(self, sample_section, sample_material, sample_factors):
+        forces = [Forces(name="ok", axial=5.0), Forces(name="text", axial="5")]
+        assert force_values_mask(forces).any(axis=1).tolist() == [False, True]
+        report = validate_design_inputs(sample_section, forces, sample_material, *sample_factors)
+        assert report[["label", "field"]].values.tolist() == [["text", "axial"]]
+
+    def test_one_bad_row_does_not_drop_the_section(
+        self, sample_section, sample_element, sample_force_list, sample_material, sample_factors, capsys
+    ):
+        factors = list(sample_factors)
+        factors[1] = dataclasses.replace(factors[1], due_size=0.0)
+        forces = sample_force_list + [Forces(name="text", axial="5")]
+        results = check_for_all_sections(
+            [sample_section], sample_element, forces, sample_material, *factors, support_area=1.0
+        )
+        assert results["force"].tolist() == ["compression", "tension", "zero"]
+        # Only the zz term remains, so the biaxial DCR gives back the zz capacity.
+        bending_capacity_zz = abs(sample_force_list[0].moment_zz) / results["biaxial bending (dcr)"].iloc[0]
+        assert np.isfinite(bending_capacity_zz) and bending_capacity_zz > 0
+        assert "capacity 'Test Section', bending_yy: must be a positive finite number" in capsys.readouterr().out
+
+    def test_check_for_all_elements_skips_non_finite_forces(
+        self, sample_section, sample_force_list, sample_material, sample_factors
+    ):
+        forces = sample_force_list + [Forces(name="bad", axial=float("inf"))]
+        results = check_for_all_elements(
+            [sample_section], [MemberDefinition(name="E1")], forces, sample_material, *sample_factors,
+            support_area_values={},
+        )
+        assert results["force"].tolist() == ["compression", "tension", "zero"]
+
+
+class TestStabilityInTableChecks:
+    def test_member_factors_replace_the_constant_ones(
+        self, sample_section, member_force_table, sample_material, sample_factors
+    ):
+        sections = [sample_section, RectangularSection(name="Deep Section", depth=40.0, width=10.0)]
+        elements = [MemberDefinition(name="A", length=300.0), MemberDefinition(name="B", length=120.0)]
+        tension, bending_yy, bending_zz, shear, compression_yy, compression_zz, perp, elastic = sample_factors
+        stability = stability_factors(
+            sections, elements, sample_material, bending_yy, bending_zz, compression_yy, compression_zz, elastic
+        )
+        results = check_force_table(sections, member_force_table, sample_material, *sample_factors, stability=stability)
+        chunks = pd.concat(iter_check_force_table(
+            sections, member_force_table, sample_material, *sample_factors, chunk_size=4, stability=stability,
+        ), ignore_index=True)
+        pd.testing.assert_frame_equal(chunks, results)
+
+        for row in stability.itertuples():
+            section = next(section for section in sections if section.name == row.section)
+            expected = check_force_table(
+                section, member_force_table, sample_material, tension,
+                dataclasses.replace(bending_yy, due_beam_stability=row.beam_stability_yy),
+                dataclasses.replace(bending_zz, due_beam_stability=row.beam_stability_zz),
+                shear,
+                dataclasses.replace(compression_yy, due_column_stability=row.column_stability_yy),
+                dataclasses.replace(compression_zz, due_column_stability=row.column_stability_zz),
+                perp, elastic,
+            )
+            expected = expected[expected["member"] == row.member]
+            actual = results[(results["member"] == row.member) & (results["section"] == row.section)]
+            np.testing.assert_allclose(actual[DCR_OUTPUT_COLUMNS].to_numpy(), expected[DCR_OUTPUT_COLUMNS].to_numpy())
+
+        constant = check_force_table(sections, member_force_table, sample_material, *sample_factors)
+        assert (results["compression (dcr)"] > constant["compression (dcr)"]).any()
+
+    def test_requires_every_pair(self, sample_section, member_force_table, sample_material, sample_factors):
+        stability = stability_factors(
+            sample_section, MemberDefinition(name="A", length=300.0), sample_material,
+            *[sample_factors[i] for i in (1, 2, 4, 5, 7)],
+        )
+        with pytest.raises(ValueError, match="No stability factors"):
+            check_force_table(sample_section, member_force_table, sample_material, *sample_factors, stability=stability)
+
+
+class TestCheckAssignedSections:
+    def test_matches_each_member_against_its_section(
+        self, sample_section, member_force_table, sample_material, sample_factors
+    ):
+        deep = RectangularSection(name="Deep Section", depth=40.0, width=10.0)
+        results = check_assigned_sections(
+            {"A": sample_section, "B": deep}, member_force_table, sample_material, *sample_factors
+        )
+        assert len(results) == len(member_force_table)
+        assert results["section"].tolist() == ["Test Section"] * 3 + ["Deep Section"] * 3
+
+        full = check_force_table([sample_section, deep], member_force_table, sample_material, *sample_factors)
+        expected = pd.concat([
+            full[(full["member"] == "A") & (full["section"] == "Test Section")],
+            full[(full["member"] == "B") & (full["section"] == "Deep Section")],
+        ])
+        np.testing.assert_allclose(results[DCR_OUTPUT_COLUMNS].to_numpy(), expected[DCR_OUTPUT_COLUMNS].to_numpy())
+
+    def test_requires_every_member_assigned(self, sample_section, member_force_table, sample_material, sample_factors):
+        with pytest.raises(ValueError, match=r"\['B'\] have no assigned section"):
+            check_assigned_sections({"A": sample_section}, member_force_table, sample_material, *sample_factors)
+
+
+class TestPerMemberSupportAreas:
+    def test_member_and_node_areas(self, sample_section, member_force_table, sample_material, sample_factors):
+        areas = row_support_areas(member_force_table, {"B": 4.0})
+        assert areas.tolist() == [1.0, 1.0, 1.0, 4.0, 4.0, 4.0]
+        node_areas = pd.Series({"0": 2.0, "5": 3.0}).rename_axis("Node")
+        assert row_support_areas(member_force_table, node_areas).tolist() == [2.0, 1.0, 1.0, 1.0, 1.0, 3.0]
+
+        results = check_force_table(
+            sample_section, member_force_table, sample_material, *sample_factors, support_area={"B": 4.0}
+        )
+        for member, area in (("A", 1.0), ("B", 4.0)):
+            expected = check_force_table(
+                sample_section, member_force_table, sample_material, *sample_factors, support_area=area
+            )
+            np.testing.assert_allclose(
+                results.loc[results["member"] == member, DCR_OUTPUT_COLUMNS].to_numpy(),
+                expected.loc[expected["member"] == member, DCR_OUTPUT_COLUMNS].to_numpy(),
+            )
+
+        chunks = iter_check_force_table(
+            sample_section, member_force_table, sample_material, *sample_factors, support_area={"B": 4.0},
+            chunk_size=4,
+        )
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), results)
+
+        assigned = check_assigned_sections(
+            {"A": sample_section, "B": sample_section}, member_force_table, sample_material, *sample_factors,
+            support_area={"B": 4.0},
+        )
+        np.testing.assert_allclose(assigned[DCR_OUTPUT_COLUMNS].to_numpy(), results[DCR_OUTPUT_COLUMNS].to_numpy())
+
+
+class TestTimeEffectPerCase:
+    def test_matches_runs_with_replaced_factors(
+        self, sample_section, member_force_table, sample_material, sample_factors
+    ):
+        time_effect = {"1": 0.9, "2": 1.25}
+        assert np.isnan(row_time_effects(member_force_table, time_effect)).tolist() == [False, False, True] * 2
+
+        results = check_force_table(
+            sample_section, member_force_table, sample_material, *sample_factors, time_effect=time_effect
+        )
+        case_rows = member_force_table.index.get_level_values("Case")
+        for case, factor in (("1", 0.9), ("2", 1.25), ("3", None)):
+            factors = sample_factors if factor is None else [
+                dataclasses.replace(f, due_time_effect=factor) if hasattr(f, "due_time_effect") else f
+                for f in sample_factors
+            ]
+            expected = check_force_table(sample_section, member_force_table, sample_material, *factors)
+            np.testing.assert_allclose(
+                results.loc[case_rows == case, DCR_OUTPUT_COLUMNS].to_numpy(),
+                expected.loc[case_rows == case, DCR_OUTPUT_COLUMNS].to_numpy(),
+            )
+
+        chunks = iter_check_force_table(
+            sample_section, member_force_table, sample_material, *sample_factors, chunk_size=4,
+            time_effect=time_effect,
+        )
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), results)
+
+    def test_rejects_non_positive_factors(self, member_force_table):
+        with pytest.raises(ValueError, match="must be positive"):
+            row_time_effects(member_force_table, {"1": 0.0})
+
+
+class TestRequiredSectionSizes:
+    def test_required_depth_brings_dcr_max_to_one(self, member_force_table, sample_material, sample_factors):
+        catalog = [RectangularSection(name=f"5x{depth}", depth=float(depth), width=5.0) for depth in (10, 40, 80)]
+        sizes = required_section_sizes(member_force_table, 5.0, sample_material, *sample_factors, catalog=catalog)
+        assert sizes.index.tolist() == ["A", "B"]
+
+        for member, row in sizes.iterrows():
+            section = RectangularSection(name="sized", depth=row["required_depth"], width=5.0)
+            results = check_force_table(section, member_force_table, sample_material, *sample_factors)
+            governing = results.loc[results["member"] == member, row["governing"]].max()
+            assert governing == pytest.approx(1.0)
+            assert results.loc[results["member"] == member, "dcr_max"].max() == pytest.approx(1.0)
+            snapped = [section for section in catalog if section.name == row["section"]]
+            assert not snapped or snapped[0].depth >= row["required_depth"]
+        assert sizes.loc["B", "required_depth"] > sizes.loc["A", "required_depth"]
@@ -0,0 +1,101 @@
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from timber_nds.settings import RectangularSection
+from timber_nds.calculation import FORCE_COLUMNS, ROBOT_INDEX_LEVELS
+from timber_nds.design import check_force_table, governing_envelope
+from timber_nds.parallel import (
+    check_force_table_parallel,
+    member_shards,
+    write_force_shards,
+    run_shard,
+    merge_shard_results,
+)
+
+
+@pytest.fixture
+def robot_forces():
+    rng = np.random.default_rng(0)
+    n_rows = 50
+    index = pd.MultiIndex.from_arrays(
+        [
+            pd.Categorical([str(i % 7) for i in range(n_rows)]),
+            pd.Categorical([str(i) for i in range(n_rows)]),
+            pd.Categorical([str(i % 3 + 1) for i in range(n_rows)]),
+            pd.Categorical(["(C)"] * n_rows),
+        ],
+        names=ROBOT_INDEX_LEVELS,
+    )
+    return pd.DataFrame(rng.normal(0, 500, size=(n_rows, len(FORCE_COLUMNS))), index=index, columns=FORCE_COLUMNS)
+
+
+@pytest.fixture
+def sections():
+    return [RectangularSection("S1", depth=8.9, width=3.8), RectangularSection("S2", depth=14.0, width=3.8)]
+
+
+class TestCheckForceTableParallel:
+    def test_matches_serial_results(self, sections, robot_forces, design_inputs):
+        expected = check_force_table(sections, robot_forces, *design_inputs)
+        results = check_force_table_parallel(sections, robot_forces, *design_inputs, processes=2, chunk_size=16)
+        pd.testing.assert_frame_equal(results, expected)
+
+    def test_per_member_support_areas(self, sections, robot_forces, design_inputs):
+        support_area = {"0": 2.0, "3": 0.5}
+        expected = check_force_table(sections, robot_forces, *design_inputs, support_area=support_area)
+        results = check_force_table_parallel(
+            sections, robot_forces, *design_inputs, support_area=support_area, processes=2, chunk_size=16
+        )
+        pd.testing.assert_frame_equal(results, expected)
+
+    def test_per_case_time_effects(self, tmp_path, sections, robot_forces, design_inputs):
+        time_effect = {"1": 0.9, "2": 1.15}
+        expected = check_force_table(
+            sections, robot_forces, *design_inputs, support_area={"0": 2.0}, time_effect=time_effect
+        )
+        results = check_force_table_parallel(
+            sections, robot_forces, *design_inputs, support_area={"0": 2.0}, time_effect=time_effect,
+            processes=2, chunk_size=16,
+        )
+        pd.testing.assert_frame_equal(results, expected)
+        assert not np.allclose(results["dcr_max"], check_force_table(sections, robot_forces, *design_inputs)["dcr_max"])
+
+        shard_path = str(tmp_path / "shard.pkl")
+        robot_forces.to_pickle(shard_path)
+        run_shard(
+            shard_path, str(tmp_path / "results.pkl"), sections, *design_inputs,
+            support_area={"0": 2.0}, time_effect=time_effect,
+        )
+        pd.testing.assert_frame_equal(pd.read_pickle(tmp_path / "results.pkl"), expected)
+
+
+class TestShardedRuns:
+    def test_shards_are_deterministic_by_member(self, robot_forces):
+        shards = member_shards(robot_forces, 3)
+        assert (shards == member_shards(robot_forces, 3)).all()
+        members = robot_forces.index.get_level_values("Member")
+        assert pd.Series(shards).groupby(np.asarray(members)).nunique().max() == 1
+
+    def test_run_and_merge_in_separate_processes(self, tmp_path, sections, robot_forces, design_inputs):
+        shard_paths = write_force_shards(robot_forces, 3, str(tmp_path / "shards"))
+        result_paths = [str(tmp_path / f"results_{i}.pkl") for i in range(len(shard_paths))]
+        with get_context().Pool(processes=3) as pool:
+            pool.starmap(
+                run_shard,
+                [(shard, result, sections, *design_inputs) for shard, result in zip(shard_paths, result_paths)],
+            )
+
+        expected = check_force_table(sections, robot_forces, *design_inputs)
+        merged = merge_shard_results(result_paths)
+        key = ["section", "force"]
+        pd.testing.assert_frame_equal(
+            merged.astype({"member": str, "section": str, "force": str}).sort_values(key).reset_index(drop=True),
+            expected.astype({"member": str, "section": str, "force": str}).sort_values(key).reset_index(drop=True),
+        )
+
+        envelope = merge_shard_results(result_paths, envelope=True)
+        assert len(envelope) == len(governing_envelope(expected))
+        assert envelope["dcr_max"].max() == pytest.approx(expected["dcr_max"].max())
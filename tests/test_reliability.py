@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from timber_nds.settings import RectangularSection, MaterialVariability
+from timber_nds.calculation import FORCE_COLUMNS, ROBOT_INDEX_LEVELS
+from timber_nds.design import check_force_table
+from timber_nds.reliability import StreamingMemberStatistics, monte_carlo_member_reliability
+
+
+@pytest.fixture
+def robot_forces():
+    rng = np.random.default_rng(1)
+    n_rows = 30
+    index = pd.MultiIndex.from_arrays(
+        [[f"M{i % 4}" for i in range(n_rows)], [str(i) for i in range(n_rows)], ["1"] * n_rows, ["(C)"] * n_rows],
+        names=ROBOT_INDEX_LEVELS,
+    )
+    return pd.DataFrame(rng.normal(0, 2000, size=(n_rows, len(FORCE_COLUMNS))), index=index, columns=FORCE_COLUMNS)
+
+
+@pytest.fixture
+def section():
+    return RectangularSection("S1", depth=14.0, width=3.8)
+
+
+class TestStreamingMemberStatistics:
+    def test_matches_batch_statistics(self):
+        samples = np.random.default_rng(2).gamma(2.0, 0.4, size=(10_000, 3))
+        statistics = StreamingMemberStatistics(3, limit=1.0, max_dcr=10.0, n_bins=2000)
+        for chunk in np.array_split(samples, 7):
+            statistics.update(chunk)
+        np.testing.assert_allclose(statistics.mean, samples.mean(axis=0))
+        np.testing.assert_allclose(statistics.variance(), samples.var(axis=0, ddof=1))
+        np.testing.assert_array_equal(statistics.exceedances, (samples > 1.0).sum(axis=0))
+        np.testing.assert_allclose(statistics.quantile(0.5), np.quantile(samples, 0.5, axis=0), atol=0.01)
+
+
+class TestMonteCarloMemberReliability:
+    def test_zero_variability_reproduces_deterministic_dcr(self, section, robot_forces, design_inputs):
+        results = monte_carlo_member_reliability(
+            section, robot_forces, *design_inputs, variability=MaterialVariability(), n_samples=20, chunk_rows=100
+        )
+        expected = check_force_table(section, robot_forces, *design_inputs).groupby("member", observed=True)["dcr_max"].max()
+        np.testing.assert_allclose(results["mean"], expected.loc[results.index])
+        np.testing.assert_allclose(results["std"], 0, atol=1e-12)
+        np.testing.assert_array_equal(results["failure_probability"], (expected.loc[results.index] > 1.0).astype(float))
+
+    def test_seeded_runs_are_reproducible(self, section, robot_forces, design_inputs):
+        variability = MaterialVariability(bending_strength=0.3, tension_strength=0.3, shear_strength=0.2)
+        first = monte_carlo_member_reliability(
+            section, robot_forces, *design_inputs, variability=variability, n_samples=500, seed=7
+        )
+        second = monte_carlo_member_reliability(
+            section, robot_forces, *design_inputs, variability=variability, n_samples=500, seed=7
+        )
+        pd.testing.assert_frame_equal(first, second)
+        assert ((first["q0.05"] <= first["q0.5"]) & (first["q0.5"] <= first["q0.95"])).all()
+        assert first["failure_probability"].between(0, 1).all()
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from timber_nds.results import ResultStore, TopNReducer, top_n_indices, top_n_rows, compare_runs
+
+
+@pytest.fixture
+def results_df():
+    rng = np.random.default_rng(3)
+    n_rows = 200
+    members = [f"M{i % 9}" for i in range(n_rows)]
+    cases = [str(i % 4 + 1) for i in range(n_rows)]
+    return pd.DataFrame({
+        "member": pd.Categorical(members),
+        "section": pd.Categorical([["S1", "S2"][i % 2] for i in range(n_rows)]),
+        "force": pd.Categorical([f"{m}/{i}/{c}/(C)" for i, (m, c) in enumerate(zip(members, cases))]),
+        "dcr_max": rng.uniform(0, 2, n_rows),
+    })
+
+
+class TestResultStore:
+    def test_label_lookups_match_scans(self, results_df):
+        store = ResultStore(results_df)
+        pd.testing.assert_frame_equal(store.by_member("M3"), results_df[results_df["member"] == "M3"])
+        pd.testing.assert_frame_equal(
+            store.by_section(["S2", "missing"]), results_df[results_df["section"] == "S2"]
+        )
+        case = results_df["force"].astype(str).str.split("/").str[2]
+        pd.testing.assert_frame_equal(store.by_case(["2", "4"]), results_df[case.isin(["2", "4"])])
+        assert len(store.by_mode("(C)")) == len(results_df)
+        assert store.by_member("missing").empty
+
+    def test_threshold_queries_match_scans(self, results_df):
+        store = ResultStore(results_df)
+        values = results_df["dcr_max"]
+        threshold = values.iloc[10]
+        pd.testing.assert_frame_equal(store.threshold("dcr_max", "gt", 1.0), results_df[values > 1.0])
+        pd.testing.assert_frame_equal(store.threshold("dcr_max", "le", threshold), results_df[values <= threshold])
+        pd.testing.assert_frame_equal(store.threshold("dcr_max", "eq", threshold), results_df[values == threshold])
+        pd.testing.assert_frame_equal(store.between("dcr_max", 0.5, 1.5), results_df[values.between(0.5, 1.5)])
+        with pytest.raises(ValueError, match="Invalid operator"):
+            store.threshold("dcr_max", "ne", 1.0)
+
+
+class TestTopN:
+    def test_matches_sorted_selection(self, results_df):
+        top = top_n_rows(results_df, n=3)
+        expected = (
+            results_df.sort_values(["member", "dcr_max"], ascending=[True, False])
+            .groupby("member", observed=True).head(3).reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(top, expected)
+
+        overall = top_n_indices(results_df["dcr_max"].to_numpy(), 5)
+        assert overall.tolist() == np.argsort(-results_df["dcr_max"].to_numpy())[:5].tolist()
+
+    def test_per_dcr_type_report(self, results_df):
+        results_df = results_df.assign(**{"shear y (dcr)": results_df["dcr_max"][::-1].to_numpy()})
+        report = top_n_rows(results_df, n=2, columns=["dcr_max", "shear y (dcr)"], by=None)
+        assert report["dcr_type"].tolist() == ["dcr_max"] * 2 + ["shear y (dcr)"] * 2
+        assert report["dcr"].tolist()[:2] == results_df["dcr_max"].nlargest(2).tolist()
+        assert report["dcr"].tolist()[2:] == results_df["shear y (dcr)"].nlargest(2).tolist()
+
+    def test_streaming_reducer_matches_in_memory(self, results_df):
+        results_df = results_df.assign(**{"shear y (dcr)": results_df["dcr_max"][::-1].to_numpy()})
+        columns = ["dcr_max", "shear y (dcr)"]
+        reducer = TopNReducer(n=2, columns=columns, by="section")
+        for start in range(0, len(results_df), 37):
+            reducer.update(results_df.iloc[start:start + 37])
+        expected = top_n_rows(results_df, n=2, columns=columns, by="section")
+        pd.testing.assert_frame_equal(reducer.result(), expected)
+
+
+class TestCompareRuns:
+    def test_reports_changes_and_flips(self, tmp_path, results_df):
+        results_df.loc[[5, 6, 7], "dcr_max"] = [0.5, 0.8, 1.2]
+        before = results_df.iloc[:-1]
+        after = results_df.iloc[1:].copy()
+        after.loc[[5, 6, 7], "dcr_max"] = [0.75, 1.5, 0.6]
+
+        diff = compare_runs(before, after)
+        statuses = dict(zip(diff["force"].astype(str), diff["status"].astype(str)))
+        assert statuses == {
+            str(results_df.loc[0, "force"]): "removed",
+            str(results_df.loc[len(results_df) - 1, "force"]): "added",
+            str(results_df.loc[5, "force"]): "changed",
+            str(results_df.loc[6, "force"]): "now failing",
+            str(results_df.loc[7, "force"]): "now passing",
+        }
+        assert diff.loc[diff["force"] == results_df.loc[5, "force"], "delta"].iloc[0] == pytest.approx(0.25)
+
+        chunked = compare_runs(
+            (before.iloc[start:start + 30] for start in range(0, len(before), 30)),
+            [after.iloc[start:start + 50] for start in range(0, len(after), 50)],
+            n_partitions=4, spill_dir=str(tmp_path),
+        )
+        key = ["member", "section", "force"]
+        pd.testing.assert_frame_equal(
+            chunked.sort_values("force").reset_index(drop=True).astype({column: str for column in key}),
+            diff.sort_values("force").reset_index(drop=True).astype({column: str for column in key}),
+        )
+        assert list(tmp_path.iterdir()) == []
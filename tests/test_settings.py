@@ -5,7 +5,16 @@ from timber_nds import (
     polar_moment_of_inertia,
     RectangularSectionProperties
 )
+import pickle
+import sys
 
+from timber_nds.settings import (
+    Forces,
+    WoodMaterial,
+    BendingAdjustmentFactors,
+    ElasticModulusAdjustmentFactors,
+    combined_factor,
+)
 
 
 class TestStructuralFunctions(unittest.TestCase):
@@ -39,6 +48,26 @@ class TestStructuralFunctions(unittest.TestCase):
         self.assertAlmostEqual(section.radius_of_gyration("zz"), 0.57735, places=6)     # Using assertAlmostEqual for float comparison
 
 
+class TestSettingsDataclasses(unittest.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 10), "slotted dataclasses need Python 3.10")
+    def test_instances_are_slotted(self):
+        for instance in (Forces(), WoodMaterial(), BendingAdjustmentFactors()):
+            self.assertFalse(hasattr(instance, "__dict__"))
+        with self.assertRaises(AttributeError):
+            Forces().not_a_field = 1.0
+
+    def test_defaults_and_pickling(self):
+        forces = Forces(name="f1", axial=10.0)
+        self.assertEqual(forces.shear_y, 0.0)
+        self.assertEqual(pickle.loads(pickle.dumps(forces)), forces)
+
+    def test_combined_factor(self):
+        self.assertAlmostEqual(combined_factor(BendingAdjustmentFactors()), 2.54 * 0.85)
+        self.assertAlmostEqual(
+            combined_factor(ElasticModulusAdjustmentFactors(due_moisture=0.9)), 0.9 * 1.76 * 0.85
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
     
\ No newline at end of file
@@ -0,0 +1,154 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from timber_nds.design import DCR_OUTPUT_COLUMNS
+from timber_nds.storage import (
+    ResultDatabase,
+    BackgroundResultWriter,
+    run_pipelined,
+    external_filter_sort,
+    write_partitioned_results,
+    read_partitioned_results,
+)
+
+
+@pytest.fixture
+def results_df():
+    rng = np.random.default_rng(4)
+    n_rows = 40
+    results_df = pd.DataFrame({
+        "member": pd.Categorical([f"M{i % 5}" for i in range(n_rows)]),
+        "section": pd.Categorical([["S1", "S2"][i % 2] for i in range(n_rows)]),
+        "force": pd.Categorical([f"F{i}" for i in range(n_rows)]),
+    })
+    for column in DCR_OUTPUT_COLUMNS:
+        results_df[column] = rng.uniform(0, 2, n_rows)
+    return results_df
+
+
+class TestResultDatabase:
+    def test_append_and_query_runs(self, tmp_path, results_df):
+        path = str(tmp_path / "results.sqlite")
+        with ResultDatabase(path) as database:
+            first = database.append(results_df, run_id="rev-1", chunk_size=7)
+            second = database.append(results_df.assign(dcr_max=results_df["dcr_max"] * 2), description="rev 2")
+            assert database.runs()["run_id"].tolist() == [first, second]
+
+        with ResultDatabase(path) as database:
+            member = database.query(run_id="rev-1", member="M2")
+            expected = results_df[results_df["member"] == "M2"]
+            assert member["force"].tolist() == expected["force"].astype(str).tolist()
+            np.testing.assert_allclose(member["dcr_max"], expected["dcr_max"])
+            assert member["member"].dtype == "category"
+
+            critical = database.query(section=["S1"], min_dcr=1.0)
+            assert set(critical["run_id"]) == {"rev-1", second}
+            assert (critical["dcr_max"] >= 1.0).all()
+            assert len(critical) == (
+                ((results_df["section"] == "S1") & (results_df["dcr_max"] >= 1.0)).sum()
+                + ((results_df["section"] == "S1") & (results_df["dcr_max"] >= 0.5)).sum()
+            )
+
+    def test_rejects_frames_without_labels(self, tmp_path, results_df):
+        with ResultDatabase(str(tmp_path / "results.sqlite")) as database:
+            with pytest.raises(ValueError, match="not found"):
+                database.append(results_df.drop(columns="force"))
+
+
+class TestPipelinedWriter:
+    def test_run_pipelined_writes_every_chunk(self, tmp_path, results_df):
+        path = str(tmp_path / "results.csv")
+        chunks = (results_df.iloc[start:start + 6] for start in range(0, len(results_df), 6))
+        assert run_pipelined(chunks, path, max_pending=1) == len(results_df)
+
+        written = pd.read_csv(path)
+        assert written["force"].tolist() == results_df["force"].astype(str).tolist()
+        np.testing.assert_allclose(written["dcr_max"], results_df["dcr_max"])
+
+    def test_parquet_output(self, tmp_path, results_df):
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / "results.parquet")
+        run_pipelined([results_df.iloc[:10], results_df.iloc[10:]], path, file_format="parquet")
+        assert len(pd.read_parquet(path)) == len(results_df)
+
+    def test_writer_errors_reach_the_producer(self, tmp_path, results_df):
+        writer = BackgroundResultWriter(str(tmp_path / "missing" / "results.csv"), max_pending=1)
+        with pytest.raises(RuntimeError, match="failed"):
+            for _ in range(10):
+                writer.put(results_df)
+            writer.close()
+
+    def test_producer_error_is_not_replaced(self, tmp_path, results_df):
+        with pytest.raises(KeyError, match="producer"):
+            with BackgroundResultWriter(str(tmp_path / "missing" / "results.csv")) as writer:
+                writer.put(results_df)
+                raise KeyError("producer")
+
+    def test_parquet_without_pyarrow_fails_up_front(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(ImportError, match="pyarrow"):
+            BackgroundResultWriter(str(tmp_path / "results.parquet"), file_format="parquet")
+
+
+class TestExternalFilterSort:
+    @pytest.mark.parametrize("sort_by, sort_order", [("dcr_max", "desc"), ("member", "asc"), ("dcr_max", "asc")])
+    def test_matches_in_memory_sort(self, tmp_path, results_df, sort_by, sort_order):
+        results_df.loc[[3, 17], "dcr_max"] = np.nan
+        filters = {"section": "S1", "tension (dcr)": {"operator": "lt", "threshold": 1.5}}
+        chunks = [results_df.iloc[start:start + 6] for start in range(0, len(results_df), 6)]
+        output_path = str(tmp_path / "sorted.csv")
+
+        rows = external_filter_sort(
+            chunks, output_path, filters, sort_by, sort_order,
+            spill_dir=str(tmp_path), run_rows=5, block_rows=2,
+        )
+        written = pd.read_csv(output_path)
+        mask = (results_df["section"] == "S1") & (results_df["tension (dcr)"] < 1.5)
+        expected = results_df[mask].sort_values(sort_by, ascending=sort_order == "asc")
+        assert rows == len(expected)
+        if sort_by == "dcr_max":
+            np.testing.assert_allclose(written[sort_by], expected[sort_by])
+        else:
+            assert written[sort_by].tolist() == expected[sort_by].astype(str).tolist()
+        assert sorted(written["force"]) == sorted(expected["force"].astype(str))
+        assert [path.name for path in tmp_path.iterdir()] == ["sorted.csv"]
+
+
+class TestPartitionedResults:
+    @pytest.mark.parametrize("file_format", ["parquet", "feather"])
+    def test_round_trip_and_partition_pruning(self, tmp_path, results_df, file_format):
+        pytest.importorskip("pyarrow")
+        output_dir = str(tmp_path / "dataset")
+        manifest = write_partitioned_results(
+            [results_df.iloc[:25], results_df.iloc[25:]], output_dir, file_format=file_format
+        )
+        assert sorted(manifest["member"]) == ["M0", "M1", "M2", "M3", "M4"]
+        assert manifest["rows"].sum() == len(results_df)
+        m1 = results_df[results_df["member"] == "M1"]
+        assert manifest.set_index("member").loc["M1", "dcr_max_max"] == pytest.approx(m1["dcr_max"].max())
+
+        member = read_partitioned_results(output_dir, values="M1")
+        assert member["force"].tolist() == m1["force"].astype(str).tolist()
+        critical = read_partitioned_results(output_dir, min_dcr=1.5)
+        assert sorted(critical["force"].astype(str)) == sorted(results_df.loc[results_df["dcr_max"] >= 1.5, "force"])
+
+    def test_buffers_chunks_into_few_files(self, tmp_path, results_df):
+        pytest.importorskip("pyarrow")
+        output_dir = str(tmp_path / "dataset")
+        chunks = [results_df.iloc[i:i + 5] for i in range(0, len(results_df), 5)]
+        manifest = write_partitioned_results(chunks, output_dir, rows_per_file=6)
+        for files, rows in zip(manifest["files"], manifest["rows"]):
+            assert len(files) == -(-rows // 6)
+        assert len(read_partitioned_results(output_dir)) == len(results_df)
+
+    def test_rejects_existing_dataset_and_bad_options(self, tmp_path, results_df):
+        with pytest.raises(ValueError, match="partition_by"):
+            write_partitioned_results(results_df, str(tmp_path), partition_by="force")
+        with pytest.raises(ValueError, match="rows_per_file"):
+            write_partitioned_results(results_df, str(tmp_path), rows_per_file=0)
+        (tmp_path / "_manifest.json").write_text("{}")
+        with pytest.raises(FileExistsError):
+            write_partitioned_results(results_df, str(tmp_path))
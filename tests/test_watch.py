@@ -0,0 +1,90 @@
+import os
+
+import pandas as pd
+
+from timber_nds.settings import RectangularSection
+from timber_nds.calculation import import_robot_bar_forces
+from timber_nds.design import check_force_table, governing_envelope
+from timber_nds.watch import RobotExportWatcher
+
+
+HEADER = "Bar/Node/Case;FX (kgf);FY (kgf);FZ (kgf);MX (kgfcm);MY (kgfcm);MZ (kgfcm)\n"
+
+
+def write_export(path, rows, mtime_ns):
+    path.write_text(HEADER + "".join(row + "\n" for row in rows))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestRobotExportWatcher:
+    def test_rechecks_only_changed_rows(self, tmp_path, design_inputs, monkeypatch):
+        export = tmp_path / "forces.csv"
+        sections = [RectangularSection("A", 20.0, 5.0), RectangularSection("B", 30.0, 10.0)]
+        write_export(export, ["1 1 1 (C);100;2;3;4;5;6", "1 2 1 (C);-50;2;3;4;5;6", "2 3 1 (C);10;0;0;0;0;0"], 10**18)
+
+        watcher = RobotExportWatcher(str(export), sections, *design_inputs, output_dir=str(tmp_path / "out"))
+        assert watcher.refresh() == {"added": 3, "changed": 0, "removed": 0}
+        assert watcher.refresh() is None
+        assert len(watcher.results_df) == 6
+
+        checked = []
+        original = check_force_table
+
+        def counting_check(list_sections, forces_df, *args, **kwargs):
+            checked.append(len(forces_df))
+            return original(list_sections, forces_df, *args, **kwargs)
+
+        monkeypatch.setattr("timber_nds.watch.check_force_table", counting_check)
+        write_export(
+            export, ["1 1 1 (C);100;2;3;4;5;6", "1 2 1 (C);-5000;2;3;4;5;6", "3 4 1 (C);7;0;0;0;0;0"], 2 * 10**18
+        )
+        assert watcher.refresh() == {"added": 1, "changed": 1, "removed": 1}
+        assert checked == [2]
+
+        expected = original(sections, import_robot_bar_forces(str(export)), *design_inputs)
+        key = ["section", "force"]
+        results = watcher.results_df.sort_values(key).reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            results.astype({"member": str, "section": str, "force": str}),
+            expected.sort_values(key).reset_index(drop=True).astype({"member": str, "section": str, "force": str}),
+        )
+
+        envelope = governing_envelope(expected).astype({"member": str, "section": str, "force": str})
+        stored = pd.read_pickle(tmp_path / "out" / "envelope.pkl").astype({"member": str, "section": str, "force": str})
+        key = ["member", "section"]
+        pd.testing.assert_frame_equal(
+            stored.sort_values(key).reset_index(drop=True), envelope.sort_values(key).reset_index(drop=True)
+        )
+
+    def test_watch_stops_after_max_refreshes(self, tmp_path, design_inputs):
+        export = tmp_path / "forces.csv"
+        write_export(export, ["1 1 1 (C);100;2;3;4;5;6"], 10**18)
+        changes = []
+        watcher = RobotExportWatcher(str(export), RectangularSection("A", 20.0, 5.0), *design_inputs)
+        watcher.watch(poll_interval=0.01, max_refreshes=1, callback=changes.append)
+        assert changes == [{"added": 1, "changed": 0, "removed": 0}]
+
+    def test_retries_truncated_export(self, tmp_path, design_inputs):
+        export = tmp_path / "forces.csv"
+        watcher = RobotExportWatcher(str(export), RectangularSection("A", 20.0, 5.0), *design_inputs)
+        assert watcher.refresh() is None
+
+        for partial in (["1 1 1 (C);100;2;3;4;5;6", "1 2"], ["1 1"], ["1 1 1 (C);100;2;3;4;5;6", "1"]):
+            write_export(export, partial, 10**18)
+            assert watcher.refresh() is None
+            assert watcher.results_df is None
+
+        write_export(export, ["1 1 1 (C);100;2;3;4;5;6", "1 2 1 (C);-50;2;3;4;5;6"], 10**18)
+        assert watcher.refresh() == {"added": 2, "changed": 0, "removed": 0}
+        assert len(watcher.results_df) == 2
+
+    def test_applies_time_effect(self, tmp_path, design_inputs):
+        export = tmp_path / "forces.csv"
+        section = RectangularSection("A", 20.0, 5.0)
+        write_export(export, ["1 1 1 (C);100;2;3;4;5;6", "1 2 2 (C);-50;2;3;4;5;6"], 10**18)
+        watcher = RobotExportWatcher(str(export), section, *design_inputs, time_effect={"1": 0.8})
+        watcher.refresh()
+        expected = check_force_table(
+            section, import_robot_bar_forces(str(export)), *design_inputs, time_effect={"1": 0.8}
+        )
+        pd.testing.assert_frame_equal(watcher.results_df, expected)